@@ -10,10 +10,14 @@ from .robot import *
 from ._renderer import *
 from ._robot import *
 from ._math import *
+from ._kinect import *
+from ._trajectory import *
 
 # 必要に応じてパッケージ全体で使用される共通定義を追加
 __all__ = [
     "gripper",
     "_renderer",
     "_robot",
+    "_kinect",
+    "_trajectory",
 ]
@@ -0,0 +1,70 @@
+"""This module is __init__.py of gravibot/_kinect package."""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from .accumulator import SweepSpaceAccumulator
+from .cache import get_cache_dir, load_kinect_arrays
+from .calibration import apply_extrinsic, get_offset_trans4x4
+from .filter import (
+    JointFilter,
+    OneEuroFilter,
+    SavitzkyGolayFilter,
+    ConstantVelocityKalmanFilter,
+)
+from .grid import WorkspaceGrid
+from .index import KinectTextIndex
+from .ingest import OccupancyStatistics, build_occupancy_statistics
+from .parser import parse_kinect_text, parse_kinect_lines
+from .recording import KinectFrame, KinectRecording
+from .resample import resample_joints
+from .risk_grid import TimeVaryingRiskGrid
+from .skeleton import SKELETON_NUM, SKELETON_MAP, UPPER_BODY, SKELETON_CONNECTION
+from .stream import (
+    KinectStreamParser,
+    KinectStreamPipeline,
+    start_kinect_replay_server,
+)
+from .sweep_space import (
+    count_joints,
+    compute_sweep_space,
+    count_bones,
+    compute_bone_sweep_space,
+)
+
+__all__ = [
+    "SweepSpaceAccumulator",
+    "get_cache_dir",
+    "load_kinect_arrays",
+    "apply_extrinsic",
+    "get_offset_trans4x4",
+    "JointFilter",
+    "OneEuroFilter",
+    "SavitzkyGolayFilter",
+    "ConstantVelocityKalmanFilter",
+    "WorkspaceGrid",
+    "KinectTextIndex",
+    "OccupancyStatistics",
+    "build_occupancy_statistics",
+    "parse_kinect_text",
+    "parse_kinect_lines",
+    "KinectFrame",
+    "KinectRecording",
+    "resample_joints",
+    "TimeVaryingRiskGrid",
+    "SKELETON_NUM",
+    "SKELETON_MAP",
+    "UPPER_BODY",
+    "SKELETON_CONNECTION",
+    "KinectStreamParser",
+    "KinectStreamPipeline",
+    "start_kinect_replay_server",
+    "count_joints",
+    "compute_sweep_space",
+    "count_bones",
+    "compute_bone_sweep_space",
+]
@@ -0,0 +1,222 @@
+"""provide SweepSpaceAccumulator class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .grid import WorkspaceGrid
+from .recording import KinectRecording
+
+# 重みの指数がこの値を超えたら正規化し直す（2 ** 1023 でオーバーフローする）
+_MAX_EXPONENT = 512.0
+
+
+class SweepSpaceAccumulator:
+    """
+    class to compute the sweep space of a human incrementally.
+    frames are added one by one, and the probability grid is always available.
+
+    - window is None and half_life is None: all frames are used equally,
+      which gives the same result as compute_sweep_space.
+    - window is given: only the latest `window` frames are used.
+    - half_life is given: the weight of a frame halves every half_life [ms].
+
+    the normalized probability grid is kept and get_probability() returns a
+    read-only view of it. while the sum of the weights does not change (a full
+    window), a frame updates only its own voxels; otherwise the grid is
+    normalized again at the next query.
+    """
+
+    def __init__(
+        self,
+        grid: WorkspaceGrid,
+        *,
+        window: Optional[int] = None,
+        half_life: Optional[float] = None,
+    ):
+        if not isinstance(grid, WorkspaceGrid):
+            raise TypeError(f"grid must be WorkspaceGrid, not {type(grid)}")
+
+        if window is not None and half_life is not None:
+            raise ValueError("window and half_life cannot be used together")
+        if window is not None and window < 1:
+            raise ValueError("window must be 1 or more")
+        if half_life is not None and half_life <= 0.0:
+            raise ValueError("half_life must be positive")
+
+        self._grid = grid
+        self._window = window
+        self._half_life = half_life
+        self.reset()
+
+    def reset(self) -> None:
+        """remove all frames"""
+
+        self._counts = np.zeros(self._grid.size, dtype=np.float64)
+        self._weight_sum = 0.0
+        self._frame_num = 0
+
+        # 正規化した確率と，その読み取り専用のビュー
+        self._probability = np.zeros(self._grid.size, dtype=np.float64)
+        self._probability_view = self._probability.reshape(self._grid.shape)
+        self._probability_view.flags.writeable = False
+        self._stale = False
+
+        # 窓を使う場合，各フレームのボクセルのインデックスを循環バッファに保持する
+        self._history: Optional[NDArray[np.intp]] = None
+        self._head = 0
+
+        # 減衰を使う場合，基準時刻からの経過時間に応じて新しいフレームの重みを大きくする
+        self._ref_time: Optional[float] = None
+
+    def add_frame(self, joints: NDArray, time: Optional[float] = None) -> None:
+        """
+        1フレーム分の関節を追加する．計算量は関節の数に比例する．
+
+        Parameters
+        ----------
+        joints : NDArray
+            関節の座標．形状は (joints, 3)．
+        time : Optional[float]
+            フレームの時刻 [ms]．half_life を指定した場合は必須．
+        """
+        flat_index, inside = self._grid.to_flat_index(joints)
+        flat_index = np.where(inside, flat_index, -1)
+        weight_sum = self._weight_sum
+
+        if self._window is not None:
+            removed = self._push_history(flat_index)
+            self._frame_num = min(self._frame_num + 1, self._window)
+            self._weight_sum = float(self._frame_num)
+            np.add.at(self._counts, flat_index[inside], 1.0)
+            self._update_probability(
+                np.concatenate([removed, flat_index[inside]]), weight_sum
+            )
+            return
+
+        weight = 1.0
+        if self._half_life is not None:
+            weight = self._get_decay_weight(time)
+
+        np.add.at(self._counts, flat_index[inside], weight)
+        self._weight_sum += weight
+        self._frame_num += 1
+        self._update_probability(flat_index[inside], weight_sum)
+
+    def add_recording(self, recording: KinectRecording) -> None:
+        """
+        記録された全フレームを時刻順に追加する．
+
+        Parameters
+        ----------
+        recording : KinectRecording
+            追加するデータ．
+        """
+        for joints, time in zip(recording.joints, recording.time):
+            self.add_frame(joints, float(time))
+
+    def get_probability(self) -> NDArray[np.float64]:
+        """
+        各ボクセルの確率を返す．
+        保持している確率の読み取り専用のビューを返すため，前回から重みの和が
+        変わっていなければ計算量はボクセル数に依存しない．
+
+        Returns
+        -------
+        probability : NDArray[np.float64]
+            各ボクセルの確率．形状は grid.shape．フレームがない場合は全て0．
+            次のフレームの追加で値が変わるため，保持する場合はコピーする．
+        """
+        if self._stale:
+            np.divide(self._counts, self._weight_sum, out=self._probability)
+            self._stale = False
+
+        return self._probability_view
+
+    def get_probability_at(self, points: NDArray) -> NDArray[np.float64]:
+        """
+        指定した座標のボクセルの確率を返す．計算量は点の数に比例し，ボクセル数には依存しない．
+
+        Parameters
+        ----------
+        points : NDArray
+            座標．形状は (..., 3)．
+
+        Returns
+        -------
+        probability : NDArray[np.float64]
+            各点の確率．形状は (...)．作業空間外の点は0．
+        """
+        flat_index, inside = self._grid.to_flat_index(points)
+        if self._weight_sum == 0.0:
+            return np.zeros(inside.shape)
+
+        return np.where(inside, self._counts[flat_index] / self._weight_sum, 0.0)
+
+    @property
+    def grid(self) -> WorkspaceGrid:
+        """getter for the workspace grid"""
+        return self._grid
+
+    @property
+    def frame_num(self) -> int:
+        """getter for the number of frames in use"""
+        return self._frame_num
+
+    def _update_probability(self, touched: NDArray[np.intp], weight_sum: float) -> None:
+        """
+        フレームを追加した後の確率を更新する．重みの和が変わらなければ touched の
+        ボクセルだけを正規化し，変わった場合は次の get_probability() で全体を正規化する
+        """
+
+        if self._stale or self._weight_sum != weight_sum:
+            self._stale = True
+            return
+
+        self._probability[touched] = self._counts[touched] / self._weight_sum
+
+    def _push_history(self, flat_index: NDArray[np.intp]) -> NDArray[np.intp]:
+        """
+        窓からはみ出たフレームを取り除き，新しいフレームを循環バッファに書き込む．
+        取り除いたフレームのボクセルのインデックスを返す
+        """
+
+        if self._history is None:
+            self._history = np.full((self._window, len(flat_index)), -1, dtype=np.intp)
+
+        old = self._history[self._head]
+        removed = old[old >= 0]
+        np.subtract.at(self._counts, removed, 1.0)
+
+        self._history[self._head] = flat_index
+        self._head = (self._head + 1) % len(self._history)
+
+        return removed
+
+    def _get_decay_weight(self, time: Optional[float]) -> float:
+        """基準時刻からの経過時間に応じた重みを返す．必要に応じて正規化し直す"""
+
+        if time is None:
+            raise ValueError("time is required when half_life is given")
+
+        if self._ref_time is None:
+            self._ref_time = time
+
+        exponent = (time - self._ref_time) / self._half_life
+        if exponent > _MAX_EXPONENT:
+            # 過去の重みを縮小し，基準時刻を現在に移す
+            scale = 2.0**-exponent
+            self._counts *= scale
+            self._weight_sum *= scale
+            self._ref_time = time
+            exponent = 0.0
+
+        return 2.0**exponent
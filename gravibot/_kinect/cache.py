@@ -0,0 +1,145 @@
+"""provide a binary cache for parsed Kinect recordings"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import json
+import os
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .parser import parse_kinect_text
+from .._util.type_check import _type_checked
+
+# キャッシュの形式を変更した場合はこの値を増やす
+CACHE_VERSION = 1
+
+_META_FILE = "meta.json"
+_ARRAY_FILES = ("frame.npy", "time.npy", "joints.npy")
+
+
+def get_cache_dir(file_name: str) -> str:
+    """
+    Kinectのデータに対応するキャッシュディレクトリのパスを返す．
+
+    Parameters
+    ----------
+    file_name : str
+        Kinectのデータのファイル名．
+
+    Returns
+    -------
+    cache_dir : str
+        キャッシュディレクトリのパス．
+    """
+    return _type_checked(file_name, str) + ".cache"
+
+
+def load_kinect_arrays(
+    file_name: str, *, use_cache: bool = True
+) -> Tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float32]]:
+    """
+    Kinectのデータを配列として読み込む．
+    一度読み込んだデータは .npy 形式でキャッシュされ，
+    次回以降はテキストを解析せずに np.memmap として読み込む．
+    元のファイルのサイズまたは更新時刻が変わった場合，キャッシュは作り直される．
+
+    Parameters
+    ----------
+    file_name : str
+        Kinectのデータのファイル名．
+    use_cache : bool
+        Falseの場合，キャッシュを使わずにテキストを解析する．
+
+    Returns
+    -------
+    frame : NDArray[np.int64]
+        フレームの番号．形状は (frames,)．
+    time : NDArray[np.float64]
+        各フレームの時刻 [ms]．形状は (frames,)．
+    joints : NDArray[np.float32]
+        各関節のセンサ座標系での座標．形状は (frames, 20, 3)．
+        キャッシュから読み込んだ場合は読み込み専用である．
+    """
+    file_name = _type_checked(file_name, str)
+
+    if not use_cache:
+        return parse_kinect_text(file_name)
+
+    cache_dir = get_cache_dir(file_name)
+    stat = os.stat(file_name)
+
+    if _is_valid_cache(cache_dir, stat):
+        frame, time, joints = (
+            np.load(os.path.join(cache_dir, name), mmap_mode="r")
+            for name in _ARRAY_FILES
+        )
+        return frame, time, joints
+
+    arrays = parse_kinect_text(file_name)
+
+    try:
+        _write_cache(cache_dir, stat, arrays)
+    except OSError:
+        # 書き込めない場所にある場合は，キャッシュせずに解析結果を返す
+        pass
+
+    return arrays
+
+
+def _is_valid_cache(
+    cache_dir: str,
+    stat: os.stat_result,
+    meta_file: str = _META_FILE,
+    array_files: Sequence[str] = _ARRAY_FILES,
+) -> bool:
+    """キャッシュが存在し，元のファイルと一致しているかを確認する"""
+
+    try:
+        with open(os.path.join(cache_dir, meta_file), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    return (
+        meta.get("version") == CACHE_VERSION
+        and meta.get("size") == stat.st_size
+        and meta.get("mtime_ns") == stat.st_mtime_ns
+        and all(os.path.isfile(os.path.join(cache_dir, n)) for n in array_files)
+    )
+
+
+def _write_cache(
+    cache_dir: str,
+    stat: os.stat_result,
+    arrays,
+    meta_file: str = _META_FILE,
+    array_files: Sequence[str] = _ARRAY_FILES,
+) -> None:
+    """配列をキャッシュディレクトリに書き込む"""
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # メタデータを最後に書くことで，書き込み途中のキャッシュを無効なものとして扱う
+    meta_path = os.path.join(cache_dir, meta_file)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    for name, array in zip(array_files, arrays):
+        np.save(os.path.join(cache_dir, name), np.ascontiguousarray(array))
+
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "version": CACHE_VERSION,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            },
+            f,
+        )
@@ -0,0 +1,83 @@
+"""provide functions to apply the extrinsic calibration to Kinect data"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Optional, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .._math.type import TransMatrix, is_trans_matrix
+
+
+def get_offset_trans4x4(offset: Sequence[float]) -> TransMatrix:
+    """
+    従来の read_kinect_data の変換を表す同次変換行列を生成する．
+    オフセットを加えた後に y軸とz軸を入れ替え，新しい y軸を反転する．
+    つまり (x, y, z) -> (x + ox, -(z + oy), y + oz) である．
+
+    Parameters
+    ----------
+    offset : Sequence[float]
+        センサ座標系でのオフセット [m]．
+
+    Returns
+    -------
+    trans_mat : TransMatrix
+        センサ座標系からロボット座標系への4x4の同次変換行列．
+    """
+    ox, oy, oz = (float(v) for v in offset)
+
+    return np.array(
+        [
+            [1.0, 0.0, 0.0, ox],
+            [0.0, 0.0, -1.0, -oy],
+            [0.0, 1.0, 0.0, oz],
+            [0.0, 0.0, 0.0, 1.0],
+        ]
+    )
+
+
+def apply_extrinsic(
+    joints: NDArray, trans: TransMatrix, *, out: Optional[NDArray] = None
+) -> NDArray:
+    """
+    関節の座標をまとめて同次変換する．全フレームを1回の行列積で変換する．
+
+    Parameters
+    ----------
+    joints : NDArray
+        関節の座標．形状は (..., 3)．
+    trans : TransMatrix
+        4x4の同次変換行列．
+    out : Optional[NDArray]
+        結果を書き込む配列．joints を渡すとその場で変換する．
+        Noneの場合は joints と同じ型の配列を新しく確保する．
+
+    Returns
+    -------
+    joints : NDArray
+        変換後の座標．形状は joints と同じ．
+    """
+    joints = np.asarray(joints)
+    trans = np.asarray(trans, dtype=np.float64)
+
+    if not is_trans_matrix(trans):
+        raise ValueError(f"trans must be 4x4, not {trans.shape}")
+    if joints.shape[-1] != 3:
+        raise ValueError(f"joints must be (..., 3), not {joints.shape}")
+
+    if out is None:
+        dtype = joints.dtype if np.issubdtype(joints.dtype, np.floating) else float
+        out = np.empty(joints.shape, dtype=dtype)
+
+    # 回転の行列積と平行移動の加算はどちらも out に直接書き込む
+    np.matmul(joints, trans[:3, :3].T, out=out, casting="same_kind")
+    np.add(out, trans[:3, 3], out=out, casting="same_kind")
+
+    return out
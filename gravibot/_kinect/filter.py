@@ -0,0 +1,289 @@
+"""provide filters to smooth joint positions"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import abc
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Kinect v2 のフレーム周期 [ms]
+DEFAULT_PERIOD = 1000.0 / 30.0
+
+
+class JointFilter(abc.ABC):
+    """
+    base class of the joint filters.
+    all joints and coordinates are filtered at once as an array.
+
+    - streaming: update() is called with each frame and returns the filtered frame.
+    - offline: apply() filters a whole (frames, ...) array.
+
+    subclasses implement _update(), which receives the elapsed time dt [s]
+    since the previous frame, or None for the first frame after reset().
+    """
+
+    def __init__(self, *, period: float = DEFAULT_PERIOD):
+        if period <= 0.0:
+            raise ValueError("period must be positive")
+
+        self._period = period
+        self.reset()
+
+    def reset(self) -> None:
+        """forget the past frames"""
+        self._last_time: Optional[float] = None
+
+    def update(self, joints: NDArray, time: Optional[float] = None) -> NDArray:
+        """
+        1フレーム分の関節を追加し，平滑化した座標を返す．
+
+        Parameters
+        ----------
+        joints : NDArray
+            関節の座標．形状は (joints, 3) など任意．
+        time : Optional[float]
+            フレームの時刻 [ms]．Noneの場合は前のフレームから period 後とする．
+
+        Returns
+        -------
+        joints : NDArray[np.float64]
+            平滑化した座標．形状は joints と同じ．
+        """
+        joints = np.asarray(joints, dtype=np.float64)
+
+        if time is None:
+            time = 0.0 if self._last_time is None else self._last_time + self._period
+
+        dt = None if self._last_time is None else (time - self._last_time) / 1000.0
+        self._last_time = time
+
+        if dt is not None and dt <= 0.0:
+            raise ValueError("time must be increasing")
+
+        return self._update(joints, dt)
+
+    def apply(self, joints: NDArray, time: Optional[NDArray] = None) -> NDArray:
+        """
+        全フレームをまとめて平滑化する．フィルタの状態は最初にリセットされる．
+
+        Parameters
+        ----------
+        joints : NDArray
+            関節の座標．形状は (frames, joints, 3) など任意．
+        time : Optional[NDArray]
+            各フレームの時刻 [ms]．形状は (frames,)．Noneの場合は等間隔とする．
+
+        Returns
+        -------
+        joints : NDArray[np.float64]
+            平滑化した座標．形状は joints と同じ．
+        """
+        joints = np.asarray(joints, dtype=np.float64)
+        if time is not None and len(time) != len(joints):
+            raise ValueError("time must have the same length as joints")
+
+        self.reset()
+        ret = np.empty_like(joints)
+        for i, frame in enumerate(joints):
+            ret[i] = self.update(frame, None if time is None else float(time[i]))
+
+        return ret
+
+    @abc.abstractmethod
+    def _update(self, joints: NDArray[np.float64], dt: Optional[float]) -> NDArray:
+        pass
+
+
+class OneEuroFilter(JointFilter):
+    """
+    class for the one-euro filter.
+    the cutoff frequency rises with the speed of each coordinate, so slow motion
+    is smoothed strongly and fast motion is followed with little lag.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_cutoff: float = 1.0,
+        beta: float = 0.0,
+        d_cutoff: float = 1.0,
+        period: float = DEFAULT_PERIOD,
+    ):
+        if min_cutoff <= 0.0 or d_cutoff <= 0.0:
+            raise ValueError("min_cutoff and d_cutoff must be positive")
+        if beta < 0.0:
+            raise ValueError("beta must be 0 or more")
+
+        self._min_cutoff = min_cutoff
+        self._beta = beta
+        self._d_cutoff = d_cutoff
+        super().__init__(period=period)
+
+    def reset(self) -> None:
+        super().reset()
+        self._x: Optional[NDArray[np.float64]] = None
+        self._dx: Optional[NDArray[np.float64]] = None
+
+    def _update(self, joints: NDArray[np.float64], dt: Optional[float]) -> NDArray:
+        if dt is None:
+            self._x = joints.copy()
+            self._dx = np.zeros_like(joints)
+            return self._x.copy()
+
+        # 速度を平滑化し，速度に応じて座標ごとのカットオフ周波数を決める
+        dx = (joints - self._x) / dt
+        self._dx += _get_alpha(self._d_cutoff, dt) * (dx - self._dx)
+
+        cutoff = self._min_cutoff + self._beta * np.abs(self._dx)
+        self._x += _get_alpha(cutoff, dt) * (joints - self._x)
+
+        return self._x.copy()
+
+
+class SavitzkyGolayFilter(JointFilter):
+    """
+    class for the Savitzky-Golay filter.
+    a polynomial of `order` is fitted to `window` frames.
+
+    - offline: the polynomial is centered on each frame, and the first and last
+      frames use the polynomial of the first and last windows.
+    - streaming: the polynomial is evaluated at the latest frame, so there is no
+      delay but the smoothing is weaker than offline.
+    """
+
+    def __init__(self, window: int, order: int, *, period: float = DEFAULT_PERIOD):
+        if window < 1 or window % 2 == 0:
+            raise ValueError("window must be a positive odd number")
+        if order < 0 or order >= window:
+            raise ValueError("order must be 0 or more and less than window")
+
+        self._window = window
+        self._order = order
+
+        # ストリーミング用に，バッファのフレーム数ごとの最新点の係数を求めておく
+        self._latest_coef = [
+            _get_projection(n, min(order, n - 1))[-1] for n in range(1, window + 1)
+        ]
+        super().__init__(period=period)
+
+    def reset(self) -> None:
+        super().reset()
+        self._buffer: Optional[NDArray[np.float64]] = None
+        self._count = 0
+
+    def apply(self, joints: NDArray, time: Optional[NDArray] = None) -> NDArray:
+        joints = np.asarray(joints, dtype=np.float64)
+        if time is not None and len(time) != len(joints):
+            raise ValueError("time must have the same length as joints")
+
+        if self._window == 1 or len(joints) == 0:
+            return joints.copy()
+
+        if len(joints) < self._window:
+            # 窓に満たない場合は全フレームに1つの多項式を当てはめる
+            order = min(self._order, len(joints) - 1)
+            coef = _get_projection(len(joints), order)
+            return np.tensordot(coef, joints, axes=(1, 0))
+
+        half = self._window // 2
+        coef = _get_projection(self._window, self._order)
+        ret = np.empty_like(joints)
+
+        # 窓をずらしながら中央の係数を畳み込む
+        windows = np.lib.stride_tricks.sliding_window_view(joints, self._window, 0)
+        ret[half:-half] = windows @ coef[half]
+
+        # 両端は最初と最後の窓の多項式で補間する
+        ret[:half] = np.tensordot(coef[:half], joints[: self._window], axes=(1, 0))
+        ret[-half:] = np.tensordot(
+            coef[half + 1 :], joints[-self._window :], axes=(1, 0)
+        )
+
+        return ret
+
+    def _update(self, joints: NDArray[np.float64], dt: Optional[float]) -> NDArray:
+        if self._buffer is None:
+            self._buffer = np.empty((self._window,) + joints.shape)
+
+        # 循環バッファではなく，古い順に並べたまま末尾に追加する
+        self._buffer[:-1] = self._buffer[1:]
+        self._buffer[-1] = joints
+        self._count = min(self._count + 1, self._window)
+
+        coef = self._latest_coef[self._count - 1]
+        return np.tensordot(coef, self._buffer[-self._count :], axes=(0, 0))
+
+
+class ConstantVelocityKalmanFilter(JointFilter):
+    """
+    class for the Kalman filter with the constant velocity model.
+    every coordinate has the state (position, velocity) and is observed every
+    frame with the same noise, so the covariance is shared by all coordinates
+    and only the states are held per coordinate.
+    """
+
+    def __init__(
+        self,
+        *,
+        process_noise: float = 1.0,
+        measurement_noise: float = 0.01,
+        period: float = DEFAULT_PERIOD,
+    ):
+        if process_noise <= 0.0 or measurement_noise <= 0.0:
+            raise ValueError("process_noise and measurement_noise must be positive")
+
+        self._q = process_noise  # 加速度の分散 [m^2/s^3]
+        self._r = measurement_noise**2  # 観測の標準偏差 [m] の2乗
+        super().__init__(period=period)
+
+    def reset(self) -> None:
+        super().reset()
+        self._pos: Optional[NDArray[np.float64]] = None
+        self._vel: Optional[NDArray[np.float64]] = None
+        self._cov = np.zeros((2, 2))
+
+    def _update(self, joints: NDArray[np.float64], dt: Optional[float]) -> NDArray:
+        if dt is None:
+            self._pos = joints.copy()
+            self._vel = np.zeros_like(joints)
+            self._cov = np.diag([self._r, 1.0])
+            return self._pos.copy()
+
+        # 予測
+        f = np.array([[1.0, dt], [0.0, 1.0]])
+        q = self._q * np.array([[dt**3 / 3.0, dt**2 / 2.0], [dt**2 / 2.0, dt]])
+        self._pos += self._vel * dt
+        self._cov = f @ self._cov @ f.T + q
+
+        # 更新（観測は位置のみ）
+        gain = self._cov[:, 0] / (self._cov[0, 0] + self._r)
+        innovation = joints - self._pos
+        self._pos += gain[0] * innovation
+        self._vel += gain[1] * innovation
+        self._cov -= np.outer(gain, self._cov[0])
+
+        return self._pos.copy()
+
+
+def _get_alpha(cutoff, dt: float):
+    """カットオフ周波数 [Hz] に対応する1次ローパスフィルタの係数を返す"""
+
+    tau = 1.0 / (2.0 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+def _get_projection(window: int, order: int) -> NDArray[np.float64]:
+    """
+    窓の各点に多項式を当てはめた値を返す射影行列を求める．
+    i 行目は窓の i 番目の点での多項式の値の係数である．
+    """
+    x = np.arange(window) - (window - 1) / 2.0
+    vander = np.vander(x, order + 1, increasing=True)
+    return vander @ np.linalg.pinv(vander)
@@ -0,0 +1,131 @@
+"""provide WorkspaceGrid class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .._util.type_check import _type_checked
+
+
+class WorkspaceGrid:
+    """
+    class for a workspace divided into cubic voxels.
+    the number of voxels along each axis is int((max - min) / grid_size).
+    """
+
+    def __init__(
+        self,
+        x_range: Sequence[float],
+        y_range: Sequence[float],
+        z_range: Sequence[float],
+        grid_size: float,
+    ):
+        self._grid_size = _type_checked(grid_size, float)
+        if self._grid_size <= 0.0:
+            raise ValueError("grid_size must be positive")
+
+        self._min = np.array([x_range[0], y_range[0], z_range[0]], dtype=np.float64)
+        self._max = np.array([x_range[1], y_range[1], z_range[1]], dtype=np.float64)
+        if not (self._min < self._max).all():
+            raise ValueError("each range must be [min, max] with min < max")
+
+        self._shape: Tuple[int, int, int] = tuple(  # type: ignore
+            int(v) for v in (self._max - self._min) / self._grid_size
+        )
+        if min(self._shape) < 1:
+            raise ValueError("grid_size must be smaller than the workspace")
+
+    def to_index(self, points: NDArray) -> Tuple[NDArray[np.intp], NDArray[np.bool_]]:
+        """
+        座標をボクセルのインデックスに変換する．
+        作業空間の境界上の点は作業空間内として扱い，端のボクセルに割り当てる．
+
+        Parameters
+        ----------
+        points : NDArray
+            座標．形状は (..., 3)．
+
+        Returns
+        -------
+        index : NDArray[np.intp]
+            ボクセルのインデックス．形状は (..., 3)．作業空間外の点の値は不定．
+        inside : NDArray[np.bool_]
+            作業空間内の点であればTrue．形状は (...)．
+        """
+        points = np.asarray(points)
+        inside = self.contains(points)
+
+        index = np.floor((points - self._min) / self._grid_size).astype(np.intp)
+        np.clip(index, 0, np.array(self._shape) - 1, out=index)
+
+        return index, inside
+
+    def to_flat_index(self, points: NDArray) -> Tuple[NDArray[np.intp], NDArray]:
+        """
+        座標を平坦化したボクセルのインデックスに変換する．
+
+        Parameters
+        ----------
+        points : NDArray
+            座標．形状は (..., 3)．
+
+        Returns
+        -------
+        flat_index : NDArray[np.intp]
+            C順序で平坦化したボクセルのインデックス．形状は (...)．
+        inside : NDArray[np.bool_]
+            作業空間内の点であればTrue．形状は (...)．
+        """
+        index, inside = self.to_index(points)
+        strides = np.array([self._shape[1] * self._shape[2], self._shape[2], 1])
+        return index @ strides, inside
+
+    def contains(self, points: NDArray) -> NDArray[np.bool_]:
+        """
+        座標が作業空間内にあるかを判定する．境界上の点は作業空間内として扱う．
+
+        Parameters
+        ----------
+        points : NDArray
+            座標．形状は (..., 3)．
+
+        Returns
+        -------
+        inside : NDArray[np.bool_]
+            作業空間内の点であればTrue．形状は (...)．
+        """
+        points = np.asarray(points)
+        return ((points >= self._min) & (points <= self._max)).all(axis=-1)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """getter for the number of voxels along each axis"""
+        return self._shape
+
+    @property
+    def size(self) -> int:
+        """getter for the total number of voxels"""
+        return int(np.prod(self._shape))
+
+    @property
+    def grid_size(self) -> float:
+        """getter for the edge length of a voxel"""
+        return self._grid_size
+
+    @property
+    def min_pos(self) -> NDArray[np.float64]:
+        """getter for the minimum corner of the workspace"""
+        return self._min.copy()
+
+    @property
+    def max_pos(self) -> NDArray[np.float64]:
+        """getter for the maximum corner of the workspace"""
+        return self._max.copy()
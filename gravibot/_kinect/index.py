@@ -0,0 +1,178 @@
+"""provide KinectTextIndex class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import os
+from typing import List, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .cache import _is_valid_cache, _write_cache, get_cache_dir
+from .parser import SEPARATOR, _parse_header, parse_kinect_lines
+from .recording import KinectFrame, KinectRecording
+from .._util.type_check import _type_checked
+
+_SEPARATOR_BYTES = SEPARATOR.encode("utf-8")
+
+# 索引は load_kinect_arrays と同じキャッシュディレクトリに別のファイルとして保存する
+_INDEX_META_FILE = "index_meta.json"
+_INDEX_FILES = ("index_frame.npy", "index_time.npy", "index_offset.npy")
+
+
+class KinectTextIndex:
+    """
+    class for the index of a Kinect text file.
+    only the header lines are read to build the index, and the byte offset of
+    each frame is kept, so a frame or a time window is read without parsing
+    the whole file.
+
+    the index is saved in the cache directory of get_cache_dir() and reused
+    while the size and the modification time of the file are unchanged, so
+    the file is scanned only once. use_cache=False always scans the file.
+    """
+
+    def __init__(self, file_name: str, *, use_cache: bool = True):
+        self._file_name = _type_checked(file_name, str)
+
+        if not use_cache:
+            self._frame, self._time, self._offset = self._scan()
+            return
+
+        cache_dir = get_cache_dir(self._file_name)
+        stat = os.stat(self._file_name)
+
+        if _is_valid_cache(cache_dir, stat, _INDEX_META_FILE, _INDEX_FILES):
+            self._frame, self._time, self._offset = (
+                np.load(os.path.join(cache_dir, name)) for name in _INDEX_FILES
+            )
+            return
+
+        self._frame, self._time, self._offset = self._scan()
+
+        try:
+            _write_cache(
+                cache_dir,
+                stat,
+                (self._frame, self._time, self._offset),
+                _INDEX_META_FILE,
+                _INDEX_FILES,
+            )
+        except OSError:
+            # 書き込めない場所にある場合は，保存せずに索引を使う
+            pass
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    @property
+    def file_name(self) -> str:
+        """getter for the file name"""
+        return self._file_name
+
+    @property
+    def frame(self) -> NDArray[np.int64]:
+        """getter for the numbers of all frames, including frames without skeleton"""
+        return self._frame
+
+    @property
+    def time(self) -> NDArray[np.float64]:
+        """getter for the time [ms] of all frames"""
+        return self._time
+
+    @property
+    def offset(self) -> NDArray[np.int64]:
+        """getter for the byte offsets of the frames, shape is (frames + 1,)"""
+        return self._offset
+
+    def get_frame(self, frame: int) -> KinectFrame:
+        """
+        フレームの番号を指定して1フレームを読み込む．計算量は O(log n) である．
+
+        Parameters
+        ----------
+        frame : int
+            フレームの番号．
+
+        Returns
+        -------
+        frame_data : KinectFrame
+            読み込んだフレーム．
+        """
+        i = int(np.searchsorted(self._frame, frame))
+        if i == len(self._frame) or self._frame[i] != frame:
+            raise KeyError(f"frame {frame} is not found")
+
+        recording = self._read(i, i + 1)
+        if len(recording) == 0:
+            raise KeyError(f"frame {frame} has no skeleton")
+
+        return recording[0]
+
+    def window(self, t0: float, t1: float) -> KinectRecording:
+        """
+        時刻が t0 以上 t1 未満のフレームだけを読み込む．
+        範囲の探索は O(log n) であり，範囲外のテキストは読まない．
+
+        Parameters
+        ----------
+        t0 : float
+            開始時刻 [ms]．
+        t1 : float
+            終了時刻 [ms]．
+
+        Returns
+        -------
+        recording : KinectRecording
+            骨格が検出されたフレームの記録．
+        """
+        start, end = np.searchsorted(self._time, [t0, t1])
+        return self._read(int(start), max(int(start), int(end)))
+
+    def _scan(
+        self,
+    ) -> Tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.int64]]:
+        """ファイルのヘッダの行を走査して，フレームの番号，時刻，位置を求める"""
+
+        frame_list: List[int] = []
+        time_list: List[float] = []
+        offset_list: List[int] = []
+        offset = 0
+
+        with open(self._file_name, "rb") as f:
+            for line in f:
+                if _SEPARATOR_BYTES in line:
+                    # END の行の位置を最後のフレームの終端とする
+                    if b"END" in line:
+                        break
+
+                    frame, time = _parse_header(line.decode("utf-8"))
+                    frame_list.append(frame)
+                    time_list.append(time)
+                    offset_list.append(offset)
+
+                offset += len(line)
+
+        offset_list.append(offset)
+
+        return (
+            np.array(frame_list, dtype=np.int64),
+            np.array(time_list, dtype=np.float64),
+            np.array(offset_list, dtype=np.int64),
+        )
+
+    def _read(self, start: int, end: int) -> KinectRecording:
+        """start 番目から end 番目の手前までのフレームのテキストを読み込んで解析する"""
+
+        with open(self._file_name, "rb") as f:
+            f.seek(self._offset[start])
+            text = f.read(self._offset[end] - self._offset[start]).decode("utf-8")
+
+        return KinectRecording(
+            *parse_kinect_lines(text.splitlines(), name=self._file_name)
+        )
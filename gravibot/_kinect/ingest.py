@@ -0,0 +1,212 @@
+"""provide functions to build occupancy statistics from many recordings"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .cache import load_kinect_arrays
+from .calibration import apply_extrinsic
+from .grid import WorkspaceGrid
+from .sweep_space import count_bones, count_joints
+
+
+class OccupancyStatistics:
+    """
+    class for occupancy statistics merged from many recordings.
+    the recordings are merged into running sums per voxel: the counts, and the
+    sum and the sum of squares of the per-recording probability, so the memory
+    does not grow with the number of recordings.
+    """
+
+    def __init__(
+        self,
+        grid: WorkspaceGrid,
+        counts: NDArray,
+        probability_sum: NDArray,
+        probability_square_sum: NDArray,
+        frame_num: NDArray,
+    ):
+        counts = np.asarray(counts, dtype=np.float64)
+        probability_sum = np.asarray(probability_sum, dtype=np.float64)
+        probability_square_sum = np.asarray(probability_square_sum, dtype=np.float64)
+        frame_num = np.asarray(frame_num, dtype=np.int64)
+
+        for name, value in (
+            ("counts", counts),
+            ("probability_sum", probability_sum),
+            ("probability_square_sum", probability_square_sum),
+        ):
+            if value.shape != grid.shape:
+                raise ValueError(f"{name} must have the shape grid.shape")
+        if frame_num.ndim != 1 or len(frame_num) == 0:
+            raise ValueError("frame_num must have an element per recording")
+        if (frame_num <= 0).any():
+            raise ValueError("each recording must have at least one frame")
+
+        self._grid = grid
+        self._counts = counts
+        self._probability_sum = probability_sum
+        self._probability_square_sum = probability_square_sum
+        self._frame_num = frame_num
+
+    @property
+    def grid(self) -> WorkspaceGrid:
+        """getter for the workspace grid"""
+        return self._grid
+
+    @property
+    def recording_num(self) -> int:
+        """getter for the number of recordings"""
+        return len(self._frame_num)
+
+    @property
+    def frame_num(self) -> NDArray[np.int64]:
+        """getter for the number of frames of each recording"""
+        return self._frame_num
+
+    @property
+    def counts(self) -> NDArray[np.float64]:
+        """getter for the total counts of each voxel"""
+        return self._counts
+
+    @property
+    def probability(self) -> NDArray[np.float64]:
+        """getter for the probability of each voxel over all frames"""
+        return self._counts / float(self._frame_num.sum())
+
+    @property
+    def mean(self) -> NDArray[np.float64]:
+        """getter for the mean of the per-recording probability"""
+        return self._probability_sum / self.recording_num
+
+    @property
+    def variance(self) -> NDArray[np.float64]:
+        """getter for the variance of the per-recording probability"""
+        mean = self.mean
+        variance = self._probability_square_sum / self.recording_num - mean * mean
+
+        # 丸め誤差で負にならないようにする
+        return np.maximum(variance, 0.0)
+
+
+# ワーカープロセスが共有メモリの和に加算する間に取るロック
+_worker_lock = None
+
+
+def _init_worker(lock) -> None:
+    global _worker_lock
+    _worker_lock = lock
+
+
+def build_occupancy_statistics(
+    file_names: Sequence[str],
+    grid: WorkspaceGrid,
+    *,
+    trans: Optional[NDArray] = None,
+    skip_frames: int = 0,
+    bone_radius: Optional[float] = None,
+    workers: Optional[int] = None,
+) -> OccupancyStatistics:
+    """
+    複数のKinectのデータをプロセスプールで並列に読み込み，ボクセルごとの統計量を求める．
+    各プロセスは自分の記録のヒストグラムをロックを取って共有メモリの和に直接加えるため，
+    関節の座標やヒストグラムがプロセス間で受け渡されることはなく，
+    使うメモリは記録の数によらない．
+
+    Parameters
+    ----------
+    file_names : Sequence[str]
+        Kinectのデータのファイル名．
+    grid : WorkspaceGrid
+        作業空間．
+    trans : Optional[NDArray]
+        センサ座標系から作業空間の座標系への4x4の同次変換行列．Noneの場合は変換しない．
+    skip_frames : int
+        各記録の先頭から読み飛ばすフレームの数．
+    bone_radius : Optional[float]
+        指定した場合，関節の点ではなく骨をカプセルとして数える（count_bones を参照）．
+    workers : Optional[int]
+        プロセスの数．Noneの場合はCPUの数．
+
+    Returns
+    -------
+    statistics : OccupancyStatistics
+        ボクセルごとの統計量．
+    """
+    if len(file_names) == 0:
+        raise ValueError("file_names must not be empty")
+
+    if trans is not None:
+        trans = np.asarray(trans, dtype=np.float64)
+        if trans.shape != (4, 4):
+            raise ValueError("trans must be 4x4")
+
+    # 全記録で共通の (回数, 確率の和, 確率の二乗和) の和を共有メモリに置く
+    shape = (3,) + grid.shape
+    nbytes = int(np.prod(shape)) * np.dtype(np.float64).itemsize
+    shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    lock = multiprocessing.Lock()
+
+    try:
+        sums = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        sums[:] = 0.0
+        tasks = [
+            (shm.name, shape, f, grid, trans, skip_frames, bone_radius)
+            for f in file_names
+        ]
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(lock,)
+        ) as executor:
+            frame_num = list(executor.map(_ingest_recording, tasks))
+
+        statistics = OccupancyStatistics(grid, *sums.copy(), np.array(frame_num))
+        del sums
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return statistics
+
+
+def _ingest_recording(task: Tuple) -> int:
+    """1つの記録を読み込み，ヒストグラムと確率を共有メモリの和に加える"""
+
+    shm_name, shape, file_name, grid, trans, skip_frames, bone_radius = task
+
+    _, _, joints = load_kinect_arrays(file_name)
+    joints = np.array(joints[skip_frames:], dtype=np.float64)
+    if len(joints) == 0:
+        raise ValueError(f"{file_name} has no frames after skip_frames")
+
+    if trans is not None:
+        apply_extrinsic(joints, trans, out=joints)
+
+    if bone_radius is None:
+        counts = count_joints(joints, grid)
+    else:
+        counts = count_bones(joints, grid, bone_radius)
+    probability = counts / float(len(joints))
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        sums = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        with _worker_lock:
+            sums[0] += counts
+            sums[1] += probability
+            sums[2] += probability * probability
+        del sums
+    finally:
+        shm.close()
+
+    return len(joints)
@@ -0,0 +1,134 @@
+"""provide functions to parse text files recorded by Kinect"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import List, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .skeleton import SKELETON_NUM
+
+# kinectのデータは Frame:*, time: *[ms] で区切られている
+SEPARATOR = "Frame:"
+
+
+def parse_kinect_text(
+    file_name: str,
+) -> Tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float32]]:
+    """
+    Kinectのデータを読み込み，配列に変換する．
+    座標はセンサ座標系のまま（オフセットや軸の入れ替えを行わずに）返す．
+    Kinectのデータは，以下のような形式で保存されている．
+    Born等のデータは任意のデータであり，存在しない場合もある．
+    Frame:*, time: *[ms]
+    Angle: *
+    TimeStamp: *
+    (arbitrarily) ID: *
+    (arbitrarily) Quality: *
+    (arbitrarily) Born0: *, *, *
+    (arbitrarily) Born1: *, *, *
+    (arbitrarily) ...
+    (arbitrarily) Born19: *, *, *
+
+    Parameters
+    ----------
+    file_name : str
+        読み込むファイル名．
+
+    Returns
+    -------
+    frame : NDArray[np.int64]
+        骨格が検出されたフレームの番号．形状は (frames,)．
+    time : NDArray[np.float64]
+        各フレームの時刻 [ms]．形状は (frames,)．
+    joints : NDArray[np.float32]
+        各関節の座標．形状は (frames, 20, 3)．
+    """
+    with open(file_name, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    return parse_kinect_lines(lines, name=file_name)
+
+
+def parse_kinect_lines(
+    lines: List[str], *, name: str = "lines"
+) -> Tuple[NDArray[np.int64], NDArray[np.float64], NDArray[np.float32]]:
+    """
+    Kinectのデータの行を解析し，配列に変換する．
+    ファイルの一部分だけを解析する場合に使う．形式は parse_kinect_text を参照．
+
+    Parameters
+    ----------
+    lines : List[str]
+        改行を含まない行のリスト．
+    name : str
+        エラーメッセージに使う名前．
+
+    Returns
+    -------
+    frame : NDArray[np.int64]
+        骨格が検出されたフレームの番号．形状は (frames,)．
+    time : NDArray[np.float64]
+        各フレームの時刻 [ms]．形状は (frames,)．
+    joints : NDArray[np.float32]
+        各関節の座標．形状は (frames, 20, 3)．
+    """
+    frame_list: List[int] = []
+    time_list: List[float] = []
+    born_list: List[str] = []
+    cnt = 0
+
+    while cnt < len(lines):
+        if SEPARATOR not in lines[cnt]:
+            cnt += 1
+            continue
+
+        # END を含む場合は終了
+        if "END" in lines[cnt]:
+            break
+
+        frame, time = _parse_header(lines[cnt])
+
+        # 2行読み飛ばす
+        cnt += 3
+
+        # 次の行が,ID: * であるかどうかを確認
+        if cnt >= len(lines) or "ID" not in lines[cnt]:
+            continue
+
+        # さらに2行読み飛ばし，20個のデータを文字列のまま保持する
+        cnt += 2
+        born_list.extend(line.split(":")[1] for line in lines[cnt : cnt + SKELETON_NUM])
+        cnt += SKELETON_NUM
+
+        frame_list.append(frame)
+        time_list.append(time)
+
+    # 文字列の変換はまとめて行う
+    joints = np.array(
+        ",".join(born_list).split(",") if born_list else [], dtype=np.float32
+    )
+    if joints.size != len(frame_list) * SKELETON_NUM * 3:
+        raise ValueError(f"{name} has a broken skeleton block")
+
+    return (
+        np.array(frame_list, dtype=np.int64),
+        np.array(time_list, dtype=np.float64),
+        joints.reshape(len(frame_list), SKELETON_NUM, 3),
+    )
+
+
+def _parse_header(line: str) -> Tuple[int, float]:
+    """Frame:*, time: *[ms] の行からフレームの番号と時刻を取り出す"""
+
+    # Frame:*, time: *[ms] を前後で分割
+    frame_str, time_str = line.split(",")[:2]
+    frame = int(frame_str.split(":")[1])
+    time = float(time_str.replace("[ms]", "").split(":")[1])
+    return frame, time
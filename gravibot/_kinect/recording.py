@@ -0,0 +1,204 @@
+"""provide KinectRecording class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Iterator, Union, overload
+
+import numpy as np
+from numpy.typing import NDArray
+from mpl_toolkits.mplot3d import Axes3D  # type: ignore
+
+from .cache import load_kinect_arrays
+from .calibration import apply_extrinsic
+from .skeleton import SKELETON_CONNECTION, SKELETON_NUM
+from .._math.type import TransMatrix
+
+
+class KinectFrame:
+    """
+    class for a frame of KinectRecording.
+    joints is a view of the recording, so no data is copied.
+    """
+
+    __slots__ = ("frame", "time", "joints")
+
+    def __init__(self, frame: int, time: float, joints: NDArray):
+        self.frame = frame  # Frame number
+        self.time = time  # Time in ms
+        self.joints = joints  # 20x3 view
+
+    @property
+    def data(self) -> NDArray:
+        """flat view of joints, [x0, y0, z0, x1, y1, z1, ...]"""
+        return self.joints.reshape(-1)
+
+    def __str__(self):
+        return f"Frame: {self.frame}, Time: {self.time}, Data: {self.data.tolist()}"
+
+    def draw(self, ax: Axes3D, *, color: str = "black") -> None:
+        """
+        3Dグラフに描画する
+        """
+        for i, j in SKELETON_CONNECTION:
+            ax.plot(*self.joints[[i, j]].T, color=color)
+
+        ax.scatter(*self.joints.T, color=color)
+
+
+class KinectRecording:
+    """
+    class for a recording of Kinect.
+    joints are held in a contiguous (frames, joints, 3) array.
+    """
+
+    def __init__(self, frame: NDArray, time: NDArray, joints: NDArray):
+        frame = np.asarray(frame)
+        time = np.asarray(time)
+        joints = np.asarray(joints)
+
+        if joints.ndim != 3 or joints.shape[1:] != (SKELETON_NUM, 3):
+            raise ValueError(
+                f"joints must be (frames, {SKELETON_NUM}, 3), not {joints.shape}"
+            )
+
+        if frame.shape != (len(joints),) or time.shape != (len(joints),):
+            raise ValueError("frame and time must have the same length as joints")
+
+        self._frame = frame
+        self._time = time
+        self._joints = joints
+
+    @classmethod
+    def from_file(cls, file_name: str, *, use_cache: bool = True) -> "KinectRecording":
+        """
+        Kinectのデータを読み込む．
+        座標はセンサ座標系のままである．
+
+        Parameters
+        ----------
+        file_name : str
+            Kinectのデータのファイル名．
+        use_cache : bool
+            Falseの場合，キャッシュを使わずにテキストを解析する．
+
+        Returns
+        -------
+        recording : KinectRecording
+            読み込んだデータ．
+        """
+        return cls(*load_kinect_arrays(file_name, use_cache=use_cache))
+
+    def transform(self, trans: TransMatrix) -> "KinectRecording":
+        """
+        全フレームの関節を同次変換した新しい記録を返す．
+        変換は1回の行列積であり，キャリブレーションを変えてもテキストを解析し直す必要はない．
+
+        Parameters
+        ----------
+        trans : TransMatrix
+            4x4の同次変換行列．
+
+        Returns
+        -------
+        recording : KinectRecording
+            変換後の記録．frame と time は元の記録と共有する．
+        """
+        return KinectRecording(
+            self._frame, self._time, apply_extrinsic(self._joints, trans)
+        )
+
+    def get_frame(self, frame: int) -> KinectFrame:
+        """
+        フレームの番号を指定して1フレームを取り出す．
+        フレームの番号は昇順であるため，計算量は O(log n) である．
+
+        Parameters
+        ----------
+        frame : int
+            フレームの番号．
+
+        Returns
+        -------
+        frame_data : KinectFrame
+            取り出したフレーム．
+        """
+        i = int(np.searchsorted(self._frame, frame))
+        if i == len(self._frame) or self._frame[i] != frame:
+            raise KeyError(f"frame {frame} is not found")
+
+        return self[i]
+
+    def window(self, t0: float, t1: float) -> "KinectRecording":
+        """
+        時刻が t0 以上 t1 未満のフレームを取り出す．
+        時刻は昇順であるため，計算量は O(log n) であり，データはコピーされない．
+
+        Parameters
+        ----------
+        t0 : float
+            開始時刻 [ms]．
+        t1 : float
+            終了時刻 [ms]．
+
+        Returns
+        -------
+        recording : KinectRecording
+            元の記録のビュー．
+        """
+        start, end = np.searchsorted(self._time, [t0, t1])
+        return self[int(start) : max(int(start), int(end))]
+
+    def __len__(self) -> int:
+        return len(self._joints)
+
+    @overload
+    def __getitem__(self, key: int) -> KinectFrame: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "KinectRecording": ...
+
+    def __getitem__(
+        self, key: Union[int, slice]
+    ) -> Union[KinectFrame, "KinectRecording"]:
+        if isinstance(key, slice):
+            return KinectRecording(self._frame[key], self._time[key], self._joints[key])
+
+        return KinectFrame(
+            int(self._frame[key]), float(self._time[key]), self._joints[key]
+        )
+
+    def __iter__(self) -> Iterator[KinectFrame]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def frame(self) -> NDArray:
+        """getter for frame numbers, shape is (frames,)"""
+        return self._frame
+
+    @frame.setter
+    def frame(self, _):
+        raise AttributeError("frame is read-only")
+
+    @property
+    def time(self) -> NDArray:
+        """getter for time [ms], shape is (frames,)"""
+        return self._time
+
+    @time.setter
+    def time(self, _):
+        raise AttributeError("time is read-only")
+
+    @property
+    def joints(self) -> NDArray:
+        """getter for joint positions, shape is (frames, joints, 3)"""
+        return self._joints
+
+    @joints.setter
+    def joints(self, _):
+        raise AttributeError("joints is read-only")
@@ -0,0 +1,121 @@
+"""provide a function to resample joints onto a uniform time base"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+# max_gap を指定しない場合，中央値の周期のこの倍数を超える間隔をフレーム落ちとみなす
+GAP_FACTOR = 1.5
+
+
+def resample_joints(
+    time: NDArray,
+    joints: NDArray,
+    period: float,
+    *,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    method: str = "linear",
+    max_gap: Optional[float] = None,
+) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.bool_]]:
+    """
+    不等間隔の時刻で記録された関節の座標を，等間隔の時刻に補間する．
+    全ての時刻と関節を1回の配列演算で補間する．
+
+    Parameters
+    ----------
+    time : NDArray
+        各フレームの時刻 [ms]．形状は (frames,)．昇順であること．
+    joints : NDArray
+        関節の座標．形状は (frames, ...)．
+    period : float
+        補間後の周期 [ms]．プランナの TIME_STEP [s] の1000倍．
+    start : Optional[float]
+        補間後の最初の時刻 [ms]．Noneの場合は time[0]．
+    end : Optional[float]
+        補間後の終了時刻 [ms]．この時刻は含まない．Noneの場合は time[-1] 以下の時刻まで．
+    method : str
+        'linear' または 'cubic'．'cubic' は座標ごとの3次エルミート補間である．
+    max_gap : Optional[float]
+        この値 [ms] を超える間隔をフレーム落ちとみなす．
+        Noneの場合は間隔の中央値の GAP_FACTOR 倍．
+
+    Returns
+    -------
+    grid_time : NDArray[np.float64]
+        補間後の時刻 [ms]．形状は (steps,)．
+    grid_joints : NDArray[np.float64]
+        補間後の座標．形状は (steps, ...)．
+    valid : NDArray[np.bool_]
+        各時刻の座標が信頼できるか．フレーム落ちの区間や記録の範囲外の時刻は False．
+        False の時刻の座標は最も近い区間の補間（範囲外は端の値）である．
+    """
+    time = np.asarray(time, dtype=np.float64)
+    joints = np.asarray(joints, dtype=np.float64)
+
+    if method not in ("linear", "cubic"):
+        raise ValueError(f"method must be 'linear' or 'cubic', not {method}")
+    if period <= 0.0:
+        raise ValueError("period must be positive")
+    if len(time) < 2 or len(time) != len(joints):
+        raise ValueError("time and joints must have the same length of 2 or more")
+
+    dt = np.diff(time)
+    if (dt <= 0.0).any():
+        raise ValueError("time must be increasing")
+
+    start = time[0] if start is None else start
+    if end is None:
+        steps = int(np.floor((time[-1] - start) / period)) + 1
+    else:
+        steps = int(np.ceil((end - start) / period))
+    grid_time = start + np.arange(max(0, steps)) * period
+
+    # 各時刻が含まれる区間 [time[i], time[i + 1]] と区間内の位置 s を求める
+    i = np.clip(np.searchsorted(time, grid_time, side="right") - 1, 0, len(time) - 2)
+    s = np.clip((grid_time - time[i]) / dt[i], 0.0, 1.0)
+    s = s.reshape((-1,) + (1,) * (joints.ndim - 1))
+
+    p0 = joints[i]
+    p1 = joints[i + 1]
+    if method == "linear":
+        grid_joints = p0 + s * (p1 - p0)
+    else:
+        tangent = _get_tangent(time, joints)
+        h = dt[i].reshape(s.shape)
+        s2 = s * s
+        s3 = s2 * s
+        grid_joints = (
+            (2.0 * s3 - 3.0 * s2 + 1.0) * p0
+            + (s3 - 2.0 * s2 + s) * h * tangent[i]
+            + (-2.0 * s3 + 3.0 * s2) * p1
+            + (s3 - s2) * h * tangent[i + 1]
+        )
+
+    if max_gap is None:
+        max_gap = GAP_FACTOR * float(np.median(dt))
+
+    valid = (grid_time >= time[0]) & (grid_time <= time[-1]) & (dt[i] <= max_gap)
+
+    return grid_time, grid_joints, valid
+
+
+def _get_tangent(time: NDArray[np.float64], joints: NDArray[np.float64]) -> NDArray:
+    """各フレームでの座標の時間微分を差分で求める（両端は片側差分）"""
+
+    tangent = np.empty_like(joints)
+    shape = (-1,) + (1,) * (joints.ndim - 1)
+
+    tangent[1:-1] = (joints[2:] - joints[:-2]) / (time[2:] - time[:-2]).reshape(shape)
+    tangent[0] = (joints[1] - joints[0]) / (time[1] - time[0])
+    tangent[-1] = (joints[-1] - joints[-2]) / (time[-1] - time[-2])
+
+    return tangent
@@ -0,0 +1,254 @@
+"""provide TimeVaryingRiskGrid class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Optional, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+import casadi as cs  # type: ignore
+
+from .grid import WorkspaceGrid
+from .recording import KinectRecording
+from .resample import resample_joints
+from .sweep_space import count_bones
+from .._util.type_check import _type_checked
+
+
+class TimeVaryingRiskGrid:
+    """
+    class for the risk of each voxel at each time step of the planner.
+    risk has the shape (steps,) + grid.shape, and risk[k] is the probability
+    that the human occupies the voxel in [k * time_step, (k + 1) * time_step).
+    """
+
+    def __init__(self, grid: WorkspaceGrid, risk: NDArray, time_step: float):
+        if not isinstance(grid, WorkspaceGrid):
+            raise TypeError(f"grid must be WorkspaceGrid, not {type(grid)}")
+
+        risk = np.asarray(risk, dtype=np.float64)
+        if risk.ndim != 4 or risk.shape[1:] != grid.shape or len(risk) == 0:
+            raise ValueError(f"risk must be (steps,) + {grid.shape}, not {risk.shape}")
+        if time_step <= 0.0:
+            raise ValueError("time_step must be positive")
+
+        self._grid = grid
+        self._risk = risk
+        self._time_step = time_step
+
+    @classmethod
+    def from_recordings(
+        cls,
+        recordings: Sequence[KinectRecording],
+        grid: WorkspaceGrid,
+        time_step: float,
+        steps: int,
+        *,
+        samples_per_step: int = 4,
+        method: str = "linear",
+        bone_radius: Optional[float] = None,
+    ) -> "TimeVaryingRiskGrid":
+        """
+        記録をプランナの時間刻みに補間し，時間ごとの危険度を求める．
+        各記録の最初のフレームをプランナの時刻0とし，複数の記録は平均する．
+
+        Parameters
+        ----------
+        recordings : Sequence[KinectRecording]
+            作業空間の座標系に変換済みの記録．
+        grid : WorkspaceGrid
+            作業空間．
+        time_step : float
+            プランナの時間刻み [s]．
+        steps : int
+            時間刻みの数．
+        samples_per_step : int
+            1つの時間刻みの中で補間する点の数．
+        method : str
+            補間の方法．resample_joints を参照．
+        bone_radius : Optional[float]
+            指定した場合，関節の点ではなく骨をカプセルとして数える．
+
+        Returns
+        -------
+        risk_grid : TimeVaryingRiskGrid
+            時間ごとの危険度．フレーム落ちの区間や記録の範囲外の点は数えない．
+        """
+        if len(recordings) == 0:
+            raise ValueError("recordings must not be empty")
+        if steps < 1 or samples_per_step < 1:
+            raise ValueError("steps and samples_per_step must be 1 or more")
+
+        counts = np.zeros((steps, grid.size))
+        sample_num = np.zeros(steps)
+        period = time_step * 1000.0 / samples_per_step
+        total = steps * samples_per_step
+
+        for recording in recordings:
+            time = np.asarray(recording.time, dtype=np.float64)
+            # 終了時刻を最後の点の半周期後にして，丸め誤差で点の数が変わらないようにする
+            _, joints, valid = resample_joints(
+                time,
+                recording.joints,
+                period,
+                start=time[0],
+                end=time[0] + (total - 0.5) * period,
+                method=method,
+            )
+            step = np.arange(len(joints)) // samples_per_step
+
+            sample_num += np.bincount(step[valid], minlength=steps)
+            if bone_radius is None:
+                # 時間刻みとボクセルの組を1つのインデックスにしてまとめて数える
+                flat_index, inside = grid.to_flat_index(joints)
+                key = (step[:, None] * grid.size + flat_index)[inside & valid[:, None]]
+                counts += np.bincount(key, minlength=counts.size).reshape(counts.shape)
+            else:
+                for k in np.unique(step[valid]):
+                    frames = joints[valid & (step == k)]
+                    counts[k] += count_bones(frames, grid, bone_radius).reshape(-1)
+
+        risk = counts / np.maximum(sample_num, 1.0)[:, None]
+        return cls(grid, risk.reshape((steps,) + grid.shape), time_step)
+
+    @property
+    def grid(self) -> WorkspaceGrid:
+        """getter for the workspace grid"""
+        return self._grid
+
+    @property
+    def risk(self) -> NDArray[np.float64]:
+        """getter for the risk, shape is (steps,) + grid.shape"""
+        return self._risk
+
+    @property
+    def steps(self) -> int:
+        """getter for the number of time steps"""
+        return len(self._risk)
+
+    @property
+    def time_step(self) -> float:
+        """getter for the time step [s]"""
+        return self._time_step
+
+    def coarsen(
+        self, grid_factor: int = 2, time_factor: int = 1
+    ) -> "TimeVaryingRiskGrid":
+        """
+        ボクセルと時間刻みをまとめた粗い危険度を返す．
+        まとめたボクセルと時間刻みの最大値を取るため，危険度は膨張する．
+        端で割り切れない分は危険度0で補う．
+
+        Parameters
+        ----------
+        grid_factor : int
+            各軸でまとめるボクセルの数．
+        time_factor : int
+            まとめる時間刻みの数．
+
+        Returns
+        -------
+        risk_grid : TimeVaryingRiskGrid
+            ボクセルの大きさが grid_factor 倍，時間刻みが time_factor 倍の危険度．
+        """
+        grid_factor = _type_checked(grid_factor, int)
+        time_factor = _type_checked(time_factor, int)
+        if grid_factor < 1 or time_factor < 1:
+            raise ValueError("grid_factor and time_factor must be 1 or more")
+
+        factors = (time_factor,) + (grid_factor,) * 3
+        shape = tuple(-(-n // f) for n, f in zip(self._risk.shape, factors))
+        padded = np.zeros(tuple(n * f for n, f in zip(shape, factors)))
+        padded[tuple(slice(0, n) for n in self._risk.shape)] = self._risk
+
+        # 各軸を (粗い数, まとめる数) に分け，まとめる軸の最大値を取る
+        risk = padded.reshape([v for n, f in zip(shape, factors) for v in (n, f)]).max(
+            axis=(1, 3, 5, 7)
+        )
+
+        grid_size = self._grid.grid_size * grid_factor
+        lower = self._grid.min_pos
+        # 浮動小数点の誤差でボクセルの数が減らないように，わずかに広げる
+        upper = lower + (np.array(shape[1:]) + 1e-9) * grid_size
+        grid = WorkspaceGrid(*zip(lower, upper), grid_size)
+
+        return TimeVaryingRiskGrid(grid, risk, self._time_step * time_factor)
+
+    def lookup(self, step: NDArray, points: NDArray) -> NDArray[np.float64]:
+        """
+        時間刻みと座標を指定して危険度をまとめて求める．
+
+        Parameters
+        ----------
+        step : NDArray
+            時間刻みの番号．points の先頭の形状とブロードキャストできること．
+            範囲外の番号は最初または最後の時間刻みとする．
+        points : NDArray
+            座標．形状は (..., 3)．
+
+        Returns
+        -------
+        risk : NDArray[np.float64]
+            各点の危険度．形状は (...)．作業空間外の点は0．
+        """
+        step = np.clip(np.asarray(step, dtype=np.intp), 0, self.steps - 1)
+        flat_index, inside = self._grid.to_flat_index(points)
+        risk = self._risk.reshape(self.steps, -1)[step, flat_index]
+
+        return np.where(inside, risk, 0.0)
+
+    def get_casadi_function(
+        self, name: str = "risk_lookup", *, parametric: bool = False
+    ) -> cs.Function:
+        """
+        時間刻みと座標から危険度を求めるCasADiの関数を生成する．
+        全ての危険度を1次元の表とし，整数のインデックスで線形補間することで，
+        if_else を並べずにボクセルの値を取り出す．
+
+        Parameters
+        ----------
+        name : str
+            関数の名前．
+        parametric : bool
+            Trueの場合，危険度の表を入力として受け取る関数にする．
+            NLPのパラメータとして渡せば，ソルバを作り直さずに危険度を更新できる．
+
+        Returns
+        -------
+        lookup : cs.Function
+            name(step, x, y, z) -> risk．parametric の場合は name(step, x, y, z, values)．
+            values には risk.ravel() を渡す．作業空間外の点は0．
+        """
+        step = cs.MX.sym("step")
+        pos = [cs.MX.sym(axis) for axis in "xyz"]
+
+        # インデックスの計算と範囲制限
+        shape = (self.steps,) + self._grid.shape
+        index = [cs.fmin(cs.fmax(cs.floor(step), 0), shape[0] - 1)]
+        inside = 1
+        for i, p in enumerate(pos):
+            lower = self._grid.min_pos[i]
+            upper = self._grid.max_pos[i]
+            idx = cs.floor((p - lower) / self._grid.grid_size)
+            index.append(cs.fmin(cs.fmax(idx, 0), shape[i + 1] - 1))
+            inside = cs.logic_and(inside, cs.logic_and(p >= lower, p <= upper))
+
+        strides = np.cumprod((shape[1:] + (1,))[::-1])[::-1]
+        flat_index = sum(int(s) * idx for s, idx in zip(strides, index))
+
+        knots = [np.arange(self._risk.size, dtype=np.float64)]
+        if parametric:
+            values = cs.MX.sym("values", self._risk.size)
+            table = cs.interpolant(name + "_table", "linear", knots, 1, {})
+            value = cs.if_else(inside, table(flat_index, values), 0)
+            return cs.Function(name, [step] + pos + [values], [value])
+
+        table = cs.interpolant(name + "_table", "linear", knots, self._risk.ravel())
+        value = cs.if_else(inside, table(flat_index), 0)
+        return cs.Function(name, [step] + pos, [value])
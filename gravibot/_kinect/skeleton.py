@@ -0,0 +1,70 @@
+"""provide definitions of the skeleton measured by Kinect"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+SKELETON_NUM = 20
+
+SKELETON_MAP = {
+    "SpineBase": 0,
+    "SpineMid": 1,
+    "Neck": 2,
+    "Head": 3,
+    "ShoulderLeft": 4,
+    "ElbowLeft": 5,
+    "WristLeft": 6,
+    "HandLeft": 7,
+    "ShoulderRight": 8,
+    "ElbowRight": 9,
+    "WristRight": 10,
+    "HandRight": 11,
+    "HipLeft": 12,
+    "KneeLeft": 13,
+    "AnkleLeft": 14,
+    "FootLeft": 15,
+    "HipRight": 16,
+    "KneeRight": 17,
+    "AnkleRight": 18,
+    "FootRight": 19,
+}
+
+# 上半身
+UPPER_BODY = [
+    "SpineMid",
+    "Neck",
+    "Head",
+    "ShoulderLeft",
+    "ElbowLeft",
+    "WristLeft",
+    "HandLeft",
+    "ShoulderRight",
+    "ElbowRight",
+    "WristRight",
+    "HandRight",
+]
+
+SKELETON_CONNECTION = [
+    (0, 1),
+    (1, 2),
+    (2, 3),
+    (1, 4),
+    (4, 5),
+    (5, 6),
+    (6, 7),
+    (1, 8),
+    (8, 9),
+    (9, 10),
+    (10, 11),
+    (0, 12),
+    (12, 13),
+    (13, 14),
+    (14, 15),
+    (0, 16),
+    (16, 17),
+    (17, 18),
+    (18, 19),
+]
@@ -0,0 +1,320 @@
+"""provide a replay server and an asyncio pipeline for live Kinect streams"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import asyncio
+import inspect
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .accumulator import SweepSpaceAccumulator
+from .calibration import apply_extrinsic
+from .filter import JointFilter
+from .parser import SEPARATOR, _parse_header
+from .skeleton import SKELETON_NUM
+from .._util.latency import LatencyStatistics
+
+
+class KinectStreamParser:
+    """
+    class to parse Kinect text line by line.
+    the format is the same as parse_kinect_text.
+    """
+
+    def __init__(self) -> None:
+        self._finished = False
+        self._state = "frame"
+        self._skip = 0
+        self._frame = 0
+        self._time = 0.0
+        self._born: List[Tuple[float, float, float]] = []
+
+    def feed(self, line: str) -> Optional[Tuple[int, float, NDArray[np.float32]]]:
+        """
+        1行を解析する．
+
+        Parameters
+        ----------
+        line : str
+            改行を含まない1行．
+
+        Returns
+        -------
+        frame_data : Optional[Tuple[int, float, NDArray[np.float32]]]
+            骨格の読み込みが完了した場合は (フレーム番号, 時刻 [ms], 20x3の座標)，
+            それ以外の場合は None．
+        """
+        if self._finished:
+            return None
+
+        if self._state == "frame":
+            if SEPARATOR in line:
+                self._read_header(line)
+        elif self._state == "skip":
+            self._skip -= 1
+            if self._skip == 0:
+                self._state = "id"
+        elif self._state == "id":
+            if "ID" in line:
+                self._state = "quality"
+            else:
+                # 骨格が検出されなかったフレームなので，次のフレームの行として読み直す
+                self._state = "frame"
+                return self.feed(line)
+        elif self._state == "quality":
+            self._state = "born"
+            self._born = []
+        else:
+            x, y, z = line.split(":")[1].split(",")
+            self._born.append((float(x), float(y), float(z)))
+            if len(self._born) == SKELETON_NUM:
+                self._state = "frame"
+                return self._frame, self._time, np.array(self._born, dtype=np.float32)
+
+        return None
+
+    @property
+    def finished(self) -> bool:
+        """getter for whether the END line has been read"""
+        return self._finished
+
+    def _read_header(self, line: str) -> None:
+        # END を含む場合は終了
+        if "END" in line:
+            self._finished = True
+            return
+
+        self._frame, self._time = _parse_header(line)
+
+        # Angle と TimeStamp の2行を読み飛ばす
+        self._state = "skip"
+        self._skip = 2
+
+
+async def start_kinect_replay_server(
+    file_name: str,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    *,
+    speed: float = 1.0,
+) -> asyncio.AbstractServer:
+    """
+    Kinectのデータを記録された時刻に合わせてTCPで送信するサーバを起動する．
+    接続したクライアントごとに，ファイルの先頭から END の行までを送信して切断する．
+
+    Parameters
+    ----------
+    file_name : str
+        Kinectのデータのファイル名．
+    host : str
+        待ち受けるアドレス．
+    port : int
+        待ち受けるポート．0の場合は空いているポートを使う．
+    speed : float
+        再生速度の倍率．2.0の場合は2倍速で送信する．
+
+    Returns
+    -------
+    server : asyncio.AbstractServer
+        起動したサーバ．ポートは server.sockets[0].getsockname()[1] で取得できる．
+    """
+    if speed <= 0.0:
+        raise ValueError("speed must be positive")
+
+    with open(file_name, "r", encoding="utf-8") as f:
+        blocks = _split_blocks(f.read().splitlines())
+
+    async def handle(_: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        first_time = next((t for t, _ in blocks if t is not None), 0.0)
+
+        try:
+            for block_time, text in blocks:
+                if block_time is not None:
+                    delay = start + (block_time - first_time) / 1000.0 / speed
+                    await asyncio.sleep(max(0.0, delay - loop.time()))
+                writer.write(text.encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+class KinectStreamPipeline:
+    """
+    class for the pipeline from a Kinect stream to a live sweep space.
+    parse -> transform -> update -> publish run as separate tasks
+    connected with bounded queues.
+
+    - the parser waits when the frame queue is full, so the socket is not read
+      and the sender is slowed down by TCP flow control.
+    - only the latest snapshot is kept, so a slow subscriber skips old snapshots.
+    - the probability is taken from the accumulator only when a snapshot is
+      published, and on_snapshot receives its read-only view. the view changes
+      when the next frame is added, so copy it to keep it.
+    """
+
+    def __init__(
+        self,
+        accumulator: SweepSpaceAccumulator,
+        *,
+        trans: Optional[NDArray] = None,
+        joint_filter: Optional[JointFilter] = None,
+        queue_size: int = 8,
+        on_snapshot: Optional[Callable] = None,
+    ):
+        if not isinstance(accumulator, SweepSpaceAccumulator):
+            raise TypeError("accumulator must be SweepSpaceAccumulator")
+
+        if trans is not None:
+            trans = np.asarray(trans, dtype=np.float64)
+            if trans.shape != (4, 4):
+                raise ValueError("trans must be 4x4")
+
+        self._accumulator = accumulator
+        self._trans = trans
+        self._joint_filter = joint_filter
+        self._queue_size = queue_size
+        self._on_snapshot = on_snapshot
+        self._latency = LatencyStatistics()
+        self._dropped_snapshot_num = 0
+        self._added_num = 0
+
+    async def run(self, reader: asyncio.StreamReader) -> None:
+        """
+        ストリームが終わるまで処理を続ける．
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Kinectのデータを読み込むストリーム．
+        """
+        frame_queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        snapshot_queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+        await asyncio.gather(
+            self._read(reader, frame_queue),
+            self._update(frame_queue, snapshot_queue),
+            self._publish(snapshot_queue),
+        )
+
+    async def connect(self, host: str, port: int) -> None:
+        """
+        サーバに接続し，ストリームが終わるまで処理を続ける．
+
+        Parameters
+        ----------
+        host : str
+            サーバのアドレス．
+        port : int
+            サーバのポート．
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            await self.run(reader)
+        finally:
+            writer.close()
+
+    @property
+    def accumulator(self) -> SweepSpaceAccumulator:
+        """getter for the accumulator"""
+        return self._accumulator
+
+    @property
+    def latency(self) -> LatencyStatistics:
+        """getter for the latency from receiving a frame to publishing it"""
+        return self._latency
+
+    @property
+    def dropped_snapshot_num(self) -> int:
+        """getter for the number of snapshots skipped by a slow subscriber"""
+        return self._dropped_snapshot_num
+
+    async def _read(self, reader: asyncio.StreamReader, queue: asyncio.Queue) -> None:
+        parser = KinectStreamParser()
+
+        while not parser.finished:
+            line = await reader.readline()
+            if not line:
+                break
+
+            frame_data = parser.feed(line.decode("utf-8").rstrip("\r\n"))
+            if frame_data is not None:
+                await queue.put(frame_data + (time.perf_counter(),))
+
+        await queue.put(None)
+
+    async def _update(self, frame_queue: asyncio.Queue, snapshot_queue) -> None:
+        while True:
+            item = await frame_queue.get()
+            if item is None:
+                break
+
+            frame, frame_time, joints, received = item
+            if self._joint_filter is not None:
+                joints = self._joint_filter.update(joints, frame_time)
+            if self._trans is not None:
+                apply_extrinsic(joints, self._trans, out=joints)
+            self._accumulator.add_frame(joints, frame_time)
+            self._added_num += 1
+
+            # 確率は公開する時に取り出すため，ここではフレームの情報だけを渡す
+            snapshot = (frame, frame_time, self._added_num, received)
+            if snapshot_queue.full():
+                snapshot_queue.get_nowait()
+                self._dropped_snapshot_num += 1
+            snapshot_queue.put_nowait(snapshot)
+
+            # 他のタスクに実行を譲る
+            await asyncio.sleep(0)
+
+        await snapshot_queue.put(None)
+
+    async def _publish(self, queue: asyncio.Queue) -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+
+            frame, frame_time, added_num, received = item
+            if added_num != self._added_num:
+                # 取り出した後に次のフレームが追加されたので，この状態はもう読めない
+                self._dropped_snapshot_num += 1
+                continue
+
+            if self._on_snapshot is not None:
+                probability = self._accumulator.get_probability()
+                ret = self._on_snapshot(frame, frame_time, probability)
+                if inspect.isawaitable(ret):
+                    await ret
+
+            self._latency.add(time.perf_counter() - received)
+
+
+def _split_blocks(lines: List[str]) -> List[Tuple[Optional[float], str]]:
+    """ファイルの行をフレームごとのブロックに分割し，(時刻 [ms], テキスト) のリストを返す"""
+
+    blocks: List[Tuple[Optional[float], str]] = []
+    for line in lines:
+        if SEPARATOR in line or not blocks:
+            block_time = None
+            if SEPARATOR in line and "END" not in line:
+                block_time = _parse_header(line)[1]
+            blocks.append((block_time, ""))
+
+        block_time, text = blocks[-1]
+        blocks[-1] = (block_time, text + line + "\n")
+
+    return blocks
@@ -0,0 +1,239 @@
+"""provide functions to compute the sweep space of a human"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .grid import WorkspaceGrid
+from .skeleton import SKELETON_CONNECTION
+from .._util.type_check import _type_checked
+
+# 骨のラスタライズで一度に作る候補ボクセルの数の上限
+_RASTERIZE_BUDGET = 4_000_000
+
+
+def count_joints(joints: NDArray, grid: WorkspaceGrid) -> NDArray[np.int64]:
+    """
+    各ボクセルに入った関節の数を数える．
+
+    Parameters
+    ----------
+    joints : NDArray
+        関節の座標．形状は (..., 3)．
+    grid : WorkspaceGrid
+        作業空間．
+
+    Returns
+    -------
+    counts : NDArray[np.int64]
+        各ボクセルの関節の数．形状は grid.shape．
+    """
+    # 作業空間外の点を先に除いてからインデックスを計算する
+    points = np.asarray(joints).reshape(-1, 3)
+    flat_index, _ = grid.to_flat_index(points[grid.contains(points)])
+    counts = np.bincount(flat_index, minlength=grid.size)
+    return counts.reshape(grid.shape)
+
+
+def compute_sweep_space(
+    joints: NDArray,
+    grid: WorkspaceGrid,
+    *,
+    workers: int = 1,
+    chunk_size: int = 100000,
+) -> NDArray[np.float64]:
+    """
+    人間の掃引空間を計算し，フレーム数で除して確率を求め，3次元配列で返す．
+
+    Parameters
+    ----------
+    joints : NDArray
+        関節の座標．形状は (frames, joints, 3)．
+    grid : WorkspaceGrid
+        作業空間．
+    workers : int
+        2以上の場合，フレームを chunk_size ごとに分割し，プロセスプールで並列に計算する．
+    chunk_size : int
+        並列に計算する場合の1チャンクあたりのフレーム数．
+
+    Returns
+    -------
+    sweep_space : NDArray[np.float64]
+        各ボクセルの確率．形状は grid.shape．
+    """
+    workers = _type_checked(workers, int)
+    chunk_size = _type_checked(chunk_size, int)
+
+    frame_num = len(joints)
+    if frame_num == 0:
+        raise ValueError("joints must have at least one frame")
+
+    if workers <= 1 or frame_num <= chunk_size:
+        counts = count_joints(joints, grid)
+    else:
+        chunks = [joints[i : i + chunk_size] for i in range(0, frame_num, chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = sum(executor.map(count_joints, chunks, [grid] * len(chunks)))
+
+    return counts / float(frame_num)
+
+
+def count_bones(
+    joints: NDArray,
+    grid: WorkspaceGrid,
+    radius: float,
+    *,
+    connection: Sequence[Tuple[int, int]] = SKELETON_CONNECTION,
+) -> NDArray[np.int64]:
+    """
+    骨を半径 radius のカプセルとしてボクセルに塗りつぶし，各ボクセルを占有したフレームの数を数える．
+    ボクセルの中心がカプセルの内部にあれば，そのボクセルは占有されているとする．
+    1フレーム内で複数の骨が同じボクセルを占有しても1回として数える．
+    radius が grid_size * sqrt(3) / 2 より小さい場合，細い骨がボクセルの中心を通らず抜けることがある．
+
+    Parameters
+    ----------
+    joints : NDArray
+        関節の座標．形状は (frames, joints, 3)．
+    grid : WorkspaceGrid
+        作業空間．
+    radius : float
+        カプセルの半径 [m]．
+    connection : Sequence[Tuple[int, int]]
+        骨を構成する関節のインデックスの組．
+
+    Returns
+    -------
+    counts : NDArray[np.int64]
+        各ボクセルを占有したフレームの数．形状は grid.shape．
+    """
+    radius = _type_checked(radius, float)
+    if radius < 0.0:
+        raise ValueError("radius must be 0 or more")
+
+    joints = np.asarray(joints, dtype=np.float64)
+    pair = np.array(connection, dtype=np.intp).reshape(-1, 2)
+    start = joints[:, pair[:, 0]]  # (frames, bones, 3)
+    end = joints[:, pair[:, 1]]
+
+    # カプセルを囲む直方体をボクセルのインデックスの範囲に変換する
+    shape = np.array(grid.shape)
+    lower = np.floor((np.minimum(start, end) - radius - grid.min_pos) / grid.grid_size)
+    upper = np.floor((np.maximum(start, end) + radius - grid.min_pos) / grid.grid_size)
+    visible = ((upper >= 0) & (lower < shape)).all(axis=-1)
+    lower = np.clip(lower, 0, shape - 1).astype(np.intp)[visible]
+    upper = np.clip(upper, 0, shape - 1).astype(np.intp)[visible]
+    start = start[visible]
+    end = end[visible]
+    frame_idx = np.nonzero(visible)[0]
+
+    # 作業空間にかかるカプセルだけを残し，フレームの区切りで分割して処理する
+    capsule_num = (upper - lower + 1).prod(axis=-1)
+    frame_end = np.cumsum(np.bincount(frame_idx, capsule_num, minlength=len(joints)))
+    bone_end = np.cumsum(np.bincount(frame_idx, minlength=len(joints)))
+
+    counts = np.zeros(grid.size, dtype=np.int64)
+    first = 0
+    while first < len(joints):
+        # 候補ボクセルの数が上限を超えないようにフレームの範囲を決める
+        done = frame_end[first - 1] if first > 0 else 0
+        last = np.searchsorted(frame_end, done + _RASTERIZE_BUDGET, side="right")
+        last = min(max(last, first + 1), len(joints))
+
+        bones = slice(bone_end[first - 1] if first > 0 else 0, bone_end[last - 1])
+        counts += _rasterize_chunk(
+            start[bones],
+            end[bones],
+            lower[bones],
+            upper[bones],
+            frame_idx[bones],
+            grid,
+            radius,
+        )
+        first = last
+
+    return counts.reshape(grid.shape)
+
+
+def compute_bone_sweep_space(
+    joints: NDArray,
+    grid: WorkspaceGrid,
+    radius: float,
+    *,
+    connection: Sequence[Tuple[int, int]] = SKELETON_CONNECTION,
+) -> NDArray[np.float64]:
+    """
+    骨をカプセルとして人間の掃引空間を計算し，フレーム数で除して確率を求め，3次元配列で返す．
+    詳細は count_bones を参照．
+
+    Parameters
+    ----------
+    joints : NDArray
+        関節の座標．形状は (frames, joints, 3)．
+    grid : WorkspaceGrid
+        作業空間．
+    radius : float
+        カプセルの半径 [m]．
+    connection : Sequence[Tuple[int, int]]
+        骨を構成する関節のインデックスの組．
+
+    Returns
+    -------
+    sweep_space : NDArray[np.float64]
+        各ボクセルが占有される確率．形状は grid.shape．
+    """
+    if len(joints) == 0:
+        raise ValueError("joints must have at least one frame")
+
+    return count_bones(joints, grid, radius, connection=connection) / float(len(joints))
+
+
+def _rasterize_chunk(
+    start: NDArray,
+    end: NDArray,
+    lower: NDArray,
+    upper: NDArray,
+    frame_idx: NDArray,
+    grid: WorkspaceGrid,
+    radius: float,
+) -> NDArray[np.int64]:
+    """カプセルをまとめてボクセルに塗りつぶす．各カプセルの候補は直方体内の全ボクセル"""
+
+    # カプセルごとに大きさの異なる直方体を1列に並べる
+    extent = upper - lower + 1
+    candidate_num = extent.prod(axis=-1)
+    owner = np.repeat(np.arange(len(start)), candidate_num)
+    local = np.arange(owner.size) - np.repeat(
+        np.cumsum(candidate_num) - candidate_num, candidate_num
+    )
+
+    # 直方体内の通し番号を3次元のインデックスに戻す
+    ext_y = extent[owner, 1]
+    ext_z = extent[owner, 2]
+    index = lower[owner]
+    index[:, 0] += local // (ext_y * ext_z)
+    index[:, 1] += local // ext_z % ext_y
+    index[:, 2] += local % ext_z
+
+    # ボクセルの中心から線分までの距離を求める
+    center = grid.min_pos + (index + 0.5) * grid.grid_size
+    direction = end[owner] - start[owner]
+    rel = center - start[owner]
+    length_sq = np.maximum((direction**2).sum(axis=-1), 1e-12)
+    t = np.clip((rel * direction).sum(axis=-1) / length_sq, 0.0, 1.0)
+    dist_sq = ((rel - t[:, None] * direction) ** 2).sum(axis=-1)
+    inside = dist_sq <= radius**2
+
+    # フレームごとに重複を除いてから数える
+    strides = np.array([grid.shape[1] * grid.shape[2], grid.shape[2], 1])
+    key = frame_idx[owner[inside]] * grid.size + index[inside] @ strides
+    return np.bincount(np.unique(key) % grid.size, minlength=grid.size)
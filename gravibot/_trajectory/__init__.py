@@ -0,0 +1,77 @@
+"""This module is __init__.py of gravibot/_trajectory package."""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from .difference import (
+    get_difference_matrix,
+    get_delta,
+    get_start_data,
+    get_end_data,
+    get_result,
+)
+from .bspline import get_bspline_knots, get_bspline_basis, fit_bspline_control
+from .obstacle import (
+    get_obstacle_arrays,
+    get_reachable_obstacles,
+    get_obstacle_depth_function,
+    get_obstacle_constraints,
+)
+from .optimizer import TrajectoryOptimizer, TrajectoryResult
+from .qp import MinimumJerkQP
+from .collocation import CollocationOptimizer
+from .seed import (
+    get_linear_seed,
+    get_min_jerk_seed,
+    get_spline_seed,
+    get_random_seed,
+    get_decision_vector,
+)
+from .warm_start import WarmStartStore, WARM_START_SOLVER_OPTIONS
+from .mpc import RecedingHorizonPlanner, RecedingHorizonStep
+from .multilevel import (
+    CoarseToFineOptimizer,
+    CoarseToFineResult,
+    get_default_schedule,
+)
+from .multistart import MultistartOptimizer, MultistartResult
+from .inverse_kinematics import InverseKinematicsSolver, InverseKinematicsResult
+
+__all__ = [
+    "get_difference_matrix",
+    "get_delta",
+    "get_start_data",
+    "get_end_data",
+    "get_result",
+    "get_bspline_knots",
+    "get_bspline_basis",
+    "fit_bspline_control",
+    "get_obstacle_arrays",
+    "get_reachable_obstacles",
+    "get_obstacle_depth_function",
+    "get_obstacle_constraints",
+    "MinimumJerkQP",
+    "get_linear_seed",
+    "get_min_jerk_seed",
+    "get_spline_seed",
+    "get_random_seed",
+    "get_decision_vector",
+    "WarmStartStore",
+    "WARM_START_SOLVER_OPTIONS",
+    "TrajectoryOptimizer",
+    "TrajectoryResult",
+    "CollocationOptimizer",
+    "RecedingHorizonPlanner",
+    "RecedingHorizonStep",
+    "CoarseToFineOptimizer",
+    "CoarseToFineResult",
+    "get_default_schedule",
+    "MultistartOptimizer",
+    "MultistartResult",
+    "InverseKinematicsSolver",
+    "InverseKinematicsResult",
+]
@@ -0,0 +1,138 @@
+"""provide functions for the B-spline parameterization of trajectories"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .._util.type_check import _type_checked
+
+
+def get_bspline_knots(control_num: int, degree: int = 3) -> NDArray[np.float64]:
+    """
+    [0, 1] 上の両端を固定した一様なB-splineのノット列を返す．
+
+    Parameters
+    ----------
+    control_num : int
+        制御点の数．
+    degree : int
+        B-splineの次数．
+
+    Returns
+    -------
+    knots : NDArray[np.float64]
+        ノット列．形状は (control_num + degree + 1,)．
+    """
+    control_num = _type_checked(control_num, int)
+    degree = _type_checked(degree, int)
+    if degree < 1:
+        raise ValueError("degree must be 1 or more")
+    if control_num < degree + 1:
+        raise ValueError("control_num must be degree + 1 or more")
+
+    inner = np.linspace(0.0, 1.0, control_num - degree + 1)
+    return np.concatenate([np.zeros(degree), inner, np.ones(degree)])
+
+
+def _get_basis(
+    u: NDArray, knots: NDArray, degree: int, derivative: int
+) -> NDArray[np.float64]:
+    """Cox-de Boor の漸化式で基底関数（の導関数）の値を返す．形状は (len(u), 基底の数)"""
+
+    if degree == 0:
+        # u が区間 [t_i, t_i+1) に入るかどうか．u = 1 は最後の空でない区間に含める
+        basis = (knots[:-1] <= u[:, None]) & (u[:, None] < knots[1:])
+        last = np.nonzero(knots[:-1] < knots[1:])[0][-1]
+        basis[u >= knots[-1], last] = True
+        return basis.astype(np.float64) if derivative == 0 else np.zeros(basis.shape)
+
+    lower = _get_basis(u, knots, degree - 1, derivative - 1 if derivative > 0 else 0)
+    left_span = knots[degree:-1] - knots[: -degree - 1]
+    right_span = knots[degree + 1 :] - knots[1:-degree]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_left = np.where(left_span > 0.0, 1.0 / left_span, 0.0)
+        inv_right = np.where(right_span > 0.0, 1.0 / right_span, 0.0)
+
+    if derivative > 0:
+        # d^k N_i,p = p (d^(k-1) N_i,p-1 / (t_i+p - t_i) - d^(k-1) N_i+1,p-1 / (t_i+p+1 - t_i+1))
+        return degree * (lower[:, :-1] * inv_left - lower[:, 1:] * inv_right)
+
+    left = (u[:, None] - knots[: -degree - 1]) * inv_left
+    right = (knots[degree + 1 :] - u[:, None]) * inv_right
+    return left * lower[:, :-1] + right * lower[:, 1:]
+
+
+def get_bspline_basis(
+    time_num: int, control_num: int, degree: int = 3, derivative: int = 0
+) -> NDArray[np.float64]:
+    """
+    制御点から等間隔の時刻の値（または導関数）を求める基底行列を返す．
+    theta = basis @ control で，関節ごとの time_num 点の値が求まる．
+    両端を固定したB-splineなので，最初と最後の値は最初と最後の制御点に一致する．
+
+    Parameters
+    ----------
+    time_num : int
+        時間刻みの数．
+    control_num : int
+        制御点の数．
+    degree : int
+        B-splineの次数．
+    derivative : int
+        導関数の階数．時間刻みあたりの変化量として返す．
+
+    Returns
+    -------
+    basis : NDArray[np.float64]
+        基底行列．形状は (time_num, control_num)．
+    """
+    time_num = _type_checked(time_num, int)
+    derivative = _type_checked(derivative, int)
+    if time_num < 2:
+        raise ValueError("time_num must be 2 or more")
+    if derivative < 0:
+        raise ValueError("derivative must be non-negative")
+
+    knots = get_bspline_knots(control_num, degree)
+    if derivative > degree:
+        return np.zeros((time_num, control_num))
+
+    u = np.linspace(0.0, 1.0, time_num)
+    basis = _get_basis(u, knots, degree, derivative)
+
+    # u は時刻の番号を time_num - 1 で割ったものなので，導関数を時間刻みあたりに直す
+    return basis / float(time_num - 1) ** derivative
+
+
+def fit_bspline_control(
+    theta: NDArray, control_num: int, degree: int = 3
+) -> NDArray[np.float64]:
+    """
+    軌道に最小二乗で近いB-splineの制御点を返す．
+
+    Parameters
+    ----------
+    theta : NDArray
+        軌道．形状は (dof, time_num)．
+    control_num : int
+        制御点の数．
+    degree : int
+        B-splineの次数．
+
+    Returns
+    -------
+    control : NDArray[np.float64]
+        制御点．形状は (dof, control_num)．
+    """
+    theta = np.asarray(theta, dtype=np.float64)
+    if theta.ndim != 2:
+        raise ValueError("theta must have the shape (dof, time_num)")
+
+    basis = get_bspline_basis(theta.shape[1], control_num, degree)
+    return np.linalg.lstsq(basis, theta.T, rcond=None)[0].T
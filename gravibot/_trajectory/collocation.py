@@ -0,0 +1,264 @@
+"""provide CollocationOptimizer class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+import casadi as cs  # type: ignore
+
+from .optimizer import WEIGHT_NAMES, TrajectoryOptimizer, TrajectoryResult
+from .qp import BOUNDARY_STEP_NUM
+from .warm_start import WarmStartStore
+from .._kinect.risk_grid import TimeVaryingRiskGrid
+from ..robot import Robot
+
+# 各時刻の状態と制御の数（角度，速度，加速度）
+STAGE_SIZE = 3
+
+
+class CollocationOptimizer(TrajectoryOptimizer):
+    """
+    class to optimize the joint trajectory by trapezoidal direct collocation.
+    the angle and the velocity are explicit states and the acceleration is the
+    control at each time step, and the dynamics are the defect constraints
+    theta[k+1] = theta[k] + (dtheta[k] + dtheta[k+1]) / 2
+    dtheta[k+1] = dtheta[k] + (ddtheta[k] + ddtheta[k+1]) / 2
+    in the unit of a time step. the acceleration is piecewise linear, so the
+    jerk on each interval is ddtheta[k+1] - ddtheta[k], and the smoothness cost
+    is its sum of squares.
+
+    the decision vector is arranged per time step, (theta, dtheta, ddtheta) of
+    all joints for each step, so the Jacobian of the defects is banded and each
+    cost couples only neighboring steps. the velocity and the acceleration can
+    be bounded directly.
+
+    the boundary conditions are the same as TrajectoryOptimizer: start_velocity
+    and start_acceleration of solve() are the forward differences
+    theta[1] - theta[0] and theta[2] - 2 theta[1] + theta[0], and the last
+    BOUNDARY_STEP_NUM angles equal the goal. the states of these steps are
+    fixed by the bounds of the variables to the constant-acceleration motion
+    through the angles, whose states are
+    ddtheta[k] = acceleration, dtheta[0] = velocity - acceleration / 2,
+    and which satisfies the defect constraints exactly.
+
+    the other costs, the relay points and solve() are the same as
+    TrajectoryOptimizer. the closed-form solution is not used.
+    """
+
+    def __init__(
+        self,
+        robot: Robot,
+        time_num: int,
+        *,
+        smooth_weight: float = 1.0,
+        risk_grid: Optional[TimeVaryingRiskGrid] = None,
+        risk_weight: float = 1.0,
+        obstacles: Sequence[Tuple[NDArray, float]] = (),
+        obstacle_weight: float = 1.0,
+        obstacle_buffer: float = 0.0,
+        relay_steps: Sequence[int] = (),
+        joint_indices: Optional[Sequence[int]] = None,
+        bounds: Optional[Tuple[float, float]] = None,
+        velocity_bound: Optional[float] = None,
+        acceleration_bound: Optional[float] = None,
+        warm_start_store: Optional[WarmStartStore] = None,
+        solver_options: Optional[Dict] = None,
+    ):
+        """
+        Parameters
+        ----------
+        robot : Robot
+            ロボット．
+        time_num : int
+            時間刻みの数．
+        smooth_weight : float
+            ジャークの二乗和の重み．
+        risk_grid : Optional[TimeVaryingRiskGrid]
+            時間ごとの危険度．TrajectoryOptimizer と同じ．
+        risk_weight : float
+            危険度の和の重み．
+        obstacles : Sequence[Tuple[NDArray, float]]
+            球の障害物の (中心, 半径) のリスト．
+        obstacle_weight : float
+            障害物への侵入量の和の重み．
+        obstacle_buffer : float
+            障害物の半径に加える余裕．
+        relay_steps : Sequence[int]
+            中継点を通る時刻の番号のリスト．
+        joint_indices : Optional[Sequence[int]]
+            危険度と障害物を評価する関節の番号．Noneの場合は全ての可動関節．
+        bounds : Optional[Tuple[float, float]]
+            全関節で共通の角度の下限と上限．Noneの場合はロボットの可動範囲．
+        velocity_bound : Optional[float]
+            全関節で共通の時間刻みあたりの速度の絶対値の上限．Noneの場合は制限しない．
+        acceleration_bound : Optional[float]
+            全関節で共通の時間刻みあたりの加速度の絶対値の上限．Noneの場合は制限しない．
+        warm_start_store : Optional[WarmStartStore]
+            過去の解の保存先．
+        solver_options : Optional[Dict]
+            IPOPTの設定．DEFAULT_SOLVER_OPTIONS を上書きする．
+        """
+        self._velocity_bound = self._check_bound(velocity_bound, "velocity_bound")
+        self._acceleration_bound = self._check_bound(
+            acceleration_bound, "acceleration_bound"
+        )
+
+        super().__init__(
+            robot,
+            time_num,
+            smooth_weight=smooth_weight,
+            risk_grid=risk_grid,
+            risk_weight=risk_weight,
+            obstacles=obstacles,
+            obstacle_weight=obstacle_weight,
+            obstacle_buffer=obstacle_buffer,
+            relay_steps=relay_steps,
+            joint_indices=joint_indices,
+            bounds=bounds,
+            warm_start_store=warm_start_store,
+            closed_form=False,
+            eliminate_boundary=False,
+            solver_options=solver_options,
+        )
+
+    @property
+    def velocity_bound(self) -> float:
+        """getter for the bound of the absolute velocity per time step"""
+        return self._velocity_bound
+
+    @property
+    def acceleration_bound(self) -> float:
+        """getter for the bound of the absolute acceleration per time step"""
+        return self._acceleration_bound
+
+    @staticmethod
+    def _check_bound(bound: Optional[float], name: str) -> float:
+        if bound is None:
+            return np.inf
+
+        bound = float(bound)
+        if bound <= 0.0:
+            raise ValueError(f"{name} must be positive")
+        return bound
+
+    def _build(
+        self,
+        obstacles: Sequence[Tuple[NDArray, float]],
+        obstacle_buffer: float,
+        solver_options: Dict,
+    ) -> None:
+        """NLPとソルバを生成する"""
+
+        t_num, dof = self._time_num, self._dof
+        x = cs.MX.sym("x", STAGE_SIZE * dof * t_num)
+        start = cs.MX.sym("start", dof)
+        goal = cs.MX.sym("goal", dof)
+        motion = cs.MX.sym("start_motion", 2 * dof)
+        relay = cs.MX.sym("relay", dof * len(self._relay_steps))
+        weights = cs.MX.sym("weights", len(WEIGHT_NAMES))
+        smooth_weight, risk_weight, obstacle_weight = cs.vertsplit(weights)
+        params = [start, goal, motion, relay, weights]
+
+        # 列が時刻ごとの (角度, 速度, 加速度)
+        stages = cs.reshape(x, STAGE_SIZE * dof, t_num)
+        theta = stages[:dof, :]
+        dtheta = stages[dof : 2 * dof, :]
+        ddtheta = stages[2 * dof :, :]
+
+        jerk = ddtheta[:, 1:] - ddtheta[:, :-1]
+        cost = smooth_weight * cs.sumsqr(jerk) + self._get_position_cost(
+            cs.reshape(theta.T, -1, 1),
+            params,
+            risk_weight,
+            obstacle_weight,
+            obstacles,
+            obstacle_buffer,
+        )
+
+        # 台形則の欠損を時刻の順に並べ，ヤコビアンを帯状にする
+        defects = cs.vertcat(
+            theta[:, 1:] - theta[:, :-1] - (dtheta[:, 1:] + dtheta[:, :-1]) / 2,
+            dtheta[:, 1:] - dtheta[:, :-1] - (ddtheta[:, 1:] + ddtheta[:, :-1]) / 2,
+        )
+        constraints = [cs.reshape(defects, -1, 1)]
+
+        # 中継点の制約は常に作っておき，使わない場合は上下限を無限大にする
+        for k, step in enumerate(self._relay_steps):
+            constraints.append(theta[:, step] - relay[k * dof : (k + 1) * dof])
+        constraints = cs.vertcat(*constraints)
+
+        nlp = {"x": x, "p": cs.vertcat(*params), "f": cost, "g": constraints}
+        self._solver = cs.nlpsol("solver", "ipopt", nlp, solver_options)
+        self._g_num = constraints.shape[0]
+        self._relay_g_offset = self._g_num - dof * len(self._relay_steps)
+
+    def _get_variable_bounds(self) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """決定変数の上下限を返す"""
+
+        velocity = np.full(self._dof, self._velocity_bound)
+        acceleration = np.full(self._dof, self._acceleration_bound)
+        lower = np.concatenate([self._lower, -velocity, -acceleration])
+        upper = np.concatenate([self._upper, velocity, acceleration])
+
+        return np.tile(lower, self._time_num), np.tile(upper, self._time_num)
+
+    def _get_solver_args(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        relay_points: Optional[Sequence[Optional[NDArray]]],
+        motion: Optional[NDArray] = None,
+    ) -> Dict:
+        args = super()._get_solver_args(start, goal, relay_points, motion)
+        if motion is None:
+            motion = np.zeros((2, self._dof))
+
+        # 開始の差分を満たす等加速度運動と，目標での静止の状態を上下限で固定する
+        velocity, acceleration = motion
+        size = STAGE_SIZE * self._dof
+        fixed = []
+        for k in range(BOUNDARY_STEP_NUM):
+            theta = start + k * velocity + k * (k - 1) / 2 * acceleration
+            dtheta = velocity - acceleration / 2 + k * acceleration
+            fixed.append((k, np.concatenate([theta, dtheta, acceleration])))
+        rest = np.concatenate([goal, np.zeros(2 * self._dof)])
+        for k in range(BOUNDARY_STEP_NUM):
+            fixed.append((self._time_num - 1 - k, rest))
+
+        for key in ("lbx", "ubx"):
+            args[key] = args[key].copy()
+            for step, state in fixed:
+                args[key][step * size : (step + 1) * size] = state
+
+        return args
+
+    def _set_initial_point(
+        self, args: Dict, warm_start: Union[TrajectoryResult, NDArray]
+    ) -> None:
+        """ソルバの引数に初期値を設定する．軌道の場合は差分で速度と加速度を補う"""
+
+        if isinstance(warm_start, TrajectoryResult):
+            super()._set_initial_point(args, warm_start)
+            return
+
+        theta = np.asarray(warm_start, dtype=np.float64).reshape(-1)
+        if theta.shape != (self._dof * self._time_num,):
+            raise ValueError("warm_start must have dof * time_num elements")
+        theta = theta.reshape(self._dof, self._time_num)
+        dtheta = np.gradient(theta, axis=1)
+        ddtheta = np.gradient(dtheta, axis=1)
+
+        args["x0"] = np.vstack([theta, dtheta, ddtheta]).T.reshape(-1)
+
+    def _get_theta(self, x: NDArray, p: NDArray) -> NDArray[np.float64]:
+        """決定変数から 関節 x 時間 の角度を返す"""
+
+        return x.reshape(self._time_num, STAGE_SIZE * self._dof)[:, : self._dof].T
@@ -0,0 +1,145 @@
+"""provide difference operators for trajectory decision vectors"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+import casadi as cs  # type: ignore
+
+# 決定変数は関節ごとに時系列を並べた1次元のベクトルである
+# theta = [theta_0(t_0), ..., theta_0(t_T-1), theta_1(t_0), ..., theta_dof-1(t_T-1)]
+Trajectory = Union[cs.MX, cs.SX, cs.DM, NDArray]
+
+
+def get_difference_matrix(length: int, dim: int, order: int = 1) -> cs.DM:
+    """
+    決定変数の差分を求める疎な定数行列を生成する．
+    非零要素の数は length * dim * (order + 1) 程度であり，生成の計算量は線形である．
+
+    Parameters
+    ----------
+    length : int
+        1つの関節の時系列の長さ．
+    dim : int
+        関節の数．
+    order : int
+        差分の階数．1: 速度，2: 加速度，3: ジャーク．
+
+    Returns
+    -------
+    diff_mat : cs.DM
+        (dim * (length - order)) x (dim * length) の疎行列．
+    """
+    if order < 0 or order >= length:
+        raise ValueError("order must be 0 or more and less than length")
+
+    # order 階差分の係数は二項係数に交互の符号をつけたもの
+    coef = np.array([1.0])
+    for _ in range(order):
+        coef = np.convolve(coef, [-1.0, 1.0])
+
+    out_len = length - order
+    row = np.repeat(np.arange(dim * out_len), order + 1)
+    base = (np.arange(dim)[:, None] * length + np.arange(out_len)).reshape(-1)
+    col = (base[:, None] + np.arange(order + 1)).reshape(-1)
+    value = np.tile(coef, dim * out_len)
+
+    return cs.DM.triplet(row.tolist(), col.tolist(), value, dim * out_len, dim * length)
+
+
+def get_delta(theta: Trajectory, length: int, dim: int, order: int = 1) -> Trajectory:
+    """
+    決定変数の時間方向の差分を返す．関節の境界をまたぐ差分は含まない．
+
+    Parameters
+    ----------
+    theta : Trajectory
+        決定変数．長さは length * dim．
+    length : int
+        1つの関節の時系列の長さ．
+    dim : int
+        関節の数．
+    order : int
+        差分の階数．
+
+    Returns
+    -------
+    delta : Trajectory
+        差分．長さは (length - order) * dim で，並びは theta と同じ．
+        NumPyの配列を渡した場合はNumPyの配列を返す．
+    """
+    if isinstance(theta, np.ndarray):
+        return np.diff(theta.reshape(dim, length), n=order, axis=1).reshape(-1)
+
+    return cs.mtimes(get_difference_matrix(length, dim, order), theta)
+
+
+def get_start_data(theta: Trajectory, length: int, dim: int) -> Trajectory:
+    """
+    各関節の時系列の最初の値を返す．
+
+    Parameters
+    ----------
+    theta : Trajectory
+        決定変数．長さは length * dim．
+    length : int
+        1つの関節の時系列の長さ．
+    dim : int
+        関節の数．
+
+    Returns
+    -------
+    start : Trajectory
+        各関節の最初の値．長さは dim．
+    """
+    return theta[0 : length * dim : length]
+
+
+def get_end_data(theta: Trajectory, length: int, dim: int) -> Trajectory:
+    """
+    各関節の時系列の最後の値を返す．
+
+    Parameters
+    ----------
+    theta : Trajectory
+        決定変数．長さは length * dim．
+    length : int
+        1つの関節の時系列の長さ．
+    dim : int
+        関節の数．
+
+    Returns
+    -------
+    end : Trajectory
+        各関節の最後の値．長さは dim．
+    """
+    return theta[length - 1 : length * dim : length]
+
+
+def get_result(theta: Trajectory, length: int, dim: int) -> NDArray[np.float64]:
+    """
+    数値の決定変数を 関節 x 時間 の2次元の配列に変換する．
+
+    Parameters
+    ----------
+    theta : Trajectory
+        数値の決定変数（ソルバの結果の "x" など）．長さは length * dim．
+    length : int
+        1つの関節の時系列の長さ．
+    dim : int
+        関節の数．
+
+    Returns
+    -------
+    result : NDArray[np.float64]
+        形状は (dim, length)．
+    """
+    return np.asarray(theta, dtype=np.float64).reshape(dim, length)
@@ -0,0 +1,243 @@
+"""provide InverseKinematicsSolver class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+import casadi as cs  # type: ignore
+
+from .optimizer import DEFAULT_SOLVER_OPTIONS
+from .._util.type_check import _type_checked
+from ..robot import Robot
+
+
+class InverseKinematicsResult:
+    """
+    class for a result of InverseKinematicsSolver.
+    """
+
+    __slots__ = (
+        "theta",
+        "position",
+        "cost",
+        "success",
+        "status",
+        "iter_count",
+        "solve_time",
+    )
+
+    def __init__(
+        self,
+        theta: NDArray,
+        position: NDArray,
+        cost: float,
+        success: bool,
+        status: str,
+        iter_count: int,
+        solve_time: float,
+    ):
+        self.theta = theta  # 関節の角度
+        self.position = position  # 求めた角度での関節の位置
+        self.cost = cost  # 目的関数の値
+        self.success = success  # ソルバが収束したか
+        self.status = status  # ソルバの終了状態
+        self.iter_count = iter_count  # 反復回数
+        self.solve_time = solve_time  # 解くのにかかった時間 [s]
+
+    def __str__(self):
+        return (
+            f"success: {self.success}, status: {self.status}, cost: {self.cost}, "
+            + f"iter: {self.iter_count}, time: {self.solve_time * 1000:.1f}[ms]"
+        )
+
+
+class InverseKinematicsSolver:
+    """
+    class to solve the inverse kinematics of a robot by optimization.
+    the target position, the reference angles and the regularization weight are
+    CasADi parameters, so the solver is built once and reused for every target.
+
+    the cost is
+    (squared distance between the joint and the target)
+    + regularization * (squared distance between the angles and the reference).
+    """
+
+    def __init__(
+        self,
+        robot: Robot,
+        *,
+        joint_index: Optional[int] = None,
+        regularization: float = 0.0,
+        bounds: Optional[Tuple[float, float]] = None,
+        solver_options: Optional[Dict] = None,
+    ):
+        """
+        Parameters
+        ----------
+        robot : Robot
+            ロボット．
+        joint_index : Optional[int]
+            目標に合わせる位置の番号．Noneの場合は手先，つまり最後のリンクの先端で，
+            robot.get_joint_pos(robot.get_link_num() - 1) と同じ位置．
+            整数の場合は robot.get_joint_pos_casadi の引数で，k は k 番目の可動関節の
+            リンクの先端を表す．固定リンクは数えないため get_joint_pos の番号とは異なる．
+            get_joint_pos_casadi の0は特別な扱いになるため，1 以上 dof 以下かつ
+            リンクの数未満とする．
+        regularization : float
+            参照角度からのずれの二乗和の重み．
+        bounds : Optional[Tuple[float, float]]
+            全関節で共通の角度の下限と上限．Noneの場合はロボットの可動範囲．
+        solver_options : Optional[Dict]
+            IPOPTの設定．DEFAULT_SOLVER_OPTIONS を上書きする．
+        """
+        if not isinstance(robot, Robot):
+            raise TypeError(f"robot must be Robot, not {type(robot)}")
+
+        self._robot = robot
+        self._dof = robot.get_moveable_link_num()
+        if joint_index is not None:
+            joint_index = _type_checked(joint_index, int)
+            last = min(self._dof, robot.get_link_num() - 1)
+            if not 1 <= joint_index <= last:
+                raise ValueError(f"joint_index must be in range [1, {last}] or None")
+        self._joint_index = joint_index
+        self.set_regularization(regularization)
+
+        if bounds is not None:
+            self._lbx = np.full(self._dof, float(bounds[0]))
+            self._ubx = np.full(self._dof, float(bounds[1]))
+        else:
+            self._lbx, self._ubx = np.array(
+                [robot.get_moveable_link_bounds(i) for i in range(self._dof)]
+            ).T
+
+        self._build({**DEFAULT_SOLVER_OPTIONS, **(solver_options or {})})
+
+    @property
+    def robot(self) -> Robot:
+        """getter for the robot"""
+        return self._robot
+
+    @property
+    def dof(self) -> int:
+        """getter for the number of movable joints"""
+        return self._dof
+
+    @property
+    def joint_index(self) -> Optional[int]:
+        """getter for the index of the joint to move to the target (None: end effector)"""
+        return self._joint_index
+
+    @property
+    def regularization(self) -> float:
+        """getter for the weight of the regularization"""
+        return self._regularization
+
+    @property
+    def solver(self) -> cs.Function:
+        """getter for the CasADi NLP solver"""
+        return self._solver
+
+    def set_regularization(self, regularization: float) -> None:
+        """
+        正則化の重みを更新する．重みはNLPのパラメータであるため，ソルバは作り直さない．
+
+        Parameters
+        ----------
+        regularization : float
+            参照角度からのずれの二乗和の重み．
+        """
+        regularization = float(regularization)
+        if regularization < 0.0:
+            raise ValueError("regularization must be non-negative")
+        self._regularization = regularization
+
+    def solve(
+        self,
+        target: NDArray,
+        *,
+        reference: Optional[NDArray] = None,
+        initial: Optional[NDArray] = None,
+    ) -> InverseKinematicsResult:
+        """
+        目標の位置に関節を合わせる角度を求める．
+
+        Parameters
+        ----------
+        target : NDArray
+            目標の位置．形状は (3,)．
+        reference : Optional[NDArray]
+            正則化の参照角度．形状は (dof,)．Noneの場合は initial．
+        initial : Optional[NDArray]
+            初期値．形状は (dof,)．Noneの場合は可動範囲の中央．
+
+        Returns
+        -------
+        result : InverseKinematicsResult
+            求めた結果．
+        """
+        target = np.asarray(target, dtype=np.float64).reshape(-1)
+        if target.shape != (3,):
+            raise ValueError("target must have 3 elements")
+
+        if initial is None:
+            initial = (self._lbx + self._ubx) / 2.0
+        initial = self._check_angles(initial, "initial")
+        reference = (
+            initial if reference is None else self._check_angles(reference, "reference")
+        )
+
+        start_time = time.perf_counter()
+        sol = self._solver(
+            x0=initial,
+            p=np.concatenate([target, reference, [self._regularization]]),
+            lbx=self._lbx,
+            ubx=self._ubx,
+        )
+        solve_time = time.perf_counter() - start_time
+        stats = self._solver.stats()
+
+        theta = np.array(sol["x"]).reshape(-1)
+        return InverseKinematicsResult(
+            theta,
+            np.array(self._fk(theta)).reshape(-1),
+            float(sol["f"]),
+            bool(stats.get("success", False)),
+            str(stats.get("return_status", "")),
+            int(stats.get("iter_count", 0)),
+            solve_time,
+        )
+
+    def _build(self, solver_options: Dict) -> None:
+        """NLPとソルバを生成する"""
+
+        theta = cs.MX.sym("theta", self._dof)
+        target = cs.MX.sym("target", 3)
+        reference = cs.MX.sym("reference", self._dof)
+        weight = cs.MX.sym("weight")
+
+        if self._joint_index is None:
+            pos = self._robot.get_end_effector_pos_casadi(theta)
+        else:
+            pos = self._robot.get_joint_pos_casadi(self._joint_index, theta)
+        self._fk = cs.Function("fk", [theta], [pos])
+
+        cost = cs.sumsqr(pos - target) + weight * cs.sumsqr(theta - reference)
+        nlp = {"x": theta, "p": cs.vertcat(target, reference, weight), "f": cost}
+        self._solver = cs.nlpsol("solver", "ipopt", nlp, solver_options)
+
+    def _check_angles(self, theta: NDArray, name: str) -> NDArray[np.float64]:
+        theta = np.asarray(theta, dtype=np.float64).reshape(-1)
+        if theta.shape != (self._dof,):
+            raise ValueError(f"{name} must have {self._dof} elements")
+
+        return theta
@@ -0,0 +1,215 @@
+"""provide RecedingHorizonPlanner class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import time
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .optimizer import TrajectoryOptimizer, TrajectoryResult
+from .._kinect.risk_grid import TimeVaryingRiskGrid
+from .._util.latency import LatencyStatistics
+from .._util.type_check import _type_checked
+
+
+class RecedingHorizonStep:
+    """
+    class for a cycle of RecedingHorizonPlanner.
+    plan[:, 0] is the angles at the start of the cycle, and plan[:, 1 : shift + 1]
+    are the angles to execute until the next cycle.
+    """
+
+    __slots__ = ("plan", "result", "timed_out", "fallback", "latency")
+
+    def __init__(
+        self,
+        plan: NDArray,
+        result: Optional[TrajectoryResult],
+        timed_out: bool,
+        fallback: bool,
+        latency: float,
+    ):
+        self.plan = plan  # 関節 x 時間 の計画
+        self.result = result  # 最適化の結果
+        self.timed_out = timed_out  # 期限を過ぎたか
+        self.fallback = fallback  # 前回の計画を使ったか
+        self.latency = latency  # 1周期の計算時間 [s]
+
+    def __str__(self):
+        return (
+            f"fallback: {self.fallback}, timed out: {self.timed_out}, "
+            + f"latency: {self.latency * 1000:.1f}[ms], result: {self.result}"
+        )
+
+
+class RecedingHorizonPlanner:
+    """
+    class to replan the joint trajectory continuously over a fixed-length horizon.
+    the solver of the optimizer is built once, and each cycle
+    1. shifts the previous plan by shift steps, holding the last angles,
+    2. solves from the angles, velocity and acceleration of the shifted plan at
+       its first step, with the shifted plan as the initial point,
+    3. adopts the new plan if the solver converged within the deadline, or
+       keeps the shifted plan otherwise.
+
+    the deadline is enforced by IPOPT, which stops at ipopt.max_wall_time.
+    the solver options are fixed when the solver is built, so the optimizer must
+    be built with solver_options {"ipopt.max_wall_time": deadline} or a smaller
+    value; otherwise the constructor raises ValueError.
+    only the primal solution is warm-started: the multipliers of the previous
+    plan belong to other time steps and constraints, so they are not passed.
+    the latency of every cycle is collected in the latency property.
+    """
+
+    def __init__(
+        self,
+        optimizer: TrajectoryOptimizer,
+        *,
+        deadline: float = 0.1,
+        shift: int = 1,
+    ):
+        """
+        Parameters
+        ----------
+        optimizer : TrajectoryOptimizer
+            計画区間の軌道の最適化器．time_num が計画区間の長さになる．
+        deadline : float
+            1周期の計算時間の期限 [s]．optimizer の ipopt.max_wall_time 以上とする．
+        shift : int
+            1周期で進める時間刻みの数．
+        """
+        if not isinstance(optimizer, TrajectoryOptimizer):
+            raise TypeError(
+                f"optimizer must be TrajectoryOptimizer, not {type(optimizer)}"
+            )
+
+        deadline = float(deadline)
+        if deadline <= 0.0:
+            raise ValueError("deadline must be positive")
+        max_wall_time = optimizer.solver_options.get("ipopt.max_wall_time")
+        if max_wall_time is None or float(max_wall_time) > deadline:
+            raise ValueError(
+                "optimizer must be built with solver_options "
+                + f"{{'ipopt.max_wall_time': t}} where t <= deadline ({deadline})"
+            )
+        shift = _type_checked(shift, int)
+        if not 0 < shift < optimizer.time_num - 2:
+            raise ValueError(f"shift must be in range (0, {optimizer.time_num - 2})")
+
+        self._optimizer = optimizer
+        self._deadline = deadline
+        self._shift = shift
+        self._plan: Optional[NDArray[np.float64]] = None
+        self._latency = LatencyStatistics()
+        self._fallback_num = 0
+
+    @property
+    def optimizer(self) -> TrajectoryOptimizer:
+        """getter for the optimizer"""
+        return self._optimizer
+
+    @property
+    def deadline(self) -> float:
+        """getter for the deadline of a cycle [s]"""
+        return self._deadline
+
+    @property
+    def shift(self) -> int:
+        """getter for the number of time steps to advance in a cycle"""
+        return self._shift
+
+    @property
+    def plan(self) -> Optional[NDArray[np.float64]]:
+        """getter for the current plan"""
+        return None if self._plan is None else self._plan.copy()
+
+    @property
+    def latency(self) -> LatencyStatistics:
+        """getter for the latency of the cycles"""
+        return self._latency
+
+    @property
+    def fallback_num(self) -> int:
+        """getter for the number of cycles that kept the previous plan"""
+        return self._fallback_num
+
+    def reset(self, start: NDArray) -> None:
+        """
+        開始の角度で静止した計画に戻す．
+
+        Parameters
+        ----------
+        start : NDArray
+            開始時の角度．形状は (dof,)．
+        """
+        start = np.asarray(start, dtype=np.float64).reshape(-1)
+        if start.shape != (self._optimizer.dof,):
+            raise ValueError(f"start must have {self._optimizer.dof} elements")
+
+        self._plan = np.repeat(start[:, None], self._optimizer.time_num, axis=1)
+
+    def step(
+        self,
+        goal: NDArray,
+        *,
+        risk_grid: Optional[TimeVaryingRiskGrid] = None,
+    ) -> RecedingHorizonStep:
+        """
+        計画を shift だけ進めて再計画する．
+
+        Parameters
+        ----------
+        goal : NDArray
+            目標の角度．形状は (dof,)．
+        risk_grid : Optional[TimeVaryingRiskGrid]
+            最新の危険度．Noneの場合は前回の危険度を使う．
+
+        Returns
+        -------
+        step : RecedingHorizonStep
+            この周期の計画と結果．
+        """
+        if self._plan is None:
+            raise ValueError("reset() must be called before step()")
+
+        start_time = time.perf_counter()
+
+        # 前回の計画を進め，最後の角度を保持する
+        shifted = np.hstack(
+            [
+                self._plan[:, self._shift :],
+                np.repeat(self._plan[:, -1:], self._shift, axis=1),
+            ]
+        )
+        if risk_grid is not None:
+            self._optimizer.set_risk_grid(risk_grid)
+
+        head = shifted[:, :3]
+        result = self._optimizer.solve(
+            head[:, 0],
+            goal,
+            start_velocity=head[:, 1] - head[:, 0],
+            start_acceleration=head[:, 2] - 2.0 * head[:, 1] + head[:, 0],
+            warm_start=shifted,
+        )
+
+        latency = time.perf_counter() - start_time
+        timed_out = latency > self._deadline
+        fallback = timed_out or not result.success
+        if fallback:
+            self._fallback_num += 1
+            self._plan = shifted
+        else:
+            self._plan = result.theta
+        self._latency.add(latency)
+
+        return RecedingHorizonStep(
+            self._plan.copy(), result, timed_out, fallback, latency
+        )
@@ -0,0 +1,362 @@
+"""provide CoarseToFineOptimizer class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from numpy.typing import NDArray
+
+from .optimizer import TrajectoryOptimizer, TrajectoryResult
+from .qp import BOUNDARY_STEP_NUM
+from .seed import get_spline_seed
+from .._kinect.risk_grid import TimeVaryingRiskGrid
+from .._util.type_check import _type_checked
+from ..robot import Robot
+
+# 既定の段階．(時間刻みをまとめる数, ボクセルをまとめる数)
+# 時間刻みをまとめる数は問題に合わせて2のべき乗のまま減らす
+DEFAULT_SCHEDULE = ((4, 4), (2, 2), (1, 1))
+
+# 2段階目以降のIPOPTの設定．前の段階の解の近くから始めるため，
+# バリアパラメータの初期値と初期値を上下限から押し戻す量を小さくする
+REFINE_SOLVER_OPTIONS = {
+    "ipopt.mu_init": 1e-6,
+    "ipopt.bound_push": 1e-6,
+    "ipopt.bound_frac": 1e-6,
+}
+
+
+def get_default_schedule(
+    time_num: int, relay_steps: Sequence[int] = ()
+) -> List[Tuple[int, int]]:
+    """
+    DEFAULT_SCHEDULE の時間刻みをまとめる数を，問題に合う最大の2のべき乗に減らす．
+    まとめる数は (time_num - 1) と中継点の時刻を割り切り，粗い段階でも
+    4点以上の時刻と境界条件で決まらない中継点の時刻が残るようにする．
+    時間刻みをまとめられない場合も，ボクセルをまとめる段階は残す．
+
+    Parameters
+    ----------
+    time_num : int
+        最も細かい段階の時間刻みの数．
+    relay_steps : Sequence[int]
+        中継点を通る時刻の番号のリスト．
+
+    Returns
+    -------
+    schedule : List[Tuple[int, int]]
+        粗い順に並べた段階の (時間刻みをまとめる数, ボクセルをまとめる数)．
+    """
+    time_num = _type_checked(time_num, int)
+
+    def fits(time_factor: int) -> bool:
+        if (time_num - 1) % time_factor != 0:
+            return False
+        last = (time_num - 1) // time_factor
+        return last >= 3 and all(
+            step % time_factor == 0
+            and BOUNDARY_STEP_NUM <= step // time_factor <= last - BOUNDARY_STEP_NUM
+            for step in relay_steps
+        )
+
+    schedule = []
+    for time_factor, grid_factor in DEFAULT_SCHEDULE:
+        while time_factor > 1 and not fits(time_factor):
+            time_factor //= 2
+        schedule.append((time_factor, grid_factor))
+
+    return schedule
+
+
+class CoarseToFineResult:
+    """
+    class for a result of CoarseToFineOptimizer.
+    level_results[i] is the result of the i-th level of the schedule.
+    """
+
+    __slots__ = ("result", "level_results", "wall_time")
+
+    def __init__(
+        self,
+        result: TrajectoryResult,
+        level_results: List[TrajectoryResult],
+        wall_time: float,
+    ):
+        self.result = result  # 最も細かい段階の結果
+        self.level_results = level_results  # 段階ごとの結果
+        self.wall_time = wall_time  # 全体にかかった時間 [s]
+
+    def __str__(self):
+        lines = [f"result: {self.result}, wall time: {self.wall_time * 1000:.1f}[ms]"]
+        for i, result in enumerate(self.level_results):
+            lines.append(f"  level{i}: {result}")
+        return "\n".join(lines)
+
+
+class CoarseToFineOptimizer:
+    """
+    class to optimize the joint trajectory from coarse to fine resolutions.
+    each level of the schedule is a TrajectoryOptimizer on a time grid coarsened
+    by time_factor and a risk grid coarsened by grid_factor with
+    TimeVaryingRiskGrid.coarsen(), which inflates the risk by taking the maximum.
+    the solution of a level is interpolated by a cubic spline and passed to the
+    next level as the initial point, and the last level is the original problem.
+
+    the levels after the first start near the previous solution, so their
+    solvers use REFINE_SOLVER_OPTIONS, which start IPOPT with a small barrier
+    parameter instead of moving the initial point away from the solution.
+
+    the solvers of all levels are built once in the constructor. the weights are
+    scaled per level so that the costs approximate those of the finest level:
+    the squared jerk of a coarse step grows with time_factor ** 6 and the number
+    of steps shrinks with time_factor, so smooth_weight is divided by
+    time_factor ** 5 and the other weights are multiplied by time_factor.
+    """
+
+    def __init__(
+        self,
+        robot: Robot,
+        time_num: int,
+        *,
+        schedule: Optional[Sequence[Tuple[int, int]]] = None,
+        smooth_weight: float = 1.0,
+        risk_grid: Optional[TimeVaryingRiskGrid] = None,
+        risk_weight: float = 1.0,
+        obstacles: Sequence[Tuple[NDArray, float]] = (),
+        obstacle_weight: float = 1.0,
+        obstacle_buffer: float = 0.0,
+        relay_steps: Sequence[int] = (),
+        joint_indices: Optional[Sequence[int]] = None,
+        bounds: Optional[Tuple[float, float]] = None,
+        solver_options: Optional[Dict] = None,
+    ):
+        """
+        Parameters
+        ----------
+        robot : Robot
+            ロボット．
+        time_num : int
+            最も細かい段階の時間刻みの数．
+        schedule : Optional[Sequence[Tuple[int, int]]]
+            粗い順に並べた段階の (時間刻みをまとめる数, ボクセルをまとめる数)．
+            最後は (1, 1) とし，時間刻みをまとめる数は次の段階の数の倍数とする．
+            (time_num - 1) は各段階の時間刻みをまとめる数で割り切れること．
+            Noneの場合は get_default_schedule(time_num, relay_steps)．
+        smooth_weight : float
+            最も細かい段階のジャークの二乗和の重み．
+        risk_grid : Optional[TimeVaryingRiskGrid]
+            最も細かい段階の時間ごとの危険度．
+        risk_weight : float
+            最も細かい段階の危険度の和の重み．
+        obstacles : Sequence[Tuple[NDArray, float]]
+            球の障害物の (中心, 半径) のリスト．
+        obstacle_weight : float
+            最も細かい段階の障害物への侵入量の和の重み．
+        obstacle_buffer : float
+            障害物の半径に加える余裕．
+        relay_steps : Sequence[int]
+            中継点を通る時刻の番号のリスト．各段階の時間刻みをまとめる数の倍数とする．
+        joint_indices : Optional[Sequence[int]]
+            危険度と障害物を評価する関節の番号．Noneの場合は全ての可動関節．
+        bounds : Optional[Tuple[float, float]]
+            全関節で共通の角度の下限と上限．Noneの場合はロボットの可動範囲．
+        solver_options : Optional[Dict]
+            IPOPTの設定．全ての段階で共通．
+            2段階目以降は REFINE_SOLVER_OPTIONS を上書きする．
+        """
+        time_num = _type_checked(time_num, int)
+        if schedule is None:
+            schedule = get_default_schedule(time_num, relay_steps)
+        self._schedule = self._check_schedule(schedule, time_num, relay_steps)
+        self._time_num = time_num
+        self._weights = {
+            "smooth_weight": float(smooth_weight),
+            "risk_weight": float(risk_weight),
+            "obstacle_weight": float(obstacle_weight),
+        }
+
+        self._optimizers: List[TrajectoryOptimizer] = []
+        for level, (time_factor, grid_factor) in enumerate(self._schedule):
+            self._optimizers.append(
+                TrajectoryOptimizer(
+                    robot,
+                    (time_num - 1) // time_factor + 1,
+                    risk_grid=(
+                        None
+                        if risk_grid is None
+                        else risk_grid.coarsen(grid_factor, time_factor)
+                    ),
+                    obstacles=obstacles,
+                    obstacle_buffer=obstacle_buffer,
+                    relay_steps=[step // time_factor for step in relay_steps],
+                    joint_indices=joint_indices,
+                    bounds=bounds,
+                    solver_options={
+                        **(REFINE_SOLVER_OPTIONS if level > 0 else {}),
+                        **(solver_options or {}),
+                    },
+                    **self._get_level_weights(time_factor),
+                )
+            )
+
+    @property
+    def time_num(self) -> int:
+        """getter for the number of time steps of the finest level"""
+        return self._time_num
+
+    @property
+    def schedule(self) -> List[Tuple[int, int]]:
+        """getter for the time and grid factors of the levels"""
+        return list(self._schedule)
+
+    @property
+    def optimizers(self) -> List[TrajectoryOptimizer]:
+        """getter for the optimizers of the levels"""
+        return list(self._optimizers)
+
+    @property
+    def weights(self) -> Dict[str, float]:
+        """getter for the cost weights of the finest level"""
+        return dict(self._weights)
+
+    def set_weights(
+        self,
+        *,
+        smooth_weight: Optional[float] = None,
+        risk_weight: Optional[float] = None,
+        obstacle_weight: Optional[float] = None,
+    ) -> None:
+        """
+        最も細かい段階のコストの重みを更新し，各段階の重みに反映する．
+
+        Parameters
+        ----------
+        smooth_weight : Optional[float]
+            ジャークの二乗和の重み．Noneの場合は変更しない．
+        risk_weight : Optional[float]
+            危険度の和の重み．Noneの場合は変更しない．
+        obstacle_weight : Optional[float]
+            障害物への侵入量の和の重み．Noneの場合は変更しない．
+        """
+        weights = dict(self._weights)
+        for name, weight in (
+            ("smooth_weight", smooth_weight),
+            ("risk_weight", risk_weight),
+            ("obstacle_weight", obstacle_weight),
+        ):
+            if weight is None:
+                continue
+            weight = float(weight)
+            if weight < 0.0:
+                raise ValueError(f"{name} must be non-negative")
+            weights[name] = weight
+
+        self._weights = weights
+        for (time_factor, _), optimizer in zip(self._schedule, self._optimizers):
+            optimizer.set_weights(**self._get_level_weights(time_factor))
+
+    def set_risk_grid(self, risk_grid: TimeVaryingRiskGrid) -> None:
+        """
+        最も細かい段階の危険度を更新し，粗くした危険度を各段階に反映する．
+
+        Parameters
+        ----------
+        risk_grid : TimeVaryingRiskGrid
+            新しい危険度．形状と作業空間の範囲，ボクセルの大きさは
+            コンストラクタで渡したものと同じであること．
+        """
+        for (time_factor, grid_factor), optimizer in zip(
+            self._schedule, self._optimizers
+        ):
+            optimizer.set_risk_grid(risk_grid.coarsen(grid_factor, time_factor))
+
+    def solve(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        *,
+        relay_points: Optional[Sequence[Optional[NDArray]]] = None,
+    ) -> CoarseToFineResult:
+        """
+        粗い段階から順に解き，前の段階の解を補間して次の段階の初期値とする．
+
+        Parameters
+        ----------
+        start : NDArray
+            開始時の角度．形状は (dof,)．
+        goal : NDArray
+            目標の角度．形状は (dof,)．
+        relay_points : Optional[Sequence[Optional[NDArray]]]
+            TrajectoryOptimizer.solve() の relay_points．
+
+        Returns
+        -------
+        result : CoarseToFineResult
+            最も細かい段階の結果と段階ごとの結果．
+        """
+        start_time = time.perf_counter()
+
+        results: List[TrajectoryResult] = []
+        warm_start = None
+        for level, optimizer in enumerate(self._optimizers):
+            result = optimizer.solve(
+                start, goal, relay_points=relay_points, warm_start=warm_start
+            )
+            results.append(result)
+
+            if level + 1 < len(self._optimizers):
+                # 粗い時刻は次の段階の時刻の ratio 個おき
+                ratio = self._schedule[level][0] // self._schedule[level + 1][0]
+                warm_start = get_spline_seed(
+                    result.theta.T,
+                    self._optimizers[level + 1].time_num,
+                    steps=[i * ratio for i in range(optimizer.time_num)],
+                )
+
+        return CoarseToFineResult(
+            results[-1], results, time.perf_counter() - start_time
+        )
+
+    def _get_level_weights(self, time_factor: int) -> Dict[str, float]:
+        """段階の重みを返す"""
+
+        return {
+            "smooth_weight": self._weights["smooth_weight"] / time_factor**5,
+            "risk_weight": self._weights["risk_weight"] * time_factor,
+            "obstacle_weight": self._weights["obstacle_weight"] * time_factor,
+        }
+
+    @staticmethod
+    def _check_schedule(
+        schedule: Sequence[Tuple[int, int]],
+        time_num: int,
+        relay_steps: Sequence[int],
+    ) -> List[Tuple[int, int]]:
+        schedule = [
+            (_type_checked(time_factor, int), _type_checked(grid_factor, int))
+            for time_factor, grid_factor in schedule
+        ]
+        if len(schedule) == 0 or schedule[-1] != (1, 1):
+            raise ValueError("schedule must end with (1, 1)")
+
+        for i, (time_factor, grid_factor) in enumerate(schedule):
+            if time_factor < 1 or grid_factor < 1:
+                raise ValueError("factors of schedule must be 1 or more")
+            if i + 1 < len(schedule) and time_factor % schedule[i + 1][0] != 0:
+                raise ValueError("time factor must be a multiple of the next one")
+            if (time_num - 1) % time_factor != 0:
+                raise ValueError(
+                    f"time_num - 1 must be a multiple of the time factor {time_factor}"
+                )
+            if any(step % time_factor != 0 for step in relay_steps):
+                raise ValueError(
+                    f"relay steps must be multiples of the time factor {time_factor}"
+                )
+
+        return schedule
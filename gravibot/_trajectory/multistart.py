@@ -0,0 +1,271 @@
+"""provide MultistartOptimizer class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .optimizer import TrajectoryOptimizer, TrajectoryResult
+from .seed import get_linear_seed, get_random_seed
+from .._util.type_check import _type_checked
+
+# ワーカープロセスごとに1度だけ受け取る最適化器．ソルバは作り直さずに使い回す
+_worker_optimizer: Optional[TrajectoryOptimizer] = None
+
+
+def _init_worker(optimizer: TrajectoryOptimizer) -> None:
+    global _worker_optimizer
+    _worker_optimizer = optimizer
+
+
+def _solve_in_worker(args: dict) -> TrajectoryResult:
+    return _worker_optimizer.call_solver(args)
+
+
+class MultistartResult:
+    """
+    class for a result of MultistartOptimizer.
+    results[i] is the result of the start named seed_names[i],
+    or None if the start was cancelled.
+    """
+
+    __slots__ = ("best", "results", "seed_names", "wall_time")
+
+    def __init__(
+        self,
+        best: Optional[TrajectoryResult],
+        results: List[Optional[TrajectoryResult]],
+        seed_names: List[str],
+        wall_time: float,
+    ):
+        self.best = best  # 最も良い結果
+        self.results = results  # 初期値ごとの結果．キャンセルした場合はNone
+        self.seed_names = seed_names  # 初期値の名前
+        self.wall_time = wall_time  # 全体にかかった時間 [s]
+
+    def __str__(self):
+        lines = [f"best: {self.best}, wall time: {self.wall_time * 1000:.1f}[ms]"]
+        for name, result in zip(self.seed_names, self.results):
+            lines.append(f"  {name}: {'cancelled' if result is None else result}")
+        return "\n".join(lines)
+
+
+class MultistartOptimizer:
+    """
+    class to solve a TrajectoryOptimizer from several initial trajectories in parallel.
+    the optimizer is sent to each worker process once when the pool starts, and
+    the workers reuse its solver. the parameters of a query are computed in this
+    process, so set_weights() and set_risk_grid() of the optimizer are reflected.
+
+    once a start reaches target_cost, the starts that have not begun are cancelled.
+    the starts already running cannot be interrupted; they finish in the
+    background and their results are discarded.
+    """
+
+    def __init__(
+        self,
+        optimizer: TrajectoryOptimizer,
+        *,
+        max_workers: Optional[int] = None,
+        mp_context=None,
+    ):
+        """
+        Parameters
+        ----------
+        optimizer : TrajectoryOptimizer
+            解く最適化器．
+        max_workers : Optional[int]
+            ワーカープロセスの数．Noneの場合はCPUの数．
+        mp_context : Optional[multiprocessing.context.BaseContext]
+            プロセスの開始方法．Noneの場合は既定の方法．
+        """
+        if not isinstance(optimizer, TrajectoryOptimizer):
+            raise TypeError(
+                f"optimizer must be TrajectoryOptimizer, not {type(optimizer)}"
+            )
+
+        self._optimizer = optimizer
+        self._executor = ProcessPoolExecutor(
+            max_workers,
+            mp_context,
+            initializer=_init_worker,
+            initargs=(optimizer,),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def optimizer(self) -> TrajectoryOptimizer:
+        """getter for the optimizer"""
+        return self._optimizer
+
+    def close(self) -> None:
+        """ワーカープロセスを終了する"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_seeds(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        *,
+        random_num: int = 4,
+        library: Sequence[NDArray] = (),
+        relay_points: Optional[Sequence[Optional[NDArray]]] = None,
+        rng: Optional[np.random.Generator] = None,
+    ) -> List[Tuple[str, NDArray]]:
+        """
+        初期値の名前と軌道のリストを返す．
+        線形補間，最小ジャーク，library の軌道，乱数の順に並ぶ．
+
+        Parameters
+        ----------
+        start : NDArray
+            開始時の角度．形状は (dof,)．
+        goal : NDArray
+            目標の角度．形状は (dof,)．
+        random_num : int
+            乱数の初期値の数．
+        library : Sequence[NDArray]
+            過去の解などの初期値．形状は (dof, time_num)．
+        relay_points : Optional[Sequence[Optional[NDArray]]]
+            最小ジャークの初期値が通る中継点．TrajectoryOptimizer.solve() の relay_points．
+        rng : Optional[np.random.Generator]
+            乱数生成器．Noneの場合は np.random.default_rng()．
+
+        Returns
+        -------
+        seeds : List[Tuple[str, NDArray]]
+            初期値の名前と軌道．軌道の形状は (dof, time_num)．
+        """
+        random_num = _type_checked(random_num, int)
+        if random_num < 0:
+            raise ValueError("random_num must be non-negative")
+
+        opt = self._optimizer
+        shape = (opt.dof, opt.time_num)
+        seeds = [
+            ("linear", get_linear_seed(start, goal, opt.time_num)),
+            ("min_jerk", opt.get_initial_guess(start, goal, relay_points)),
+        ]
+        for i, theta in enumerate(library):
+            theta = np.asarray(theta, dtype=np.float64)
+            if theta.shape != shape:
+                raise ValueError(f"library seed must have the shape {shape}")
+            seeds.append((f"library{i}", theta))
+
+        lower, upper = opt.bounds
+        for i in range(random_num):
+            seeds.append(
+                (f"random{i}", get_random_seed(lower, upper, opt.time_num, rng))
+            )
+
+        return seeds
+
+    def solve(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        *,
+        relay_points: Optional[Sequence[Optional[NDArray]]] = None,
+        random_num: int = 4,
+        library: Sequence[NDArray] = (),
+        target_cost: Optional[float] = None,
+        rng: Optional[np.random.Generator] = None,
+    ) -> MultistartResult:
+        """
+        複数の初期値から並列に最適化し，最も良い結果を返す．
+
+        Parameters
+        ----------
+        start : NDArray
+            開始時の角度．形状は (dof,)．
+        goal : NDArray
+            目標の角度．形状は (dof,)．
+        relay_points : Optional[Sequence[Optional[NDArray]]]
+            TrajectoryOptimizer.solve() の relay_points．
+        random_num : int
+            乱数の初期値の数．
+        library : Sequence[NDArray]
+            過去の解などの初期値．形状は (dof, time_num)．
+        target_cost : Optional[float]
+            収束した解の目的関数の値がこれ以下になったら，残りの初期値をキャンセルする．
+            Noneの場合は全ての初期値を解く．
+        rng : Optional[np.random.Generator]
+            乱数生成器．Noneの場合は np.random.default_rng()．
+
+        Returns
+        -------
+        result : MultistartResult
+            最も良い結果と初期値ごとの結果．
+            収束した解がない場合は，目的関数の値が最も小さい解を best とする．
+        """
+        opt = self._optimizer
+        start_time = time.perf_counter()
+
+        base_args = opt.get_solver_args(start, goal, relay_points=relay_points)
+        seeds = self.get_seeds(
+            start,
+            goal,
+            random_num=random_num,
+            library=library,
+            relay_points=relay_points,
+            rng=rng,
+        )
+        futures = {}
+        for i, (_, theta) in enumerate(seeds):
+            args = dict(base_args)
+            opt.set_initial_point(args, theta)
+            futures[self._executor.submit(_solve_in_worker, args)] = i
+
+        results: List[Optional[TrajectoryResult]] = [None] * len(seeds)
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            reached = False
+            for future in done:
+                if future.cancelled():
+                    continue
+                result = future.result()
+                results[futures[future]] = result
+                reached |= (
+                    target_cost is not None
+                    and result.success
+                    and result.cost <= target_cost
+                )
+
+            if reached:
+                for future in pending:
+                    future.cancel()
+                break
+
+        return MultistartResult(
+            self._get_best(results),
+            results,
+            [name for name, _ in seeds],
+            time.perf_counter() - start_time,
+        )
+
+    @staticmethod
+    def _get_best(
+        results: List[Optional[TrajectoryResult]],
+    ) -> Optional[TrajectoryResult]:
+        """収束した解を優先し，目的関数の値が最も小さい解を返す"""
+
+        finished = [r for r in results if r is not None]
+        if len(finished) == 0:
+            return None
+
+        return min(finished, key=lambda r: (not r.success, r.cost))
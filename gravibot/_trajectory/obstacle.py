@@ -0,0 +1,196 @@
+"""provide functions for the sphere obstacles of trajectories"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+import casadi as cs  # type: ignore
+
+from .._util.type_check import _type_checked
+from ..robot import Robot
+
+
+def get_obstacle_arrays(
+    obstacles: Sequence[Tuple[NDArray, float]],
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    球の障害物の (中心, 半径) のリストを配列にまとめる．
+
+    Parameters
+    ----------
+    obstacles : Sequence[Tuple[NDArray, float]]
+        球の障害物の (中心, 半径) のリスト．
+
+    Returns
+    -------
+    centers : NDArray[np.float64]
+        障害物の中心．形状は (obstacle_num, 3)．
+    radii : NDArray[np.float64]
+        障害物の半径．形状は (obstacle_num,)．
+    """
+    centers = np.zeros((len(obstacles), 3))
+    radii = np.zeros(len(obstacles))
+    for i, (center, radius) in enumerate(obstacles):
+        centers[i] = np.asarray(center, dtype=np.float64).reshape(3)
+        radii[i] = float(radius)
+
+    return centers, radii
+
+
+def _check_obstacles(
+    centers: NDArray, radii: NDArray
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    centers = np.asarray(centers, dtype=np.float64)
+    radii = np.asarray(radii, dtype=np.float64)
+    if centers.ndim != 2 or centers.shape[1] != 3:
+        raise ValueError("centers must have the shape (obstacle_num, 3)")
+    if radii.shape != (centers.shape[0],):
+        raise ValueError("radii must have the shape (obstacle_num,)")
+    if np.any(radii < 0.0):
+        raise ValueError("radii must be non-negative")
+
+    return centers, radii
+
+
+def get_reachable_obstacles(
+    robot: Robot, centers: NDArray, radii: NDArray, buffer: float = 0.0
+) -> NDArray[np.int64]:
+    """
+    ロボットの関節が届きうる障害物の番号を返す．
+    関節は原点から robot.get_reach() 以内にあるので，
+    中心までの距離が reach + 半径 + buffer 以上の障害物には侵入しない．
+
+    Parameters
+    ----------
+    robot : Robot
+        ロボット．
+    centers : NDArray
+        障害物の中心．形状は (obstacle_num, 3)．
+    radii : NDArray
+        障害物の半径．形状は (obstacle_num,)．
+    buffer : float
+        障害物の半径に加える余裕．
+
+    Returns
+    -------
+    indices : NDArray[np.int64]
+        届きうる障害物の番号．昇順に並ぶ．
+    """
+    if not isinstance(robot, Robot):
+        raise TypeError(f"robot must be Robot, not {type(robot)}")
+    centers, radii = _check_obstacles(centers, radii)
+
+    dist = np.linalg.norm(centers - robot.get_origin().reshape(1, 3), axis=1)
+    return np.nonzero(dist < robot.get_reach() + radii + float(buffer))[0]
+
+
+def get_obstacle_depth_function(
+    centers: NDArray, radii: NDArray, point_num: int, buffer: float = 0.0
+) -> cs.Function:
+    """
+    1時刻の点の位置から，障害物ごとに最も深く入った点の侵入量を求める関数を返す．
+    障害物は1つの行列として扱うので，式の大きさは点の数にだけ比例する．
+    全時刻について評価する場合は .map(time_num) を使う．
+
+    Parameters
+    ----------
+    centers : NDArray
+        障害物の中心．形状は (obstacle_num, 3)．
+    radii : NDArray
+        障害物の半径．形状は (obstacle_num,)．
+    point_num : int
+        1時刻の点の数．
+    buffer : float
+        障害物の半径に加える余裕．
+
+    Returns
+    -------
+    function : cs.Function
+        (3, point_num) の点の位置から (obstacle_num, 1) の侵入量を返す関数．
+        侵入量は (半径 + buffer - 距離) で，障害物の外では負になる．
+    """
+    centers, radii = _check_obstacles(centers, radii)
+    point_num = _type_checked(point_num, int)
+    if point_num < 1:
+        raise ValueError("point_num must be 1 or more")
+
+    obstacle_num = centers.shape[0]
+    points = cs.MX.sym("points", 3, point_num)
+    center_mat = cs.DM(centers.T)
+    size = cs.DM(radii.reshape(1, -1) + float(buffer))
+
+    deepest = None
+    for j in range(point_num):
+        diff = center_mat - cs.repmat(points[:, j], 1, obstacle_num)
+        depth = size - cs.sqrt(cs.sum1(diff * diff))
+        deepest = depth if deepest is None else cs.fmax(deepest, depth)
+
+    return cs.Function("obstacle_depth", [points], [deepest.T], ["points"], ["depth"])
+
+
+def get_obstacle_constraints(
+    robot: Robot,
+    theta: cs.MX,
+    time_num: int,
+    centers: NDArray,
+    radii: NDArray,
+    *,
+    buffer: float = 0.0,
+    joint_indices: Optional[Sequence[int]] = None,
+) -> cs.MX:
+    """
+    全時刻の障害物への侵入量を返す．制約とする場合は 0 以下とする．
+    届かない障害物を除き，1時刻の順運動学と侵入量の関数を map で全時刻に適用する．
+
+    Parameters
+    ----------
+    robot : Robot
+        ロボット．
+    theta : cs.MX
+        関節ごとに全時刻の角度を並べた決定変数．形状は (dof * time_num, 1)．
+    time_num : int
+        時間刻みの数．
+    centers : NDArray
+        障害物の中心．形状は (obstacle_num, 3)．
+    radii : NDArray
+        障害物の半径．形状は (obstacle_num,)．
+    buffer : float
+        障害物の半径に加える余裕．
+    joint_indices : Optional[Sequence[int]]
+        評価する関節の番号（robot.get_joint_pos_casadi の引数）．
+        Noneの場合は全ての可動関節．
+
+    Returns
+    -------
+    depth : cs.MX
+        時刻ごとに届きうる障害物の侵入量を並べたもの．
+        形状は (reachable_num * time_num, 1)．
+    """
+    time_num = _type_checked(time_num, int)
+    centers, radii = _check_obstacles(centers, radii)
+    reachable = get_reachable_obstacles(robot, centers, radii, buffer)
+    if len(reachable) == 0:
+        return cs.MX(0, 1)
+
+    dof = robot.get_moveable_link_num()
+    if joint_indices is None:
+        joint_indices = range(dof)
+
+    q = cs.MX.sym("q", dof)
+    positions = cs.horzcat(*[robot.get_joint_pos_casadi(j, q) for j in joint_indices])
+    depth = get_obstacle_depth_function(
+        centers[reachable], radii[reachable], positions.shape[1], buffer
+    )
+    step = cs.Function("obstacle_step", [q], [depth(positions)])
+
+    # 決定変数を dof x time_num に並べ替え，時刻ごとに map で評価する
+    q_all = cs.reshape(theta, time_num, dof).T
+    return cs.reshape(step.map(time_num)(q_all), -1, 1)
@@ -0,0 +1,962 @@
+"""provide TrajectoryOptimizer class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+import casadi as cs  # type: ignore
+
+from .bspline import fit_bspline_control, get_bspline_basis
+from .difference import get_delta, get_end_data, get_result, get_start_data
+from .obstacle import (
+    get_obstacle_arrays,
+    get_obstacle_depth_function,
+    get_reachable_obstacles,
+)
+from .qp import BOUNDARY_CONSTRAINT_NUM, MinimumJerkQP, _check_relay_steps
+from .seed import get_min_jerk_seed
+from .warm_start import WARM_START_SOLVER_OPTIONS, WarmStartStore
+from .._kinect.risk_grid import TimeVaryingRiskGrid
+from .._util.type_check import _type_checked
+from ..robot import Robot
+
+# ソルバの既定の設定．繰り返し解くため，IPOPTの出力は抑える
+DEFAULT_SOLVER_OPTIONS = {
+    "ipopt.print_level": 0,
+    "ipopt.sb": "yes",
+    "print_time": False,
+}
+
+# NLPのパラメータとして渡すコストの重みの名前
+WEIGHT_NAMES = ("smooth_weight", "risk_weight", "obstacle_weight")
+
+
+class TrajectoryResult:
+    """
+    class for a result of TrajectoryOptimizer.
+    x, lam_x and lam_g can be passed to solve() as warm_start.
+    """
+
+    __slots__ = (
+        "theta",
+        "x",
+        "lam_x",
+        "lam_g",
+        "p",
+        "cost",
+        "success",
+        "status",
+        "iter_count",
+        "solve_time",
+    )
+
+    def __init__(
+        self,
+        theta: NDArray,
+        x: NDArray,
+        lam_x: NDArray,
+        lam_g: NDArray,
+        p: NDArray,
+        cost: float,
+        success: bool,
+        status: str,
+        iter_count: int,
+        solve_time: float,
+    ):
+        self.theta = theta  # 関節 x 時間 の角度
+        self.x = x  # 決定変数
+        self.lam_x = lam_x  # 変数の上下限のラグランジュ乗数
+        self.lam_g = lam_g  # 制約のラグランジュ乗数
+        self.p = p  # NLPのパラメータ
+        self.cost = cost  # 目的関数の値
+        self.success = success  # ソルバが収束したか
+        self.status = status  # ソルバの終了状態
+        self.iter_count = iter_count  # 反復回数
+        self.solve_time = solve_time  # 解くのにかかった時間 [s]
+
+    def __str__(self):
+        return (
+            f"success: {self.success}, status: {self.status}, cost: {self.cost}, "
+            + f"iter: {self.iter_count}, time: {self.solve_time * 1000:.1f}[ms]"
+        )
+
+
+class TrajectoryOptimizer:
+    """
+    class to optimize the joint trajectory of a robot.
+    the NLP and the solver are built once in the constructor, and the start and
+    goal angles, the relay points, the cost weights and the risk values are
+    CasADi parameters, so solve() can be called repeatedly with only the cost of
+    the solver iterations.
+
+    the decision vector is the joint angles over time_num steps, arranged per
+    joint (see gravibot._trajectory.difference). the start and goal are at rest,
+    that is, the velocity and the acceleration are 0, unless the velocity and
+    the acceleration at the start are given to solve() to continue a moving
+    trajectory.
+
+    if control_num is given, each joint is instead parameterized by control_num
+    control points of a clamped B-spline, and the decision vector is the control
+    points arranged per joint. the angles at the time steps are the product of
+    the fixed basis matrix and the control points, so the cost and the
+    constraints are unchanged while the problem size no longer depends on
+    time_num. the bounds are applied to the control points, which keeps the
+    angles within the bounds by the convex hull property of B-splines.
+
+    with eliminate_boundary, the variables fixed by the boundary conditions are
+    removed from the equality constraints. the zero velocity and acceleration at
+    rest pin the first and last three angles of each joint to the start and goal
+    (or to the start motion given to solve()), so these angles are built from
+    the parameters and only the other angles are
+    the decision variables. with the B-spline, the first and last control points
+    equal the start and goal, and they are fixed by the same lower and upper
+    bounds instead.
+
+    the cost is
+    smooth_weight * (sum of squared jerk)
+    + risk_weight * (sum of risk at the joint positions)
+    + obstacle_weight * (sum of the penetration into the sphere obstacles).
+    the obstacles out of the reach of the robot are dropped before building the
+    NLP, and the others are evaluated as one matrix per time step.
+
+    the angles at relay_steps are constrained to the relay points given to
+    solve(). a relay point that is not given is disabled by relaxing the bounds
+    of its constraint to infinity.
+
+    without the risk grid and the reachable obstacles, the problem is a QP with only
+    equality constraints, and solve() uses the closed-form solution of
+    MinimumJerkQP. IPOPT is used only if the solution violates the bounds.
+    """
+
+    def __init__(
+        self,
+        robot: Robot,
+        time_num: int,
+        *,
+        smooth_weight: float = 1.0,
+        risk_grid: Optional[TimeVaryingRiskGrid] = None,
+        risk_weight: float = 1.0,
+        obstacles: Sequence[Tuple[NDArray, float]] = (),
+        obstacle_weight: float = 1.0,
+        obstacle_buffer: float = 0.0,
+        relay_steps: Sequence[int] = (),
+        joint_indices: Optional[Sequence[int]] = None,
+        bounds: Optional[Tuple[float, float]] = None,
+        warm_start_store: Optional[WarmStartStore] = None,
+        closed_form: bool = True,
+        control_num: Optional[int] = None,
+        spline_degree: int = 3,
+        eliminate_boundary: bool = True,
+        solver_options: Optional[Dict] = None,
+    ):
+        """
+        Parameters
+        ----------
+        robot : Robot
+            ロボット．
+        time_num : int
+            時間刻みの数．
+        smooth_weight : float
+            ジャークの二乗和の重み．
+        risk_grid : Optional[TimeVaryingRiskGrid]
+            時間ごとの危険度．i 番目の時刻には risk_grid の i 番目の時間刻みを使う．
+            静的な危険度は時間刻みが1つの TimeVaryingRiskGrid として渡す．
+        risk_weight : float
+            危険度の和の重み．
+        obstacles : Sequence[Tuple[NDArray, float]]
+            球の障害物の (中心, 半径) のリスト．
+        obstacle_weight : float
+            障害物への侵入量の和の重み．
+        obstacle_buffer : float
+            障害物の半径に加える余裕．
+        relay_steps : Sequence[int]
+            中継点を通る時刻の番号のリスト．MinimumJerkQP と同じく，
+            両端の BOUNDARY_STEP_NUM 点を除く重複しない時刻とする．
+        joint_indices : Optional[Sequence[int]]
+            危険度と障害物を評価する関節の番号（robot.get_joint_pos_casadi の引数）．
+            Noneの場合は全ての可動関節．
+        bounds : Optional[Tuple[float, float]]
+            全関節で共通の角度の下限と上限．Noneの場合はロボットの可動範囲．
+        warm_start_store : Optional[WarmStartStore]
+            過去の解の保存先．指定した場合，solve() で warm_start を省略すると
+            パラメータが最も近い解から始め，収束した解を追加する．
+            WARM_START_SOLVER_OPTIONS も有効になる．
+        closed_form : bool
+            コストがジャークの二乗和だけの場合に，IPOPTの代わりに閉形式の解を使うか．
+            control_num を指定した場合は使わない．
+        control_num : Optional[int]
+            関節ごとのB-splineの制御点の数．Noneの場合は全時刻の角度を決定変数とする．
+        spline_degree : int
+            B-splineの次数．control_num を指定した場合だけ使う．
+        eliminate_boundary : bool
+            境界条件で固定される変数を等式制約の代わりに決定変数から除くか．
+            time_num が7未満の場合は除かない．
+        solver_options : Optional[Dict]
+            IPOPTの設定．DEFAULT_SOLVER_OPTIONS を上書きする．
+        """
+        if not isinstance(robot, Robot):
+            raise TypeError(f"robot must be Robot, not {type(robot)}")
+        if warm_start_store is not None and not isinstance(
+            warm_start_store, WarmStartStore
+        ):
+            raise TypeError(
+                f"warm_start_store must be WarmStartStore, not {type(warm_start_store)}"
+            )
+
+        time_num = _type_checked(time_num, int)
+        if time_num < 4:
+            # ジャークを求めるには4点以上が必要
+            raise ValueError("time_num must be 4 or more")
+
+        self._robot = robot
+        self._time_num = time_num
+        self._dof = robot.get_moveable_link_num()
+        self._joint_indices = (
+            list(range(self._dof)) if joint_indices is None else list(joint_indices)
+        )
+        self._risk_grid = risk_grid
+        self._relay_steps = _check_relay_steps(relay_steps, time_num)
+        self._weights = np.zeros(3)
+        self.set_weights(
+            smooth_weight=smooth_weight,
+            risk_weight=risk_weight,
+            obstacle_weight=obstacle_weight,
+        )
+
+        self._spline_degree = _type_checked(spline_degree, int)
+        self._basis = None
+        if control_num is not None:
+            control_num = _type_checked(control_num, int)
+            if control_num > time_num:
+                raise ValueError("control_num must be time_num or less")
+            if control_num < BOUNDARY_CONSTRAINT_NUM + len(self._relay_steps):
+                # 境界条件と中継点の制約を満たせる自由度が必要
+                raise ValueError(
+                    "control_num must be the number of the constraints of a joint "
+                    + f"({BOUNDARY_CONSTRAINT_NUM + len(self._relay_steps)}) or more"
+                )
+            self._basis = get_bspline_basis(time_num, control_num, self._spline_degree)
+        self._control_num = control_num
+
+        # 静止した開始と目標では，最初と最後の3点の角度が開始と目標に一致する
+        self._fixed_num = (
+            3 if eliminate_boundary and control_num is None and time_num > 6 else 0
+        )
+        self._fix_control = eliminate_boundary and control_num is not None
+        self._var_num = (
+            time_num - 2 * self._fixed_num if control_num is None else control_num
+        )
+
+        # 関節が届かない障害物はコストに寄与しないので，NLPを作る前に除く
+        centers, radii = get_obstacle_arrays(obstacles)
+        obstacles = [
+            (centers[i], radii[i])
+            for i in get_reachable_obstacles(robot, centers, radii, obstacle_buffer)
+        ]
+
+        self._warm_start_store = warm_start_store
+        self._qp = (
+            MinimumJerkQP(time_num, self._relay_steps)
+            if closed_form
+            and control_num is None
+            and time_num >= 6
+            and risk_grid is None
+            and len(obstacles) == 0
+            else None
+        )
+
+        self._lower, self._upper = self._get_bounds(bounds)
+        self._lbx, self._ubx = self._get_variable_bounds()
+        self._solver_options = {
+            **DEFAULT_SOLVER_OPTIONS,
+            **(WARM_START_SOLVER_OPTIONS if warm_start_store is not None else {}),
+            **(solver_options or {}),
+        }
+        self._build(obstacles, obstacle_buffer, self._solver_options)
+
+    @property
+    def robot(self) -> Robot:
+        """getter for the robot"""
+        return self._robot
+
+    @property
+    def time_num(self) -> int:
+        """getter for the number of time steps"""
+        return self._time_num
+
+    @property
+    def dof(self) -> int:
+        """getter for the number of movable joints"""
+        return self._dof
+
+    @property
+    def relay_steps(self) -> List[int]:
+        """getter for the time steps of the relay points"""
+        return list(self._relay_steps)
+
+    @property
+    def control_num(self) -> Optional[int]:
+        """getter for the number of the B-spline control points of a joint"""
+        return self._control_num
+
+    @property
+    def bounds(self) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """getter for the lower and upper bounds of the joint angles"""
+        return self._lower.copy(), self._upper.copy()
+
+    @property
+    def weights(self) -> Dict[str, float]:
+        """getter for the cost weights"""
+        return dict(zip(WEIGHT_NAMES, self._weights.tolist()))
+
+    @property
+    def warm_start_store(self) -> Optional[WarmStartStore]:
+        """getter for the store of previous solutions"""
+        return self._warm_start_store
+
+    @property
+    def solver(self) -> cs.Function:
+        """getter for the CasADi NLP solver"""
+        return self._solver
+
+    @property
+    def solver_options(self) -> Dict:
+        """getter for the options the solver was built with"""
+        return dict(self._solver_options)
+
+    def set_weights(
+        self,
+        *,
+        smooth_weight: Optional[float] = None,
+        risk_weight: Optional[float] = None,
+        obstacle_weight: Optional[float] = None,
+    ) -> None:
+        """
+        コストの重みを更新する．重みはNLPのパラメータであるため，ソルバは作り直さない．
+
+        Parameters
+        ----------
+        smooth_weight : Optional[float]
+            ジャークの二乗和の重み．Noneの場合は変更しない．
+        risk_weight : Optional[float]
+            危険度の和の重み．Noneの場合は変更しない．
+        obstacle_weight : Optional[float]
+            障害物への侵入量の和の重み．Noneの場合は変更しない．
+        """
+        for i, weight in enumerate((smooth_weight, risk_weight, obstacle_weight)):
+            if weight is None:
+                continue
+            weight = float(weight)
+            if weight < 0.0:
+                raise ValueError(f"{WEIGHT_NAMES[i]} must be non-negative")
+            self._weights[i] = weight
+
+    def set_risk_grid(self, risk_grid: TimeVaryingRiskGrid) -> None:
+        """
+        危険度を更新する．危険度はNLPのパラメータであるため，ソルバは作り直さない．
+
+        Parameters
+        ----------
+        risk_grid : TimeVaryingRiskGrid
+            新しい危険度．形状と作業空間の範囲，ボクセルの大きさは
+            コンストラクタで渡したものと同じであること．
+            これらはソルバの生成時に埋め込まれるため，変えるにはソルバを作り直す．
+        """
+        if self._risk_grid is None:
+            raise ValueError("risk_grid was not given to the constructor")
+        if not isinstance(risk_grid, TimeVaryingRiskGrid):
+            raise TypeError(
+                f"risk_grid must be TimeVaryingRiskGrid, not {type(risk_grid)}"
+            )
+        if risk_grid.risk.shape != self._risk_grid.risk.shape:
+            raise ValueError("risk_grid must have the same shape")
+
+        grid, built = risk_grid.grid, self._risk_grid.grid
+        if not (
+            np.isclose(grid.grid_size, built.grid_size)
+            and np.allclose(grid.min_pos, built.min_pos)
+            and np.allclose(grid.max_pos, built.max_pos)
+        ):
+            raise ValueError(
+                "risk_grid must have the same workspace and voxel size as the "
+                + "one the solver was built with"
+            )
+
+        self._risk_grid = risk_grid
+
+    def get_initial_guess(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        relay_points: Optional[Sequence[Optional[NDArray]]] = None,
+    ) -> NDArray[np.float64]:
+        """
+        開始と目標で静止し，中継点を通る最小ジャーク軌道の初期値を返す．
+
+        Parameters
+        ----------
+        start : NDArray
+            開始時の角度．形状は (dof,)．
+        goal : NDArray
+            目標の角度．形状は (dof,)．
+        relay_points : Optional[Sequence[Optional[NDArray]]]
+            solve() の relay_points．
+
+        Returns
+        -------
+        theta : NDArray[np.float64]
+            初期値．形状は (dof, time_num)．
+        """
+        start, goal = self._check_angles(start, goal)
+        return get_min_jerk_seed(
+            start,
+            goal,
+            self._time_num,
+            relay_steps=self._relay_steps,
+            relay_points=relay_points,
+        )
+
+    def solve(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        *,
+        start_velocity: Optional[NDArray] = None,
+        start_acceleration: Optional[NDArray] = None,
+        relay_points: Optional[Sequence[Optional[NDArray]]] = None,
+        warm_start: Optional[Union[TrajectoryResult, NDArray]] = None,
+    ) -> TrajectoryResult:
+        """
+        開始と目標の角度を指定して軌道を最適化する．
+
+        Parameters
+        ----------
+        start : NDArray
+            開始時の角度．形状は (dof,)．
+        goal : NDArray
+            目標の角度．形状は (dof,)．
+        start_velocity : Optional[NDArray]
+            開始時の速度（時間刻みあたりの角度の1階差分）．形状は (dof,)．
+            Noneの場合は0．
+        start_acceleration : Optional[NDArray]
+            開始時の加速度（時間刻みあたりの角度の2階差分）．形状は (dof,)．
+            Noneの場合は0．
+        relay_points : Optional[Sequence[Optional[NDArray]]]
+            relay_steps の各時刻で通る角度のリスト．形状は (dof,)．
+            Noneの要素の中継点は使わない．Noneの場合は全ての中継点を使わない．
+        warm_start : Optional[Union[TrajectoryResult, NDArray]]
+            初期値．前回の結果を渡すと，決定変数とラグランジュ乗数を初期値とする
+            （乗数を使うには warm_start_store を渡すか，solver_options に
+            WARM_START_SOLVER_OPTIONS を指定する）．
+            形状が (dof, time_num) の配列も渡せる（control_num を指定した場合は
+            最小二乗で近い制御点を初期値とする）．Noneの場合は warm_start_store の
+            最も近い解，それもなければ get_initial_guess() の軌道．
+
+        Returns
+        -------
+        result : TrajectoryResult
+            最適化の結果．
+        """
+        start, goal = self._check_angles(start, goal)
+        motion = self._get_start_motion(start_velocity, start_acceleration)
+        args = self._get_solver_args(start, goal, relay_points, motion)
+
+        if warm_start is not None:
+            self.set_initial_point(args, warm_start)
+
+        if self._qp is not None:
+            result = self._solve_closed_form(
+                start, goal, relay_points, motion, args["p"]
+            )
+            if result is not None:
+                if self._warm_start_store is not None:
+                    self._warm_start_store.add(result)
+                return result
+
+        if warm_start is None:
+            if self._warm_start_store is not None:
+                warm_start = self._warm_start_store.get_nearest(args["p"])
+            if warm_start is None:
+                warm_start = self.get_initial_guess(start, goal, relay_points)
+            self.set_initial_point(args, warm_start)
+
+        result = self.call_solver(args)
+        if self._warm_start_store is not None and result.success:
+            self._warm_start_store.add(result)
+
+        return result
+
+    def get_solver_args(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        *,
+        start_velocity: Optional[NDArray] = None,
+        start_acceleration: Optional[NDArray] = None,
+        relay_points: Optional[Sequence[Optional[NDArray]]] = None,
+    ) -> Dict:
+        """
+        ソルバの引数（パラメータ，変数と制約の上下限）を返す．
+        初期値は含まないため，set_initial_point() で設定してから call_solver() に渡す．
+        閉形式の解と warm_start_store は使わない．
+
+        Parameters
+        ----------
+        start : NDArray
+            開始時の角度．形状は (dof,)．
+        goal : NDArray
+            目標の角度．形状は (dof,)．
+        start_velocity : Optional[NDArray]
+            solve() の start_velocity．
+        start_acceleration : Optional[NDArray]
+            solve() の start_acceleration．
+        relay_points : Optional[Sequence[Optional[NDArray]]]
+            solve() の relay_points．
+
+        Returns
+        -------
+        args : Dict
+            ソルバの引数．
+        """
+        start, goal = self._check_angles(start, goal)
+        motion = self._get_start_motion(start_velocity, start_acceleration)
+        return self._get_solver_args(start, goal, relay_points, motion)
+
+    def set_initial_point(
+        self, args: Dict, warm_start: Union[TrajectoryResult, NDArray]
+    ) -> None:
+        """
+        ソルバの引数に初期値を設定する．
+
+        Parameters
+        ----------
+        args : Dict
+            get_solver_args() で作ったソルバの引数．書き換える．
+        warm_start : Union[TrajectoryResult, NDArray]
+            solve() の warm_start．
+        """
+        self._set_initial_point(args, warm_start)
+
+    def call_solver(self, args: Dict) -> TrajectoryResult:
+        """
+        ソルバの引数でIPOPTを呼び出し，結果をまとめる．
+
+        Parameters
+        ----------
+        args : Dict
+            get_solver_args() で作り，set_initial_point() で初期値を設定した引数．
+
+        Returns
+        -------
+        result : TrajectoryResult
+            最適化の結果．
+        """
+        if "x0" not in args:
+            raise ValueError(
+                "args must have the initial point; use set_initial_point()"
+            )
+
+        return self._call_solver(args)
+
+    def _build(
+        self,
+        obstacles: Sequence[Tuple[NDArray, float]],
+        obstacle_buffer: float,
+        solver_options: Dict,
+    ) -> None:
+        """NLPとソルバを生成する"""
+
+        t_num, dof = self._time_num, self._dof
+        x = cs.MX.sym("x", dof * self._var_num)
+        start = cs.MX.sym("start", dof)
+        goal = cs.MX.sym("goal", dof)
+        motion = cs.MX.sym("start_motion", 2 * dof)
+        velocity, acceleration = motion[:dof], motion[dof:]
+        theta = x
+        if self._basis is not None:
+            # 関節ごとに 時刻 x 制御点 の基底行列を掛け，同じ並びの角度に直す
+            basis = cs.sparsify(cs.DM(self._basis))
+            theta = cs.reshape(
+                cs.mtimes(basis, cs.reshape(x, self._var_num, dof)), -1, 1
+            )
+        elif self._fixed_num > 0:
+            # 両端の固定される角度をパラメータから作り，決定変数の前後に並べる
+            theta = cs.reshape(
+                cs.vertcat(
+                    start.T,
+                    (start + velocity).T,
+                    (start + 2 * velocity + acceleration).T,
+                    cs.reshape(x, self._var_num, dof),
+                    cs.repmat(goal.T, self._fixed_num, 1),
+                ),
+                -1,
+                1,
+            )
+        relay = cs.MX.sym("relay", dof * len(self._relay_steps))
+        weights = cs.MX.sym("weights", len(WEIGHT_NAMES))
+        smooth_weight, risk_weight, obstacle_weight = cs.vertsplit(weights)
+        params = [start, goal, motion, relay, weights]
+
+        dtheta = get_delta(theta, t_num, dof)
+        ddtheta = get_delta(theta, t_num, dof, 2)
+        jerk = get_delta(theta, t_num, dof, 3)
+
+        cost = smooth_weight * cs.sumsqr(jerk) + self._get_position_cost(
+            theta, params, risk_weight, obstacle_weight, obstacles, obstacle_buffer
+        )
+
+        # 開始と目標では静止している．両端の点を固定した場合は制約が不要になる
+        constraints = []
+        if self._fixed_num == 0:
+            if not self._fix_control:
+                constraints += [
+                    get_start_data(theta, t_num, dof) - start,
+                    get_end_data(theta, t_num, dof) - goal,
+                ]
+            constraints += [
+                get_start_data(dtheta, t_num - 1, dof) - velocity,
+                get_end_data(dtheta, t_num - 1, dof),
+                get_start_data(ddtheta, t_num - 2, dof) - acceleration,
+                get_end_data(ddtheta, t_num - 2, dof),
+            ]
+
+        # 中継点の制約は常に作っておき，使わない場合は上下限を無限大にする
+        for k, step in enumerate(self._relay_steps):
+            constraints.append(
+                theta[step : dof * t_num : t_num] - relay[k * dof : (k + 1) * dof]
+            )
+        constraints = cs.vertcat(*constraints) if constraints else cs.MX(0, 1)
+
+        nlp = {"x": x, "p": cs.vertcat(*params), "f": cost, "g": constraints}
+        self._solver = cs.nlpsol("solver", "ipopt", nlp, solver_options)
+        self._g_num = constraints.shape[0]
+        self._relay_g_offset = self._g_num - dof * len(self._relay_steps)
+
+    def _get_position_cost(
+        self,
+        theta: cs.MX,
+        params: List[cs.MX],
+        risk_weight: cs.MX,
+        obstacle_weight: cs.MX,
+        obstacles: Sequence[Tuple[NDArray, float]],
+        obstacle_buffer: float,
+    ) -> cs.MX:
+        """
+        関節の位置に関するコスト（危険度と障害物）を返す．
+        危険度を使う場合は，その値のパラメータを params に追加する．
+        """
+        cost = cs.MX(0)
+        if self._risk_grid is None and len(obstacles) == 0:
+            return cost
+
+        # 全時刻の関節の位置を 3 x (joints * time_num) の行列としてまとめて求める
+        positions = self._get_positions(theta)
+
+        if self._risk_grid is not None:
+            risk_values = cs.MX.sym("risk", self._risk_grid.risk.size)
+            params.append(risk_values)
+            cost += risk_weight * self._get_risk_cost(positions, risk_values)
+
+        if len(obstacles) > 0:
+            cost += obstacle_weight * self._get_obstacle_cost(
+                positions, obstacles, obstacle_buffer
+            )
+
+        return cost
+
+    def _get_positions(self, theta: cs.MX) -> cs.MX:
+        """全時刻の評価する関節の位置を返す．列は時刻ごとに関節の順に並ぶ"""
+
+        q = cs.MX.sym("q", self._dof)
+        fk = cs.Function(
+            "fk",
+            [q],
+            [
+                cs.horzcat(
+                    *[
+                        self._robot.get_joint_pos_casadi(j, q)
+                        for j in self._joint_indices
+                    ]
+                )
+            ],
+        )
+
+        # 決定変数を dof x time_num に並べ替え，時刻ごとの順運動学を map で評価する
+        q_all = cs.reshape(theta, self._time_num, self._dof).T
+        return fk.map(self._time_num)(q_all)
+
+    def _get_risk_cost(self, positions: cs.MX, risk_values: cs.MX) -> cs.MX:
+        """各時刻の関節の位置の危険度の和を返す"""
+
+        point_num = positions.shape[1]
+        lookup = self._risk_grid.get_casadi_function(parametric=True)
+
+        # 危険度の表は全ての点で共通なので，複製せずに1つだけ渡す
+        lookup_all = lookup.map("risk_lookup_map", "serial", point_num, [4], [])
+        step = np.repeat(np.arange(self._time_num), len(self._joint_indices))
+
+        return cs.sum2(
+            lookup_all(
+                step.reshape(1, -1),
+                positions[0, :],
+                positions[1, :],
+                positions[2, :],
+                risk_values,
+            )
+        )
+
+    def _get_obstacle_cost(
+        self,
+        positions: cs.MX,
+        obstacles: Sequence[Tuple[NDArray, float]],
+        buffer: float,
+    ) -> cs.MX:
+        """各時刻で最も深く障害物に入った関節の侵入量の和を返す"""
+
+        # 障害物を1つの行列として扱う侵入量の関数を，時刻ごとに map で評価する
+        centers, radii = get_obstacle_arrays(obstacles)
+        depth = get_obstacle_depth_function(
+            centers, radii, len(self._joint_indices), buffer
+        )
+
+        return cs.sum1(cs.sum2(cs.fmax(0, depth.map(self._time_num)(positions))))
+
+    def _get_bounds(
+        self, bounds: Optional[Tuple[float, float]]
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """関節ごとの角度の上下限を返す"""
+
+        if bounds is not None:
+            lower = np.full(self._dof, float(bounds[0]))
+            upper = np.full(self._dof, float(bounds[1]))
+        else:
+            lower, upper = np.array(
+                [self._robot.get_moveable_link_bounds(i) for i in range(self._dof)]
+            ).T
+
+        return lower.astype(np.float64), upper.astype(np.float64)
+
+    def _get_variable_bounds(self) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """決定変数の上下限を返す"""
+
+        return (
+            np.repeat(self._lower, self._var_num),
+            np.repeat(self._upper, self._var_num),
+        )
+
+    def _check_angles(
+        self, start: NDArray, goal: NDArray
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        start = np.asarray(start, dtype=np.float64).reshape(-1)
+        goal = np.asarray(goal, dtype=np.float64).reshape(-1)
+        if start.shape != (self._dof,) or goal.shape != (self._dof,):
+            raise ValueError(f"start and goal must have {self._dof} elements")
+
+        return start, goal
+
+    def _get_relay_points(
+        self, relay_points: Optional[Sequence[Optional[NDArray]]]
+    ) -> Tuple[NDArray[np.float64], NDArray[np.bool_]]:
+        """中継点の角度と，中継点を使うかどうかを返す"""
+
+        relay_num = len(self._relay_steps)
+        values = np.zeros((relay_num, self._dof))
+        enabled = np.zeros(relay_num, dtype=np.bool_)
+        if relay_points is None:
+            return values, enabled
+
+        if len(relay_points) != relay_num:
+            raise ValueError(f"relay_points must have {relay_num} elements")
+        for k, point in enumerate(relay_points):
+            if point is None:
+                continue
+            point = np.asarray(point, dtype=np.float64).reshape(-1)
+            if point.shape != (self._dof,):
+                raise ValueError(f"relay point must have {self._dof} elements")
+            values[k] = point
+            enabled[k] = True
+
+        return values, enabled
+
+    def _get_start_motion(
+        self, velocity: Optional[NDArray], acceleration: Optional[NDArray]
+    ) -> NDArray[np.float64]:
+        """開始時の速度と加速度を並べた配列を返す．形状は (2, dof)"""
+
+        motion = np.zeros((2, self._dof))
+        for i, value in enumerate((velocity, acceleration)):
+            if value is None:
+                continue
+            value = np.asarray(value, dtype=np.float64).reshape(-1)
+            if value.shape != (self._dof,):
+                raise ValueError(
+                    f"start velocity and acceleration must have {self._dof} elements"
+                )
+            motion[i] = value
+
+        return motion
+
+    def _get_parameters(
+        self, start: NDArray, goal: NDArray, motion: NDArray, relay: NDArray
+    ) -> NDArray[np.float64]:
+        """NLPのパラメータの値を返す"""
+
+        params = [start, goal, motion.reshape(-1), relay.reshape(-1), self._weights]
+        if self._risk_grid is not None:
+            params.append(self._risk_grid.risk.reshape(-1))
+
+        return np.concatenate(params)
+
+    def _get_solver_args(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        relay_points: Optional[Sequence[Optional[NDArray]]],
+        motion: Optional[NDArray] = None,
+    ) -> Dict:
+        if motion is None:
+            motion = np.zeros((2, self._dof))
+        relay, enabled = self._get_relay_points(relay_points)
+        lbg = np.zeros(self._g_num)
+        ubg = np.zeros(self._g_num)
+        disabled = np.repeat(~enabled, self._dof)
+        lbg[self._relay_g_offset :][disabled] = -np.inf
+        ubg[self._relay_g_offset :][disabled] = np.inf
+
+        lbx, ubx = self._lbx, self._ubx
+        if self._fix_control:
+            # 最初と最後の制御点を上下限で開始と目標に固定する
+            lbx, ubx = lbx.copy(), ubx.copy()
+            first = np.arange(self._dof) * self._var_num
+            last = first + self._var_num - 1
+            lbx[first] = ubx[first] = start
+            lbx[last] = ubx[last] = goal
+
+        return {
+            "p": self._get_parameters(start, goal, motion, relay),
+            "lbx": lbx,
+            "ubx": ubx,
+            "lbg": lbg,
+            "ubg": ubg,
+        }
+
+    def _solve_closed_form(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        relay_points: Optional[Sequence[Optional[NDArray]]],
+        motion: NDArray,
+        p: NDArray,
+    ) -> Optional[TrajectoryResult]:
+        """閉形式で解く．解が上下限を満たさない場合はNoneを返す"""
+
+        start_time = time.perf_counter()
+        weight = self._weights[0]
+        theta, lam_g = self._qp.solve(
+            start,
+            goal,
+            relay_points,
+            start_velocity=motion[0],
+            start_acceleration=motion[1],
+            weight=weight,
+        )
+
+        fixed = self._fixed_num
+        x = theta[:, fixed : self._time_num - fixed].reshape(-1)
+        if np.any(x < self._lbx) or np.any(x > self._ubx):
+            return None
+        if fixed > 0:
+            # 境界条件は制約にないため，中継点の乗数だけを返す
+            lam_g = lam_g[BOUNDARY_CONSTRAINT_NUM * self._dof :]
+
+        jerk = np.diff(theta, 3)
+        return TrajectoryResult(
+            theta,
+            x,
+            np.zeros_like(x),
+            lam_g,
+            np.asarray(p, dtype=np.float64),
+            float(weight * np.sum(jerk * jerk)),
+            True,
+            "Closed_Form",
+            0,
+            time.perf_counter() - start_time,
+        )
+
+    def _set_initial_point(
+        self, args: Dict, warm_start: Union[TrajectoryResult, NDArray]
+    ) -> None:
+        """ソルバの引数に初期値を設定する"""
+
+        if isinstance(warm_start, TrajectoryResult):
+            args["x0"] = warm_start.x
+            args["lam_x0"] = warm_start.lam_x
+            args["lam_g0"] = warm_start.lam_g
+        else:
+            x0 = np.asarray(warm_start, dtype=np.float64).reshape(-1)
+            if x0.shape != (self._dof * self._time_num,):
+                raise ValueError("warm_start must have dof * time_num elements")
+            theta = x0.reshape(self._dof, self._time_num)
+            if self._basis is not None:
+                x0 = fit_bspline_control(
+                    theta, self._control_num, self._spline_degree
+                ).reshape(-1)
+            else:
+                fixed = self._fixed_num
+                x0 = theta[:, fixed : self._time_num - fixed].reshape(-1)
+            args["x0"] = x0
+
+    def _get_theta(self, x: NDArray, p: NDArray) -> NDArray[np.float64]:
+        """決定変数とパラメータから 関節 x 時間 の角度を返す"""
+
+        if self._basis is not None:
+            return (self._basis @ x.reshape(self._dof, self._var_num).T).T
+        if self._fixed_num == 0:
+            return get_result(x, self._time_num, self._dof)
+
+        # 固定した両端の点を開始時の角度，速度，加速度と目標の角度で補う
+        dof = self._dof
+        start, goal = p[:dof], p[dof : 2 * dof]
+        velocity, acceleration = p[2 * dof : 3 * dof], p[3 * dof : 4 * dof]
+        return np.hstack(
+            [
+                np.stack(
+                    [start, start + velocity, start + 2 * velocity + acceleration],
+                    axis=1,
+                ),
+                x.reshape(self._dof, self._var_num),
+                np.repeat(goal[:, None], self._fixed_num, axis=1),
+            ]
+        )
+
+    def _call_solver(self, args: Dict) -> TrajectoryResult:
+        """ソルバを呼び出し，結果をまとめる"""
+
+        start_time = time.perf_counter()
+        sol = self._solver(**args)
+        solve_time = time.perf_counter() - start_time
+        stats = self._solver.stats()
+
+        x = np.array(sol["x"]).reshape(-1)
+        p = np.asarray(args["p"], dtype=np.float64)
+        return TrajectoryResult(
+            self._get_theta(x, p),
+            x,
+            np.array(sol["lam_x"]).reshape(-1),
+            np.array(sol["lam_g"]).reshape(-1),
+            p,
+            float(sol["f"]),
+            bool(stats.get("success", False)),
+            str(stats.get("return_status", "")),
+            int(stats.get("iter_count", 0)),
+            solve_time,
+        )
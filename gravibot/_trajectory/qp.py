@@ -0,0 +1,228 @@
+"""provide MinimumJerkQP class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+import casadi as cs  # type: ignore
+
+from .difference import get_difference_matrix
+from .._util.type_check import _type_checked
+
+# 各関節の境界条件の数（開始と目標の角度，速度，加速度）
+BOUNDARY_CONSTRAINT_NUM = 6
+
+# 境界条件で角度が決まる両端それぞれの時刻の数（角度，速度，加速度）
+BOUNDARY_STEP_NUM = 3
+
+
+def _check_relay_steps(relay_steps: Sequence[int], time_num: int) -> List[int]:
+    """
+    中継点の時刻の番号を確認して返す．
+    両端の BOUNDARY_STEP_NUM 点は境界条件で決まるため，中継点の制約が重複する．
+    """
+    relay_steps = [_type_checked(step, int) for step in relay_steps]
+    last = time_num - 1 - BOUNDARY_STEP_NUM
+    for step in relay_steps:
+        if not BOUNDARY_STEP_NUM <= step <= last:
+            raise ValueError(
+                f"relay step must be in range [{BOUNDARY_STEP_NUM}, {last}], not {step}"
+            )
+    if len(set(relay_steps)) != len(relay_steps):
+        raise ValueError("relay steps must be unique")
+
+    return relay_steps
+
+
+class MinimumJerkQP:
+    """
+    class to solve the smoothness-only trajectory problem in closed form.
+
+    minimize    sum of squared jerk
+    subject to  the start and goal angles, the velocity and acceleration at
+                the start (zero by default), zero velocity and acceleration at
+                the goal, and the angles at the relay steps.
+
+    the cost and the constraints do not couple the joints, and every joint has
+    the same KKT matrix [[2 H, C^T], [C, 0]], where H = D^T D with the third
+    order difference matrix D and C is the constraint matrix of a joint.
+    the KKT matrix is factorized once per pattern of enabled relay points, and
+    the map from the constraint values to the solution is cached, so a query
+    costs only a small matrix product.
+
+    the rows of the constraints and their multipliers are ordered as the
+    constraints of TrajectoryOptimizer: start, goal, first and last velocity,
+    first and last acceleration, and the relay points, each for all joints.
+    """
+
+    def __init__(self, time_num: int, relay_steps: Sequence[int] = ()):
+        """
+        Parameters
+        ----------
+        time_num : int
+            時間刻みの数．
+        relay_steps : Sequence[int]
+            中継点を通る時刻の番号のリスト．
+            BOUNDARY_STEP_NUM 以上 time_num - 1 - BOUNDARY_STEP_NUM 以下で，重複しないこと．
+        """
+        time_num = _type_checked(time_num, int)
+        if time_num < 6:
+            # 境界条件の数より多くの点が必要
+            raise ValueError("time_num must be 6 or more")
+
+        self._time_num = time_num
+        self._relay_steps = _check_relay_steps(relay_steps, time_num)
+
+        jerk = get_difference_matrix(time_num, 1, 3)
+        self._hessian = 2.0 * cs.mtimes(jerk.T, jerk)
+        self._constraint = self._get_constraint_matrix()
+
+        # 有効な中継点の組み合わせごとの (解への写像, 乗数への写像)
+        self._cache: Dict[Tuple[bool, ...], Tuple[NDArray, NDArray]] = {}
+
+    @property
+    def time_num(self) -> int:
+        """getter for the number of time steps"""
+        return self._time_num
+
+    @property
+    def relay_steps(self) -> List[int]:
+        """getter for the time steps of the relay points"""
+        return list(self._relay_steps)
+
+    @property
+    def constraint_matrix(self) -> NDArray[np.float64]:
+        """getter for the constraint matrix of a joint"""
+        return np.array(self._constraint)
+
+    def solve(
+        self,
+        start: NDArray,
+        goal: NDArray,
+        relay_points: Optional[Sequence[Optional[NDArray]]] = None,
+        *,
+        start_velocity: Optional[NDArray] = None,
+        start_acceleration: Optional[NDArray] = None,
+        weight: float = 1.0,
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        ジャークの二乗和を最小にする軌道を求める．
+
+        Parameters
+        ----------
+        start : NDArray
+            開始時の角度．形状は (dof,)．
+        goal : NDArray
+            目標の角度．形状は (dof,)．
+        relay_points : Optional[Sequence[Optional[NDArray]]]
+            relay_steps の各時刻で通る角度のリスト．形状は (dof,)．
+            Noneの要素の中継点は使わない．Noneの場合は全ての中継点を使わない．
+        start_velocity : Optional[NDArray]
+            開始時の角度の1階差分．形状は (dof,)．Noneの場合は0．
+        start_acceleration : Optional[NDArray]
+            開始時の角度の2階差分．形状は (dof,)．Noneの場合は0．
+        weight : float
+            ジャークの二乗和の重み．解は変わらず，乗数の大きさだけが変わる．
+
+        Returns
+        -------
+        theta : NDArray[np.float64]
+            軌道．形状は (dof, time_num)．
+        lam_g : NDArray[np.float64]
+            制約のラグランジュ乗数．使わない中継点の乗数は0．
+            形状は (constraint_num * dof,)．
+        """
+        start = np.asarray(start, dtype=np.float64).reshape(-1)
+        goal = np.asarray(goal, dtype=np.float64).reshape(-1)
+        dof = start.shape[0]
+        if goal.shape != (dof,):
+            raise ValueError("start and goal must have the same number of elements")
+
+        relay_num = len(self._relay_steps)
+        values = np.zeros((BOUNDARY_CONSTRAINT_NUM + relay_num, dof))
+        values[0] = start
+        values[1] = goal
+        for row, value in ((2, start_velocity), (4, start_acceleration)):
+            if value is None:
+                continue
+            value = np.asarray(value, dtype=np.float64).reshape(-1)
+            if value.shape != (dof,):
+                raise ValueError(
+                    f"start velocity and acceleration must have {dof} elements"
+                )
+            values[row] = value
+
+        enabled = np.zeros(relay_num, dtype=np.bool_)
+        if relay_points is not None:
+            if len(relay_points) != relay_num:
+                raise ValueError(f"relay_points must have {relay_num} elements")
+            for k, point in enumerate(relay_points):
+                if point is None:
+                    continue
+                point = np.asarray(point, dtype=np.float64).reshape(-1)
+                if point.shape != (dof,):
+                    raise ValueError(f"relay point must have {dof} elements")
+                values[BOUNDARY_CONSTRAINT_NUM + k] = point
+                enabled[k] = True
+
+        rows = np.concatenate([np.ones(BOUNDARY_CONSTRAINT_NUM, np.bool_), enabled])
+        to_theta, to_lam = self._get_solution_map(tuple(enabled.tolist()))
+
+        # 全関節をまとめて解く
+        theta = to_theta @ values[rows]
+        lam = np.zeros_like(values)
+        lam[rows] = weight * (to_lam @ values[rows])
+
+        return theta.T, lam.reshape(-1)
+
+    def _get_constraint_matrix(self) -> cs.DM:
+        """1関節分の制約行列を返す"""
+
+        t_num = self._time_num
+        rows = [
+            [(0, 1.0)],
+            [(t_num - 1, 1.0)],
+            [(1, 1.0), (0, -1.0)],
+            [(t_num - 1, 1.0), (t_num - 2, -1.0)],
+            [(2, 1.0), (1, -2.0), (0, 1.0)],
+            [(t_num - 1, 1.0), (t_num - 2, -2.0), (t_num - 3, 1.0)],
+        ] + [[(step, 1.0)] for step in self._relay_steps]
+
+        triplets = [(i, j, v) for i, row in enumerate(rows) for j, v in row]
+        row, col, val = zip(*triplets)
+        return cs.DM.triplet(list(row), list(col), list(val), len(rows), t_num)
+
+    def _get_solution_map(self, enabled: Tuple[bool, ...]) -> Tuple[NDArray, NDArray]:
+        """有効な制約の値から解と乗数を求める行列を返す"""
+
+        if enabled in self._cache:
+            return self._cache[enabled]
+
+        rows = list(range(BOUNDARY_CONSTRAINT_NUM)) + [
+            BOUNDARY_CONSTRAINT_NUM + k for k, e in enumerate(enabled) if e
+        ]
+        constraint = self._constraint[rows, :]
+        m = len(rows)
+
+        kkt = cs.blockcat(
+            [
+                [self._hessian, constraint.T],
+                [constraint, cs.DM(m, m)],
+            ]
+        )
+        rhs = cs.vertcat(cs.DM(self._time_num, m), cs.DM.eye(m))
+
+        # 疎行列のまま分解し，制約の値の単位ベクトルに対する解をまとめて求める
+        linsol = cs.Linsol("kkt", "qr", kkt.sparsity())
+        solution = np.array(linsol.solve(kkt, rhs))
+
+        self._cache[enabled] = (solution[: self._time_num], solution[self._time_num :])
+        return self._cache[enabled]
@@ -0,0 +1,288 @@
+"""provide functions to make initial trajectories for the optimization"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .._util.type_check import _type_checked
+
+
+def _check_seed_args(
+    start: NDArray, goal: NDArray, time_num: int
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    start = np.asarray(start, dtype=np.float64).reshape(-1)
+    goal = np.asarray(goal, dtype=np.float64).reshape(-1)
+    if start.shape != goal.shape:
+        raise ValueError("start and goal must have the same number of elements")
+
+    time_num = _type_checked(time_num, int)
+    if time_num < 2:
+        raise ValueError("time_num must be 2 or more")
+
+    return start, goal
+
+
+def get_linear_seed(start: NDArray, goal: NDArray, time_num: int) -> NDArray:
+    """
+    開始と目標の角度を線形に補間した軌道を返す．
+
+    Parameters
+    ----------
+    start : NDArray
+        開始時の角度．形状は (dof,)．
+    goal : NDArray
+        目標の角度．形状は (dof,)．
+    time_num : int
+        時間刻みの数．
+
+    Returns
+    -------
+    theta : NDArray
+        軌道．形状は (dof, time_num)．
+    """
+    start, goal = _check_seed_args(start, goal, time_num)
+    s = np.linspace(0.0, 1.0, time_num)
+    return start[:, None] + (goal - start)[:, None] * s
+
+
+def _get_waypoint_steps(
+    time_num: int, steps: Optional[Sequence[int]], waypoint_num: int
+) -> NDArray[np.float64]:
+    """経由点の時刻の番号を返す．Noneの場合は等間隔"""
+
+    if steps is None:
+        return np.linspace(0.0, time_num - 1.0, waypoint_num)
+
+    steps = np.asarray([_type_checked(step, int) for step in steps], dtype=np.float64)
+    if steps.shape != (waypoint_num,):
+        raise ValueError("steps must have the same number of elements as waypoints")
+    if steps[0] != 0 or steps[-1] != time_num - 1 or np.any(np.diff(steps) <= 0):
+        raise ValueError("steps must increase from 0 to time_num - 1")
+
+    return steps
+
+
+def _get_relay_waypoints(
+    start: NDArray,
+    goal: NDArray,
+    time_num: int,
+    relay_steps: Sequence[int],
+    relay_points: Optional[Sequence[Optional[NDArray]]],
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """開始，使う中継点，目標を並べた経由点とその時刻の番号を返す"""
+
+    relay_steps = list(relay_steps)
+    if relay_points is None:
+        relay_points = [None] * len(relay_steps)
+    if len(relay_points) != len(relay_steps):
+        raise ValueError(f"relay_points must have {len(relay_steps)} elements")
+
+    steps = [0]
+    waypoints = [start]
+    for step, point in sorted(
+        ((s, p) for s, p in zip(relay_steps, relay_points) if p is not None),
+        key=lambda x: x[0],
+    ):
+        point = np.asarray(point, dtype=np.float64).reshape(-1)
+        if point.shape != start.shape:
+            raise ValueError(f"relay point must have {start.shape[0]} elements")
+        steps.append(step)
+        waypoints.append(point)
+    steps.append(time_num - 1)
+    waypoints.append(goal)
+
+    return np.stack(waypoints), _get_waypoint_steps(time_num, steps, len(steps))
+
+
+def _evaluate_segments(steps: NDArray, time_num: int, basis) -> NDArray:
+    """
+    経由点の間の区間ごとに basis(tau, h, k) で補間し，(dof, time_num) の軌道を返す．
+    tau は区間内の正規化した時刻，h は区間の長さ，k は区間の番号の配列．
+    """
+    t = np.arange(time_num, dtype=np.float64)
+    k = np.clip(np.searchsorted(steps, t, side="right") - 1, 0, len(steps) - 2)
+    h = steps[k + 1] - steps[k]
+    tau = (t - steps[k]) / h
+
+    return basis(tau, h, k).T
+
+
+def get_min_jerk_seed(
+    start: NDArray,
+    goal: NDArray,
+    time_num: int,
+    *,
+    relay_steps: Sequence[int] = (),
+    relay_points: Optional[Sequence[Optional[NDArray]]] = None,
+) -> NDArray:
+    """
+    開始と目標で静止する最小ジャーク軌道を返す．
+    中継点がない場合は s = 10 t^3 - 15 t^4 + 6 t^5 で補間するため，両端の速度と
+    加速度は0になる．中継点がある場合は経由点の間を5次のエルミート補間でつなぐ．
+    中継点での速度は前後の経由点の差分，加速度は0とする．
+
+    Parameters
+    ----------
+    start : NDArray
+        開始時の角度．形状は (dof,)．
+    goal : NDArray
+        目標の角度．形状は (dof,)．
+    time_num : int
+        時間刻みの数．
+    relay_steps : Sequence[int]
+        中継点を通る時刻の番号のリスト．
+    relay_points : Optional[Sequence[Optional[NDArray]]]
+        relay_steps の各時刻で通る角度のリスト．形状は (dof,)．
+        Noneの要素の中継点は使わない．Noneの場合は全ての中継点を使わない．
+
+    Returns
+    -------
+    theta : NDArray
+        軌道．形状は (dof, time_num)．
+    """
+    start, goal = _check_seed_args(start, goal, time_num)
+    waypoints, steps = _get_relay_waypoints(
+        start, goal, time_num, relay_steps, relay_points
+    )
+
+    # 経由点での速度．両端は静止し，中継点では前後の経由点の傾き
+    span = (steps[2:] - steps[:-2])[:, None]
+    velocity = np.zeros_like(waypoints)
+    velocity[1:-1] = (waypoints[2:] - waypoints[:-2]) / span
+
+    def basis(tau, h, k):
+        tau = tau[:, None]
+        h = h[:, None]
+        tau3 = tau**3
+        p1 = tau3 * (10.0 - 15.0 * tau + 6.0 * tau**2)
+        v0 = tau - tau3 * (6.0 - 8.0 * tau + 3.0 * tau**2)
+        v1 = -tau3 * (4.0 - 7.0 * tau + 3.0 * tau**2)
+        return (
+            (1.0 - p1) * waypoints[k]
+            + p1 * waypoints[k + 1]
+            + h * (v0 * velocity[k] + v1 * velocity[k + 1])
+        )
+
+    return _evaluate_segments(steps, time_num, basis)
+
+
+def get_spline_seed(
+    waypoints: NDArray,
+    time_num: int,
+    *,
+    steps: Optional[Sequence[int]] = None,
+) -> NDArray:
+    """
+    経由点を通り，両端で静止する3次スプラインの軌道を返す．
+    経由点での加速度が連続になるように速度を求める．
+
+    Parameters
+    ----------
+    waypoints : NDArray
+        経由点の角度．形状は (waypoint_num, dof)．最初と最後が開始と目標．
+    time_num : int
+        時間刻みの数．
+    steps : Optional[Sequence[int]]
+        各経由点を通る時刻の番号．0 から time_num - 1 まで増加すること．
+        Noneの場合は等間隔．
+
+    Returns
+    -------
+    theta : NDArray
+        軌道．形状は (dof, time_num)．
+    """
+    waypoints = np.asarray(waypoints, dtype=np.float64)
+    if waypoints.ndim != 2 or waypoints.shape[0] < 2:
+        raise ValueError("waypoints must have the shape (waypoint_num >= 2, dof)")
+    _check_seed_args(waypoints[0], waypoints[-1], time_num)
+    steps = _get_waypoint_steps(time_num, steps, waypoints.shape[0])
+
+    # 両端の速度を0とした3次スプラインの速度の三重対角方程式を全関節まとめて解く
+    n = waypoints.shape[0]
+    h = np.diff(steps)
+    slope = np.diff(waypoints, axis=0) / h[:, None]
+    matrix = np.zeros((n, n))
+    rhs = np.zeros_like(waypoints)
+    matrix[0, 0] = matrix[-1, -1] = 1.0
+    for i in range(1, n - 1):
+        matrix[i, i - 1] = h[i]
+        matrix[i, i] = 2.0 * (h[i - 1] + h[i])
+        matrix[i, i + 1] = h[i - 1]
+        rhs[i] = 3.0 * (h[i] * slope[i - 1] + h[i - 1] * slope[i])
+    velocity = np.linalg.solve(matrix, rhs)
+
+    def basis(tau, h, k):
+        tau = tau[:, None]
+        h = h[:, None]
+        p1 = tau**2 * (3.0 - 2.0 * tau)
+        v0 = tau * (1.0 - tau) ** 2
+        v1 = tau**2 * (tau - 1.0)
+        return (
+            (1.0 - p1) * waypoints[k]
+            + p1 * waypoints[k + 1]
+            + h * (v0 * velocity[k] + v1 * velocity[k + 1])
+        )
+
+    return _evaluate_segments(steps, time_num, basis)
+
+
+def get_decision_vector(theta: NDArray) -> NDArray:
+    """
+    関節 x 時刻 の軌道を最適化の決定変数の並び（関節ごとに全時刻）に変換する．
+    gravibot._trajectory.difference.get_result の逆変換．
+
+    Parameters
+    ----------
+    theta : NDArray
+        軌道．形状は (dof, time_num)．
+
+    Returns
+    -------
+    x : NDArray
+        決定変数．形状は (dof * time_num,)．
+    """
+    theta = np.asarray(theta, dtype=np.float64)
+    if theta.ndim != 2:
+        raise ValueError("theta must have the shape (dof, time_num)")
+
+    return theta.reshape(-1)
+
+
+def get_random_seed(
+    lower: NDArray,
+    upper: NDArray,
+    time_num: int,
+    rng: Optional[np.random.Generator] = None,
+) -> NDArray:
+    """
+    関節ごとに上下限の範囲の一様乱数を全時刻に並べた軌道を返す．
+
+    Parameters
+    ----------
+    lower : NDArray
+        角度の下限．形状は (dof,)．
+    upper : NDArray
+        角度の上限．形状は (dof,)．
+    time_num : int
+        時間刻みの数．
+    rng : Optional[np.random.Generator]
+        乱数生成器．Noneの場合は np.random.default_rng()．
+
+    Returns
+    -------
+    theta : NDArray
+        軌道．形状は (dof, time_num)．
+    """
+    lower, upper = _check_seed_args(lower, upper, time_num)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    return np.repeat(rng.uniform(lower, upper)[:, None], time_num, axis=1)
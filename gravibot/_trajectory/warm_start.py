@@ -0,0 +1,107 @@
+"""provide WarmStartStore class"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+from collections import deque
+from typing import Deque, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .._util.type_check import _type_checked
+
+# 乗数を初期値として使うためのIPOPTの設定．
+# 初期値を上下限から押し戻す量を小さくし，前回の解からそのまま始める
+WARM_START_SOLVER_OPTIONS = {
+    "ipopt.warm_start_init_point": "yes",
+    "ipopt.warm_start_bound_push": 1e-9,
+    "ipopt.warm_start_bound_frac": 1e-9,
+    "ipopt.warm_start_slack_bound_push": 1e-9,
+    "ipopt.warm_start_slack_bound_frac": 1e-9,
+    "ipopt.warm_start_mult_bound_push": 1e-9,
+}
+
+
+class WarmStartStore:
+    """
+    class to store previous solutions of an NLP for warm start.
+    a solution is stored with the parameter vector p of its query, and the
+    solution whose p is nearest to a new query is returned.
+    the oldest solution is discarded when the number of solutions exceeds max_size.
+    """
+
+    def __init__(self, max_size: int = 100):
+        """
+        Parameters
+        ----------
+        max_size : int
+            保存する解の最大数．
+        """
+        max_size = _type_checked(max_size, int)
+        if max_size < 1:
+            raise ValueError("max_size must be 1 or more")
+
+        self._max_size = max_size
+        self._solutions: Deque = deque(maxlen=max_size)
+        self._params: Optional[NDArray[np.float64]] = None  # p を並べた行列のキャッシュ
+
+    def __len__(self) -> int:
+        return len(self._solutions)
+
+    @property
+    def max_size(self) -> int:
+        """getter for the maximum number of solutions"""
+        return self._max_size
+
+    def add(self, solution) -> None:
+        """
+        解を追加する．
+
+        Parameters
+        ----------
+        solution : TrajectoryResult
+            追加する解．p, x, lam_x, lam_g を持つこと．
+        """
+        p = np.asarray(solution.p, dtype=np.float64).reshape(-1)
+        if len(self._solutions) > 0 and p.shape != self._solutions[0].p.shape:
+            raise ValueError("p must have the same shape as the stored solutions")
+
+        self._solutions.append(solution)
+        self._params = None
+
+    def get_nearest(self, p: NDArray):
+        """
+        パラメータが最も近い解を返す．
+
+        Parameters
+        ----------
+        p : NDArray
+            新しい問題のパラメータ．
+
+        Returns
+        -------
+        solution : Optional[TrajectoryResult]
+            パラメータのユークリッド距離が最も近い解．解がない場合はNone．
+        """
+        if len(self._solutions) == 0:
+            return None
+
+        if self._params is None:
+            self._params = np.stack([s.p for s in self._solutions])
+
+        p = np.asarray(p, dtype=np.float64).reshape(-1)
+        if p.shape != self._params.shape[1:]:
+            raise ValueError("p must have the same shape as the stored solutions")
+
+        dist = np.sum((self._params - p) ** 2, axis=1)
+        return self._solutions[int(np.argmin(dist))]
+
+    def clear(self) -> None:
+        """保存した解を全て削除する"""
+        self._solutions.clear()
+        self._params = None
@@ -0,0 +1,86 @@
+"""provide a class to collect latency statistics"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import numpy as np
+
+from .type_check import _type_checked
+
+# 統計に使う最新のサンプルの数．30fpsで約33秒分
+DEFAULT_WINDOW = 1000
+
+
+class LatencyStatistics:
+    """
+    class to collect latencies [s] and summarize them.
+    only the latest `window` samples are kept in a fixed ring buffer, so the
+    memory and the cost of the statistics do not grow in long-running loops.
+    count is the number of all added samples, and the other statistics are
+    computed over the window.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        window = _type_checked(window, int)
+        if window < 1:
+            raise ValueError("window must be 1 or more")
+
+        self._buffer = np.zeros(window)
+        self._count = 0
+
+    def add(self, latency: float) -> None:
+        """add a latency [s], overwriting the oldest one if the window is full"""
+        self._buffer[self._count % len(self._buffer)] = float(latency)
+        self._count += 1
+
+    @property
+    def window(self) -> int:
+        """getter for the number of the latest samples kept"""
+        return len(self._buffer)
+
+    @property
+    def count(self) -> int:
+        """getter for the number of all added samples"""
+        return self._count
+
+    @property
+    def samples(self) -> np.ndarray:
+        """getter for the samples in the window [s], from the oldest to the latest"""
+        if self._count <= len(self._buffer):
+            return self._buffer[: self._count].copy()
+        return np.roll(self._buffer, -(self._count % len(self._buffer)))
+
+    @property
+    def mean(self) -> float:
+        """getter for the mean latency in the window [s]"""
+        return float(np.mean(self._window)) if self._count else 0.0
+
+    @property
+    def max(self) -> float:
+        """getter for the maximum latency in the window [s]"""
+        return float(np.max(self._window)) if self._count else 0.0
+
+    @property
+    def jitter(self) -> float:
+        """getter for the standard deviation of the latency in the window [s]"""
+        return float(np.std(self._window)) if self._count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """return the q-th percentile of the latency in the window [s]"""
+        return float(np.percentile(self._window, q)) if self._count else 0.0
+
+    @property
+    def _window(self) -> np.ndarray:
+        """順序を問わない窓内のサンプル"""
+        return self._buffer[: min(self._count, len(self._buffer))]
+
+    def __str__(self):
+        return (
+            f"count: {self.count}, mean: {self.mean * 1000:.3f}[ms], "
+            + f"p95: {self.percentile(95) * 1000:.3f}[ms], "
+            + f"max: {self.max * 1000:.3f}[ms], jitter: {self.jitter * 1000:.3f}[ms]"
+        )
@@ -105,6 +105,42 @@ class Robot:
             self.get_joint_trans_casadi(i, theta_array_casadi)
         )
 
+    def get_end_effector_pos_casadi(self, theta_array_casadi):
+        """
+        get the position of the end of the last link for casadi.
+        this is the same position as get_joint_pos(get_link_num() - 1).
+        """
+
+        ans = _math.get_trans4x4_casadi(*self._origin)
+        t_cnt = 0
+        for j in range(self.get_link_num()):
+            link = self._param.get_link_param(j)
+            if link.is_fixed():
+                ans = ans @ link.get_trans_mat_casadi(link.min_val)
+            else:
+                ans = ans @ link.get_trans_mat_casadi(theta_array_casadi[t_cnt])
+                t_cnt += 1
+
+        return _math.conv_trans2pos_casadi(ans)
+
+    def get_origin(self) -> _math.PositionVector:
+        """get the position of the base of the robot"""
+        return np.array(self._origin, dtype=np.float64)
+
+    def get_reach(self) -> float:
+        """
+        get the upper bound of the distance between the origin and any joint.
+        each link moves the next joint by at most sqrt(a^2 + d^2).
+        """
+        return float(
+            sum(
+                np.hypot(
+                    self._param.get_link_param(i).a, self._param.get_link_param(i).d
+                )
+                for i in range(self._param.get_link_num())
+            )
+        )
+
     def get_link_num(self) -> int:
         """get the number of links in the robot"""
         return self._param.get_link_num()
@@ -55,47 +55,9 @@ TIME_STEP = 0.1
 TIME_NUM = int(END_TIME / TIME_STEP)
 
 
-def get_delta(theta: cs.MX, length: int, dim: int) -> cs.MX:
-    """thetaの差分を返す"""
-    dtheta = cs.vertcat()
-    for i in range(length * dim):
-        if i % length != 0:
-            dtheta = cs.vertcat(dtheta, theta[i] - theta[i - 1])
-
-    return dtheta
-
-
-def get_start_data(theta: cs.MX, length: int, dim: int) -> cs.MX:
-    """thetaの最初のデータを返す"""
-    ret = cs.vertcat()
-    for i in range(dim):
-        ret = cs.vertcat(ret, theta[i * length])
-
-    return ret
-
-
-def get_end_data(theta: cs.MX, length: int, dim: int) -> cs.MX:
-    """thetaの最後のデータを返す"""
-    ret = cs.vertcat()
-    for i in range(dim):
-        ret = cs.vertcat(ret, theta[i * length + length - 1])
-
-    return ret
-
-
-def get_result(theta: cs.MX, length: int, dim: int) -> np.ndarray:
-    """1次元のデータを間接角度×時間の2次元データに変換"""
-    ret = np.zeros((dim, length))
-    for i in range(dim):
-        for j in range(length):
-            ret[i][j] = theta[i * length + j]
-
-    return ret
-
-
 def dist_objetive(theta: cs.MX) -> float:
     """目標との距離の二乗を返す"""
-    end_data = get_end_data(theta, TIME_NUM, LINK_NUM)
+    end_data = gb.get_end_data(theta, TIME_NUM, LINK_NUM)
     ret = 0.0
     for i in range(LINK_NUM):
         ret += (end_data[i] - TARGET_THETA[i]) ** 2
@@ -104,7 +66,7 @@ def dist_objetive(theta: cs.MX) -> float:
 
 def smooth_objective(ddtheta: cs.MX) -> float:
     """滑らかさの二乗を返す"""
-    jerk = get_delta(ddtheta, TIME_NUM - 2, LINK_NUM)
+    jerk = gb.get_delta(ddtheta, TIME_NUM - 2, LINK_NUM)
 
     # 二乗和を計算
     return cs.sumsqr(jerk)
@@ -114,25 +76,18 @@ def constraints_obstacle(theta: cs.MX, robot_: gb.Robot) -> cs.MX:
     """障害物による制約"""
     DIFF_BUFFER = 0.5
 
-    ret = cs.vertcat()
-    for i in range(OBSTACLE_NUM):
-        for j in range(TIME_NUM):
-            now_theta = cs.vertcat()
-            for k in range(LINK_NUM):
-                now_theta = cs.vertcat(now_theta, theta[k * TIME_NUM + j])
-
-            add = 0
-            for k in range(1, LINK_NUM):
-                pos = robot_.get_joint_pos_casadi(k, now_theta)
-                diff = pos - OBSTACLE_POS[i]
-                dist = diff[0] ** 2 + diff[1] ** 2 + diff[2] ** 2  # 距離の二乗
-                dist = cs.sqrt(dist)
-                add = cs.fmax(add, (OBSTACLE_RADIUS[i] + DIFF_BUFFER) - dist)
-
-            # 障害物の中に入っている場合値を大きくし，外に出ている場合は0
-            ret = cs.vertcat(ret, add)
+    depth = gb.get_obstacle_constraints(
+        robot_,
+        theta,
+        TIME_NUM,
+        np.asarray(OBSTACLE_POS).reshape(-1, 3),
+        np.asarray(OBSTACLE_RADIUS),
+        buffer=DIFF_BUFFER,
+        joint_indices=range(1, LINK_NUM),
+    )
 
-    return ret
+    # 障害物の中に入っている場合値を大きくし，外に出ている場合は0
+    return cs.fmax(0, depth)
 
 
 def draw_obstacle(ax: Axes3D) -> None:
@@ -181,22 +136,22 @@ def main():
     # 制御変数
     theta_mx: cs.MX = cs.MX.sym("theta", LINK_NUM * TIME_NUM)
     print(f"theta.shape = {theta_mx.shape}, is_dense = {theta_mx.is_dense()}")
-    dtheta_mx = get_delta(theta_mx, TIME_NUM, LINK_NUM)
+    dtheta_mx = gb.get_delta(theta_mx, TIME_NUM, LINK_NUM)
     print(f"dtheta.shape = {dtheta_mx.shape}, is_dense = {dtheta_mx.is_dense()}")
-    ddtheta_mx = get_delta(dtheta_mx, TIME_NUM - 1, LINK_NUM)
+    ddtheta_mx = gb.get_delta(dtheta_mx, TIME_NUM - 1, LINK_NUM)
     print(f"ddtheta.shape = {ddtheta_mx.shape}, is_dense = {ddtheta_mx.is_dense()}")
 
-    theta_first = get_start_data(theta_mx, TIME_NUM, LINK_NUM)
+    theta_first = gb.get_start_data(theta_mx, TIME_NUM, LINK_NUM)
     print(f"theta_first.shape = {theta_first.shape}, theta_first = {theta_first}")
-    dtheta_first = get_start_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
+    dtheta_first = gb.get_start_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
     print(f"dtheta_first.shape = {dtheta_first.shape}, dtheta_first = {dtheta_first}")
-    dtheta_last = get_end_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
+    dtheta_last = gb.get_end_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
     print(f"dtheta_last.shape = {dtheta_last.shape}, dtheta_last = {dtheta_last}")
-    ddtheta_first = get_start_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
+    ddtheta_first = gb.get_start_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
     print(
         f"ddtheta_first.shape = {ddtheta_first.shape}, ddtheta_first = {ddtheta_first}"
     )
-    ddtheta_last = get_end_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
+    ddtheta_last = gb.get_end_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
     print(f"ddtheta_last.shape = {ddtheta_last.shape}, ddtheta_last = {ddtheta_last}")
 
     # コスト関数を定義
@@ -240,7 +195,7 @@ def main():
     )
 
     # 最適化結果を取得
-    theta_opt = get_result(opt_result["x"], TIME_NUM, LINK_NUM)
+    theta_opt = gb.get_result(opt_result["x"], TIME_NUM, LINK_NUM)
     print(f"theta_opt = {theta_opt}")
 
     # 図に描画
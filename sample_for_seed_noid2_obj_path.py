@@ -159,52 +159,6 @@ TIME_STEP = 0.2
 TIME_NUM = int(END_TIME / TIME_STEP)
 
 
-def get_delta(theta: cs.MX, length: int, dim: int) -> cs.MX:
-    """thetaの差分を返す"""
-    dtheta = cs.vertcat()
-    for i in range(length * dim):
-        if i % length != 0:
-            dtheta = cs.vertcat(dtheta, theta[i] - theta[i - 1])
-
-    return dtheta
-
-
-def get_start_data(theta: cs.MX, length: int, dim: int) -> cs.MX:
-    """thetaの最初のデータを返す"""
-    ret = cs.vertcat()
-    for i in range(dim):
-        ret = cs.vertcat(ret, theta[i * length])
-
-    return ret
-
-
-def get_end_data(theta: cs.MX, length: int, dim: int) -> cs.MX:
-    """thetaの最後のデータを返す"""
-    ret = cs.vertcat()
-    for i in range(dim):
-        ret = cs.vertcat(ret, theta[i * length + length - 1])
-
-    return ret
-
-
-def get_result(theta: cs.MX, length: int, dim: int) -> np.ndarray:
-    """1次元のデータを間接角度×時間の2次元データに変換"""
-    ret = np.zeros((dim, length))
-    for i in range(dim):
-        for j in range(length):
-            ret[i][j] = theta[i * length + j]
-
-    return ret
-
-
-def smooth_objective(ddtheta: cs.MX) -> float:
-    """滑らかさの二乗を返す"""
-    jerk = get_delta(ddtheta, TIME_NUM - 2, LINK_NUM)
-
-    # 二乗和を計算
-    return cs.sumsqr(jerk)
-
-
 def constraints_obstacle(theta: cs.MX, robot_: gb.Robot) -> cs.MX:
     """障害物による制約"""
 
@@ -322,67 +276,30 @@ def draw_time_graph(angle: np.ndarray, time_: np.ndarray) -> None:
 def main():
     """メイン関数"""
 
-    # 制御変数
-    theta_mx: cs.MX = cs.MX.sym("theta", LINK_NUM * TIME_NUM)  # type: ignore
-    dtheta_mx = get_delta(theta_mx, TIME_NUM, LINK_NUM)
-    ddtheta_mx = get_delta(dtheta_mx, TIME_NUM - 1, LINK_NUM)
-
-    theta_first = get_start_data(theta_mx, TIME_NUM, LINK_NUM)
-    theta_last = get_end_data(theta_mx, TIME_NUM, LINK_NUM)
-    dtheta_first = get_start_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
-    dtheta_last = get_end_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
-    ddtheta_first = get_start_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
-    ddtheta_last = get_end_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
-
-    # 中間点の角度を求める
-    theta_center = cs.vertcat()
-    for i in range(LINK_NUM):
-        theta_center = cs.vertcat(theta_center, theta_mx[i * TIME_NUM + TIME_NUM // 2])
-
     theta_relay_point = [0.3, 0.0, 0.0, 0.0, -1.0, -1.0, 0.0, 0.0]
 
-    # コスト関数を定義
-    cost = smooth_objective(ddtheta_mx)  # + constraints_obstacle(theta_mx, robot)
-
-    # 制約条件
-    constraints = cs.vertcat(
-        theta_first - INITIAL_THETA,
-        theta_last - TARGET_THETA,
-        dtheta_first - INITIAL_DTHETA,
-        dtheta_last - TARGET_DTHETA,
-        ddtheta_first - INITIAL_DDTHETA,
-        ddtheta_last - TARGET_DDTHETA,
-        theta_center - cs.vertcat(*theta_relay_point),
-    )
-
-    print(
-        f"constraints.shape = {constraints.shape}, is_dense = {constraints.is_dense()}"
+    # コストは滑らかさだけで制約は等式なので，閉形式で解ける
+    # （上下限を超える場合はIPOPTで解く）
+    optimizer = gb.TrajectoryOptimizer(
+        robot,
+        TIME_NUM,
+        relay_steps=[TIME_NUM // 2],
+        bounds=(-np.pi / 2, np.pi / 2),
     )
 
-    # 最適化問題を定義
-    nlp = {
-        "x": theta_mx,
-        "f": cost,
-        "g": constraints,
-    }
-
-    # 最適化問題を解く
-    solver = cs.nlpsol("solver", "ipopt", nlp)
-
     # 初期値を設定
     theta_init = [np.random.uniform(-np.pi / 2, np.pi / 2)] * (LINK_NUM * TIME_NUM)
     # theta_init = [0.0] * (LINK_NUM * TIME_NUM)
 
-    opt_result = solver(
-        x0=theta_init,
-        lbx=-np.pi / 2,
-        ubx=np.pi / 2,
-        lbg=-0.0,
-        ubg=0.0,
+    opt_result = optimizer.solve(
+        INITIAL_THETA,
+        TARGET_THETA,
+        relay_points=[theta_relay_point],
+        warm_start=np.array(theta_init),
     )
 
     # 最適化結果を取得
-    theta_opt = get_result(opt_result["x"], TIME_NUM, LINK_NUM)
+    theta_opt = opt_result.theta
     # epsより小さい値を0にする
     theta_opt = np.where(np.abs(theta_opt) < 1e-6, 0.0, theta_opt)
     theta_opt = clamp_result(theta_opt, robot)
@@ -392,7 +309,7 @@ def main():
         formatter={"float_kind": "{: .4f}".format},
     )
     print(f"theta_opt = {res_str}")
-    print(f"opt_result = {opt_result['f']}")
+    print(f"opt_result = {opt_result.cost}")
 
     # 図に描画
     fig = plt.figure()
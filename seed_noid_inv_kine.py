@@ -6,8 +6,6 @@ import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D  # type: ignore
 
-import casadi as cs  # type: ignore
-
 import gravibot as gb
 
 
@@ -91,54 +89,21 @@ TARGET_POS = INITIAL_POS - np.array([-0.05, -0.05, 0.0])
 def main():
     """メイン関数"""
 
-    # 制御変数
-    theta_mx: cs.MX = cs.MX.sym("theta", LINK_NUM)  # type: ignore
-
-    # 制約条件，関節の角度の範囲
-    bounds = [None] * LINK_NUM
-    for i in range(LINK_NUM):
-        bounds[i] = robot.get_moveable_link_bounds(i)
-
-    constraints = []
-    # for i in range(LINK_NUM):
-    #     constraints.append(theta_mx[i] - bounds[i][0])
-    #     constraints.append(bounds[i][1] - theta_mx[i])
-
-    pos = robot.get_joint_pos_casadi(LINK_NUM - 1, theta_mx)
+    # 目標の位置と参照角度はパラメータなので，ソルバは1度だけ作れば良い
+    # 既定では手先（最後の可動関節のリンクの先端）を目標に合わせる
+    solver = gb.InverseKinematicsSolver(robot, bounds=(-np.pi / 2, np.pi / 2))
 
-    cost = cs.sumsqr(
-        pos - TARGET_POS
-    )  # + cs.sumsqr(theta_mx - np.array(INITIAL_THETA))
-
-    # 最適化問題を定義
-    nlp = {
-        "x": theta_mx,
-        "f": cost,
-        "g": constraints,
-    }
-
-    # 最適化問題を解く
-    solver = cs.nlpsol("solver", "ipopt", nlp)
-
-    # 初期値を設定
-    # theta_init = np.array(INITIAL_THETA)
     # 乱数で初期値を設定
     theta_init = np.random.uniform(-np.pi / 2, np.pi / 2, LINK_NUM)
 
-    opt_result = solver(
-        x0=theta_init,
-        lbx=-np.pi / 2,
-        ubx=np.pi / 2,
-        lbg=-0.0,
-        ubg=0.0,
-    )
+    opt_result = solver.solve(TARGET_POS, initial=theta_init)
 
     # 最適化結果を取得
     print(f"best theta = {INITIAL_THETA}")
-    print(f"theta_opt = {opt_result['x']}")
-    print(f"opt_result = {opt_result['f']}")
+    print(f"theta_opt = {opt_result.theta}")
+    print(f"opt_result = {opt_result.cost}")
 
-    res_theta = opt_result["x"]
+    res_theta = opt_result.theta
     for i in range(LINK_NUM):
         robot.set_theta(i, float(res_theta[i]))
     print(f"initial_pos = {INITIAL_POS}")
@@ -55,47 +55,9 @@ TIME_STEP = 0.1
 TIME_NUM = int(END_TIME / TIME_STEP)
 
 
-def get_delta(theta: cs.MX, length: int, dim: int) -> cs.MX:
-    """thetaの差分を返す"""
-    dtheta = cs.vertcat()
-    for i in range(length * dim):
-        if i % length != 0:
-            dtheta = cs.vertcat(dtheta, theta[i] - theta[i - 1])
-
-    return dtheta
-
-
-def get_start_data(theta: cs.MX, length: int, dim: int) -> cs.MX:
-    """thetaの最初のデータを返す"""
-    ret = cs.vertcat()
-    for i in range(dim):
-        ret = cs.vertcat(ret, theta[i * length])
-
-    return ret
-
-
-def get_end_data(theta: cs.MX, length: int, dim: int) -> cs.MX:
-    """thetaの最後のデータを返す"""
-    ret = cs.vertcat()
-    for i in range(dim):
-        ret = cs.vertcat(ret, theta[i * length + length - 1])
-
-    return ret
-
-
-def get_result(theta: cs.MX, length: int, dim: int) -> np.ndarray:
-    """1次元のデータを間接角度×時間の2次元データに変換"""
-    ret = np.zeros((dim, length))
-    for i in range(dim):
-        for j in range(length):
-            ret[i][j] = theta[i * length + j]
-
-    return ret
-
-
 def smooth_objective(ddtheta: cs.MX) -> float:
     """滑らかさの二乗を返す"""
-    jerk = get_delta(ddtheta, TIME_NUM - 2, LINK_NUM)
+    jerk = gb.get_delta(ddtheta, TIME_NUM - 2, LINK_NUM)
 
     # 二乗和を計算
     return cs.sumsqr(jerk)
@@ -105,25 +67,18 @@ def constraints_obstacle(theta: cs.MX, robot_: gb.Robot) -> cs.MX:
     """障害物による制約"""
     diff_buffer = 1.0  # 障害物との距離
 
-    ret = 0.0
-    for i in range(OBSTACLE_NUM):
-        for j in range(TIME_NUM):
-            now_theta = cs.vertcat()
-            for k in range(LINK_NUM):
-                now_theta = cs.vertcat(now_theta, theta[k * TIME_NUM + j])
-
-            add = 0
-            for k in range(1, LINK_NUM):
-                pos = robot_.get_joint_pos_casadi(k, now_theta)
-                diff = pos - OBSTACLE_POS[i]
-                dist = diff[0] ** 2 + diff[1] ** 2 + diff[2] ** 2  # 距離の二乗
-                dist = cs.sqrt(dist)
-                add = cs.fmax(add, (OBSTACLE_RADIUS[i] + diff_buffer) - dist)
-
-            # 障害物の中に入っている場合値を大きくし，外に出ている場合は0
-            ret += cs.fmax(0, add)
+    depth = gb.get_obstacle_constraints(
+        robot_,
+        theta,
+        TIME_NUM,
+        np.asarray(OBSTACLE_POS).reshape(-1, 3),
+        np.asarray(OBSTACLE_RADIUS),
+        buffer=diff_buffer,
+        joint_indices=range(1, LINK_NUM),
+    )
 
-    return ret
+    # 障害物の中に入っている場合値を大きくし，外に出ている場合は0
+    return cs.sum1(cs.fmax(0, depth))
 
 
 def draw_obstacle(ax: Axes3D) -> None:
@@ -171,15 +126,15 @@ def main():
 
     # 制御変数
     theta_mx: cs.MX = cs.MX.sym("theta", LINK_NUM * TIME_NUM)  # type: ignore
-    dtheta_mx = get_delta(theta_mx, TIME_NUM, LINK_NUM)
-    ddtheta_mx = get_delta(dtheta_mx, TIME_NUM - 1, LINK_NUM)
+    dtheta_mx = gb.get_delta(theta_mx, TIME_NUM, LINK_NUM)
+    ddtheta_mx = gb.get_delta(dtheta_mx, TIME_NUM - 1, LINK_NUM)
 
-    theta_first = get_start_data(theta_mx, TIME_NUM, LINK_NUM)
-    theta_last = get_end_data(theta_mx, TIME_NUM, LINK_NUM)
-    dtheta_first = get_start_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
-    dtheta_last = get_end_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
-    ddtheta_first = get_start_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
-    ddtheta_last = get_end_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
+    theta_first = gb.get_start_data(theta_mx, TIME_NUM, LINK_NUM)
+    theta_last = gb.get_end_data(theta_mx, TIME_NUM, LINK_NUM)
+    dtheta_first = gb.get_start_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
+    dtheta_last = gb.get_end_data(dtheta_mx, TIME_NUM - 1, LINK_NUM)
+    ddtheta_first = gb.get_start_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
+    ddtheta_last = gb.get_end_data(ddtheta_mx, TIME_NUM - 2, LINK_NUM)
 
     # コスト関数を定義
     cost = smooth_objective(ddtheta_mx) + 0.0001 * constraints_obstacle(theta_mx, robot)
@@ -221,7 +176,7 @@ def main():
     )
 
     # 最適化結果を取得
-    theta_opt = get_result(opt_result["x"], TIME_NUM, LINK_NUM)
+    theta_opt = gb.get_result(opt_result["x"], TIME_NUM, LINK_NUM)
     print(f"theta_opt = {theta_opt}")
 
     # 図に描画
@@ -2,7 +2,6 @@
 Kinectのデータを読み込むためのモジュール
 """
 
-from typing import List
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D  # type: ignore
@@ -79,184 +78,24 @@ for idx, theta in enumerate(INITIAL_THETA):
 
 FILE_NAME = "KinectData.txt"
 
-# kinectのデータは Frame:*, time: *[ms] で区切られている
-SEPARATOR = "Frame:"
-
 DATA_NAME = "Born"
 
-SKELETON_NUM = 20
-
-SKELETON_MAP = {
-    "SpineBase": 0,
-    "SpineMid": 1,
-    "Neck": 2,
-    "Head": 3,
-    "ShoulderLeft": 4,
-    "ElbowLeft": 5,
-    "WristLeft": 6,
-    "HandLeft": 7,
-    "ShoulderRight": 8,
-    "ElbowRight": 9,
-    "WristRight": 10,
-    "HandRight": 11,
-    "HipLeft": 12,
-    "KneeLeft": 13,
-    "AnkleLeft": 14,
-    "FootLeft": 15,
-    "HipRight": 16,
-    "KneeRight": 17,
-    "AnkleRight": 18,
-    "FootRight": 19,
-}
-
-# 上半身
-UPPER_BODY = [
-    "SpineMid",
-    "Neck",
-    "Head",
-    "ShoulderLeft",
-    "ElbowLeft",
-    "WristLeft",
-    "HandLeft",
-    "ShoulderRight",
-    "ElbowRight",
-    "WristRight",
-    "HandRight",
-]
-
-SKELETON_CONNECTION = [
-    (0, 1),
-    (1, 2),
-    (2, 3),
-    (1, 4),
-    (4, 5),
-    (5, 6),
-    (6, 7),
-    (1, 8),
-    (8, 9),
-    (9, 10),
-    (10, 11),
-    (0, 12),
-    (12, 13),
-    (13, 14),
-    (14, 15),
-    (0, 16),
-    (16, 17),
-    (17, 18),
-    (18, 19),
-]
-
-
-class KinectFrameData:
-    """
-    Kinectのフレームデータを保持するクラス
-    """
+SKELETON_NUM = gb.SKELETON_NUM
+SKELETON_MAP = gb.SKELETON_MAP
+UPPER_BODY = gb.UPPER_BODY
+SKELETON_CONNECTION = gb.SKELETON_CONNECTION
 
-    def __init__(self, frame, time, *, data_=None):
-        self.frame = frame  # Frame number
-        self.time = time  # Time in ms
-        # data は 3次元座標20個なので，20*3のリスト
-        self.data = [0.0, 0.0, 0.0] * 20
-
-        for i in range(20):
-            self.data[i * 3] = data_[i * 3]
-            self.data[i * 3 + 1] = data_[i * 3 + 1]
-            self.data[i * 3 + 2] = data_[i * 3 + 2]
-
-    def __str__(self):
-        return f"Frame: {self.frame}, Time: {self.time}, Data: {self.data}"
-
-    def draw(self, ax_: Axes3D):
-        """
-        3Dグラフに描画する
-        """
-        for i, j in SKELETON_CONNECTION:
-            x = [self.data[i * 3], self.data[j * 3]]
-            y = [self.data[i * 3 + 1], self.data[j * 3 + 1]]
-            z = [self.data[i * 3 + 2], self.data[j * 3 + 2]]
-            ax_.plot(x, y, z, color="black")
-
-        # 上半身の点は赤色で描画，それ以外は緑色で描画
-        for s, i in SKELETON_MAP.items():
-            # sがUPPER_BODYに含まれている場合は赤色で描画
-            if s in UPPER_BODY:
-                ax_.scatter(
-                    self.data[i * 3],
-                    self.data[i * 3 + 1],
-                    self.data[i * 3 + 2],
-                    color="black",
-                )
-            else:
-                ax_.scatter(
-                    self.data[i * 3],
-                    self.data[i * 3 + 1],
-                    self.data[i * 3 + 2],
-                    color="black",
-                )
-
-
-def read_kinect_data(file_name, *, offset=[0, 0, 0]) -> List[KinectFrameData]:
+
+def read_kinect_data(file_name, *, offset=[0, 0, 0]) -> gb.KinectRecording:
     """
     Kinectのデータを読み込む．
-    Kinectのデータは，以下のような形式で保存されている．
-    Born等のデータは任意のデータであり，存在しない場合もある．
-    Frame:*, time: *[ms]
-    Angle: *
-    TimeStamp: *
-    (arbitrarily) ID: *
-    (arbitrarily) Quality: *
-    (arbitrarily) Born0: *, *, *
-    (arbitrarily) Born1: *, *, *
-    (arbitrarily) ...
-    (arbitrarily) Born19: *, *, *
+    テキストの解析結果はファイルの隣にキャッシュされるため，2回目以降の読み込みは高速である．
+    データの形式は gb.parse_kinect_text を参照．
     """
-    with open(file_name, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    frame_data = []
-    cnt = 0
-
-    while cnt < len(lines):
-        if SEPARATOR in lines[cnt]:
-            # END を含む場合は終了
-            if "END" in lines[cnt]:
-                break
-
-            # Frame:*, time: *[ms] を前後で分割
-            frame_str = lines[cnt].split(",")[0].strip()
-            time_str = lines[cnt].split(",")[1].strip().replace("[ms]", "")
-
-            # 文字列から，数字のみを取り出す
-            frame = int(frame_str.split(":")[1].strip())
-            time = float(time_str.split(":")[1].strip())
-
-            # 2行読み飛ばす
-            cnt += 3
+    recording = gb.KinectRecording.from_file(file_name)
 
-            # 次の行が,ID: * であるかどうかを確認
-            if "ID" not in lines[cnt]:
-                continue
-
-            # さらに2行読み飛ばす
-            cnt += 2
-
-            # 20個のデータを読み込む
-            res_data = [0.0, 0.0, 0.0] * 20
-
-            for i in range(20):
-                born_str = lines[cnt].split(":")[1].strip()
-                x, y, z = born_str.split(",")
-                res_data[i * 3] = float(x) + float(offset[0])
-                res_data[i * 3 + 1] = (float(z) + float(offset[1])) * -1
-                res_data[i * 3 + 2] = float(y) + float(offset[2])
-                cnt += 1
-
-            frame_data.append(KinectFrameData(frame, time, data_=res_data))
-
-        else:
-            cnt += 1
-
-    return frame_data
+    # オフセットを加え，y軸とz軸を入れ替える変換を全フレームにまとめて適用する
+    return recording.transform(gb.get_offset_trans4x4(offset))
 
 
 def draw_table(ax_: Axes3D):
@@ -308,51 +147,21 @@ WORKSPACE_Z = [0.5, 1.5]
 GRID_SIZE = 0.1
 
 
-def compute_sweep_space(data: List[KinectFrameData]):
+def compute_sweep_space(data: gb.KinectRecording, *, bone_radius=None):
     """
     Kinectのデータから，人間の掃引空間を計算し，時間で除して確立を求め，3次元配列で返す．
     作業空間は，WORKSPACE_X, WORKSPACE_Y, WORKSPACE_Zで指定され，GRID_SIZEで分割される．
+    bone_radiusを指定した場合は，関節の点ではなく半径bone_radiusの骨で空間を塗りつぶす．
     """
-    # 3次元配列を作成
-    ret = np.zeros(
-        (
-            int((WORKSPACE_X[1] - WORKSPACE_X[0]) / GRID_SIZE),
-            int((WORKSPACE_Y[1] - WORKSPACE_Y[0]) / GRID_SIZE),
-            int((WORKSPACE_Z[1] - WORKSPACE_Z[0]) / GRID_SIZE),
-        )
-    )
+    grid = gb.WorkspaceGrid(WORKSPACE_X, WORKSPACE_Y, WORKSPACE_Z, GRID_SIZE)
 
     # 0 ~ 180 までを削除
     data = data[180:]
 
-    # 人間の掃引空間を計算
-    for d in data:
-        for i in range(20):
-            x = d.data[i * 3]
-            y = d.data[i * 3 + 1]
-            z = d.data[i * 3 + 2]
-
-            if (
-                x < WORKSPACE_X[0]
-                or x > WORKSPACE_X[1]
-                or y < WORKSPACE_Y[0]
-                or y > WORKSPACE_Y[1]
-                or z < WORKSPACE_Z[0]
-                or z > WORKSPACE_Z[1]
-            ):
-                continue
-
-            # 3次元配列のインデックスを計算
-            x_idx = int((x - WORKSPACE_X[0]) / GRID_SIZE)
-            y_idx = int((y - WORKSPACE_Y[0]) / GRID_SIZE)
-            z_idx = int((z - WORKSPACE_Z[0]) / GRID_SIZE)
-
-            ret[x_idx, y_idx, z_idx] += 1
-
-    # 時間で除して確立を求める
-    ret /= float(len(data))
+    if bone_radius is not None:
+        return gb.compute_bone_sweep_space(data.joints, grid, bone_radius)
 
-    return ret
+    return gb.compute_sweep_space(data.joints, grid)
 
 
 if __name__ == "__main__":
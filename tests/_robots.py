@@ -0,0 +1,23 @@
+"""provide the robot shared by the test cases of gravibot._trajectory"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import numpy as np
+
+from gravibot._robot import LinkParam, RobotParam
+from gravibot.robot import Robot
+
+
+def make_robot() -> Robot:
+    """4軸のロボットを作成"""
+    param = RobotParam()
+    param.add_link(LinkParam(a=0.0, alpha=np.pi / 2.0, d=10.0))
+    param.add_link(LinkParam(a=10.0, alpha=0.0, d=0.0))
+    param.add_link(LinkParam(a=10.0, alpha=-np.pi / 2.0, d=0.0))
+    param.add_link(LinkParam(a=10.0, alpha=0.0, d=0.0))
+    return Robot(param)
@@ -0,0 +1,119 @@
+"""provide test cases for gravibot._kinect.accumulator"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.accumulator import SweepSpaceAccumulator
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.recording import KinectRecording
+    from gravibot._kinect.sweep_space import compute_sweep_space
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.accumulator import SweepSpaceAccumulator
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.recording import KinectRecording
+    from gravibot._kinect.sweep_space import compute_sweep_space
+
+
+class TestKinectAccumulator(unittest.TestCase):
+    """test class of gravibot._kinect.accumulator"""
+
+    def setUp(self):
+        self.grid = WorkspaceGrid([-0.5, 0.5], [-1.0, 0.0], [0.5, 1.5], 0.1)
+        rng = np.random.default_rng(1)
+        joints = rng.uniform([-1.0, -1.5, 0.0], [1.0, 0.5, 2.0], (30, 20, 3))
+        self.recording = KinectRecording(np.arange(30), np.arange(30) * 33.0, joints)
+
+    def test_cumulative(self):
+        """when neither window nor half_life is given,
+        should return the same result as compute_sweep_space"""
+        acc = SweepSpaceAccumulator(self.grid)
+        acc.add_recording(self.recording)
+
+        expected = compute_sweep_space(self.recording.joints, self.grid)
+        self.assertEqual(acc.frame_num, 30)
+        self.assertTrue(np.allclose(acc.get_probability(), expected))
+
+    def test_window(self):
+        """when window is given,
+        should return the result of the latest frames only"""
+        acc = SweepSpaceAccumulator(self.grid, window=7)
+        acc.add_recording(self.recording)
+
+        expected = compute_sweep_space(self.recording.joints[-7:], self.grid)
+        self.assertEqual(acc.frame_num, 7)
+        self.assertTrue(np.allclose(acc.get_probability(), expected))
+
+    def test_window_incremental(self):
+        """when the probability is read after every frame,
+        should return a read-only view that matches the latest frames"""
+        acc = SweepSpaceAccumulator(self.grid, window=7)
+        for i, (joints, time) in enumerate(
+            zip(self.recording.joints, self.recording.time)
+        ):
+            acc.add_frame(joints, float(time))
+            probability = acc.get_probability()
+
+            expected = compute_sweep_space(
+                self.recording.joints[max(0, i - 6) : i + 1], self.grid
+            )
+            self.assertTrue(np.allclose(probability, expected))
+
+        # フレームを追加しなければ同じビューを返し，書き換えはできない
+        self.assertIs(acc.get_probability(), probability)
+        self.assertFalse(probability.flags.writeable)
+        with self.assertRaises(ValueError):
+            probability[0, 0, 0] = 1.0
+
+    def test_half_life(self):
+        """when half_life is given,
+        should weight a frame by 0.5 every half_life"""
+        acc = SweepSpaceAccumulator(self.grid, half_life=100.0)
+        joints = np.zeros((20, 3))
+        joints[:] = [0.05, -0.05, 1.05]
+        acc.add_frame(joints, 0.0)
+        joints[:] = [-0.45, -0.95, 0.55]
+        acc.add_frame(joints, 100.0)
+
+        self.assertAlmostEqual(acc.get_probability()[5, 9, 5], 20.0 / 3.0)
+        self.assertAlmostEqual(acc.get_probability()[0, 0, 0], 40.0 / 3.0)
+        self.assertTrue(
+            np.allclose(
+                acc.get_probability_at(np.array([[0.05, -0.05, 1.05], [9, 9, 9]])),
+                [20.0 / 3.0, 0.0],
+            )
+        )
+
+    def test_half_life_renormalize(self):
+        """when a long time passes,
+        should not overflow"""
+        acc = SweepSpaceAccumulator(self.grid, half_life=1.0)
+        joints = np.full((20, 3), [0.05, -0.05, 1.05])
+        for i in range(10):
+            acc.add_frame(joints, i * 1000.0)
+
+        self.assertTrue(np.isfinite(acc.get_probability()).all())
+        self.assertAlmostEqual(acc.get_probability()[5, 9, 5], 20.0)
+
+    def test_half_life_requires_time(self):
+        """when time is not given with half_life,
+        should raise ValueError"""
+        acc = SweepSpaceAccumulator(self.grid, half_life=1.0)
+        with self.assertRaises(ValueError):
+            acc.add_frame(np.zeros((20, 3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
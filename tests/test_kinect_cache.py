@@ -0,0 +1,88 @@
+"""provide test cases for gravibot._kinect.cache"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.cache import get_cache_dir, load_kinect_arrays
+except ImportError:
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.cache import get_cache_dir, load_kinect_arrays
+
+
+def make_kinect_text(frame_num: int, *, skip=()) -> str:
+    """make a text in the same format as KinectData.txt"""
+    text = ""
+    for i in range(frame_num):
+        text += f"Frame: {i}, time: {i * 33.0:9.2f}[ms]\nAngle: 3\nTimeStamp: {i}\n"
+        if i in skip:
+            continue
+        text += "ID:10\nQuality:0\n"
+        for j in range(20):
+            text += f"Born{j}:{i + j * 0.01:.6f},{-j * 0.1:.6f},{2.0 + i:.6f}\n"
+    text += "Frame:-------END-------\n"
+    return text
+
+
+class TestKinectCache(unittest.TestCase):
+    """test class of gravibot._kinect.cache"""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self._dir.name, "KinectData.txt")
+        with open(self.file_name, "w", encoding="utf-8") as f:
+            f.write(make_kinect_text(4, skip=(1,)))
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_load_kinect_arrays(self):
+        """when a text file is given,
+        should return the raw sensor coordinates of frames with a skeleton"""
+        frame, time, joints = load_kinect_arrays(self.file_name, use_cache=False)
+
+        self.assertEqual(frame.tolist(), [0, 2, 3])
+        self.assertEqual(time.tolist(), [0.0, 66.0, 99.0])
+        self.assertEqual(joints.shape, (3, 20, 3))
+        self.assertEqual(joints.dtype, np.float32)
+        self.assertTrue(np.allclose(joints[1, 5], [2.05, -0.5, 4.0]))
+
+    def test_cache_is_memmap(self):
+        """when the file is loaded twice,
+        should return memory-mapped arrays equal to the parsed ones"""
+        expected = load_kinect_arrays(self.file_name, use_cache=False)
+        load_kinect_arrays(self.file_name)
+        self.assertTrue(os.path.isdir(get_cache_dir(self.file_name)))
+
+        cached = load_kinect_arrays(self.file_name)
+        for a, b in zip(expected, cached):
+            self.assertIsInstance(b, np.memmap)
+            self.assertTrue((a == b).all())
+
+    def test_cache_is_invalidated(self):
+        """when the source file is changed,
+        should parse the file again"""
+        load_kinect_arrays(self.file_name)
+
+        with open(self.file_name, "w", encoding="utf-8") as f:
+            f.write(make_kinect_text(6))
+
+        frame, _, joints = load_kinect_arrays(self.file_name)
+        self.assertEqual(frame.tolist(), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(joints.shape, (6, 20, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
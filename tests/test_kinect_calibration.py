@@ -0,0 +1,87 @@
+"""provide test cases for gravibot._kinect.calibration"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.calibration import apply_extrinsic, get_offset_trans4x4
+    from gravibot._kinect.recording import KinectRecording
+    from gravibot._math.trans import get_rot4x4, get_trans4x4
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.calibration import apply_extrinsic, get_offset_trans4x4
+    from gravibot._kinect.recording import KinectRecording
+    from gravibot._math.trans import get_rot4x4, get_trans4x4
+
+
+class TestKinectCalibration(unittest.TestCase):
+    """test class of gravibot._kinect.calibration"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.joints = rng.uniform(-1.0, 1.0, (10, 20, 3)).astype(np.float32)
+
+    def test_offset_trans(self):
+        """when the legacy offset is given,
+        should add the offset and swap the y and z axes"""
+        offset = [-0.1, -0.65, 0.75]
+        actual = apply_extrinsic(self.joints, get_offset_trans4x4(offset))
+
+        j = self.joints
+        expected = np.stack(
+            [j[..., 0] + offset[0], -(j[..., 2] + offset[1]), j[..., 1] + offset[2]],
+            axis=-1,
+        )
+        self.assertEqual(actual.dtype, np.float32)
+        self.assertTrue(np.allclose(actual, expected, atol=1e-6))
+
+    def test_rotation(self):
+        """when a rotation and a translation are given,
+        should return the same result as the homogeneous coordinates"""
+        trans = get_trans4x4(0.1, 0.2, 0.3) @ get_rot4x4("z", 0.5)
+        actual = apply_extrinsic(self.joints, trans)
+
+        homogeneous = np.concatenate([self.joints, np.ones((10, 20, 1))], axis=-1)
+        expected = (homogeneous @ trans.T)[..., :3]
+        self.assertTrue(np.allclose(actual, expected, atol=1e-6))
+
+    def test_in_place(self):
+        """when out is joints,
+        should transform joints in place"""
+        trans = get_rot4x4("x", 1.0)
+        expected = apply_extrinsic(self.joints, trans)
+        ret = apply_extrinsic(self.joints, trans, out=self.joints)
+        self.assertIs(ret, self.joints)
+        self.assertTrue(np.allclose(self.joints, expected))
+
+    def test_recording_transform(self):
+        """when a recording is transformed,
+        should keep the original joints and share frame and time"""
+        recording = KinectRecording(np.arange(10), np.arange(10) * 33.0, self.joints)
+        original = self.joints.copy()
+        transformed = recording.transform(get_trans4x4(1.0, 0.0, 0.0))
+
+        self.assertTrue(np.array_equal(recording.joints, original))
+        self.assertTrue(np.allclose(transformed.joints[..., 0], original[..., 0] + 1))
+        self.assertIs(transformed.time, recording.time)
+
+    def test_invalid_trans(self):
+        """when trans is not 4x4,
+        should raise ValueError"""
+        with self.assertRaises(ValueError):
+            apply_extrinsic(self.joints, np.eye(3))
+
+
+if __name__ == "__main__":
+    unittest.main()
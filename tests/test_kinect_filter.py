@@ -0,0 +1,121 @@
+"""provide test cases for gravibot._kinect.filter"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.filter import (
+        JointFilter,
+        OneEuroFilter,
+        SavitzkyGolayFilter,
+        ConstantVelocityKalmanFilter,
+    )
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.filter import (
+        JointFilter,
+        OneEuroFilter,
+        SavitzkyGolayFilter,
+        ConstantVelocityKalmanFilter,
+    )
+
+
+class TestKinectFilter(unittest.TestCase):
+    """test class of gravibot._kinect.filter"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.time = np.arange(300) * 1000.0 / 30.0
+        # 0.1m/s で動く関節に 1cm のノイズを加える
+        self.truth = np.zeros((300, 20, 3))
+        self.truth[..., 0] = 0.1 * self.time[:, None] / 1000.0
+        self.joints = self.truth + rng.normal(0.0, 0.01, self.truth.shape)
+
+    def get_error(self, joints: np.ndarray) -> float:
+        """return the RMS error after the filter has settled"""
+        return float(np.sqrt(np.mean((joints[30:] - self.truth[30:]) ** 2)))
+
+    def test_savitzky_golay_polynomial(self):
+        """when the joints follow a polynomial of the order,
+        should keep them unchanged"""
+        x = np.linspace(-1.0, 1.0, 20)
+        joints = np.broadcast_to((x**2)[:, None, None], (20, 20, 3))
+        actual = SavitzkyGolayFilter(7, 2).apply(joints)
+        self.assertTrue(np.allclose(actual, joints))
+
+    def test_savitzky_golay_streaming(self):
+        """when frames are given one by one,
+        should evaluate the polynomial of the latest window at the latest frame"""
+        sg = SavitzkyGolayFilter(5, 1)
+        for frame in self.joints[:10]:
+            actual = sg.update(frame)
+
+        expected = np.polyval(np.polyfit(np.arange(5), self.joints[5:10, 3, 0], 1), 4)
+        self.assertAlmostEqual(actual[3, 0], expected)
+
+    def test_reduce_noise(self):
+        """when noisy joints are given,
+        should reduce the error in both offline and streaming mode"""
+        raw_error = self.get_error(self.joints)
+        for joint_filter in [
+            SavitzkyGolayFilter(9, 2),
+            OneEuroFilter(min_cutoff=1.0, beta=0.5),
+            ConstantVelocityKalmanFilter(process_noise=0.01),
+        ]:
+            with self.subTest(joint_filter=type(joint_filter).__name__):
+                offline = joint_filter.apply(self.joints, self.time)
+                self.assertLess(self.get_error(offline), raw_error)
+
+                joint_filter.reset()
+                streaming = np.array(
+                    [joint_filter.update(j, t) for j, t in zip(self.joints, self.time)]
+                )
+                self.assertLess(self.get_error(streaming), raw_error)
+
+    def test_streaming_matches_offline(self):
+        """when the filter is recursive,
+        should return the same result in offline and streaming mode"""
+        kalman = ConstantVelocityKalmanFilter()
+        offline = kalman.apply(self.joints, self.time)
+        kalman.reset()
+        streaming = [kalman.update(j, t) for j, t in zip(self.joints, self.time)]
+        self.assertTrue(np.allclose(offline, streaming))
+
+    def test_invalid_time(self):
+        """when time does not increase,
+        should raise ValueError"""
+        one_euro = OneEuroFilter()
+        one_euro.update(self.joints[0], 10.0)
+        with self.assertRaises(ValueError):
+            one_euro.update(self.joints[1], 10.0)
+
+    def test_abstract_update(self):
+        """when a subclass does not implement _update,
+        should raise TypeError on instantiation"""
+
+        class IncompleteFilter(JointFilter):
+            """filter without _update"""
+
+        with self.assertRaises(TypeError):
+            IncompleteFilter()
+
+    def test_invalid_window(self):
+        """when window is even,
+        should raise ValueError"""
+        with self.assertRaises(ValueError):
+            SavitzkyGolayFilter(4, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""provide test cases for gravibot._kinect.index"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+try:
+    from gravibot._kinect.cache import get_cache_dir
+    from gravibot._kinect.index import KinectTextIndex
+    from gravibot._kinect.parser import parse_kinect_text
+except ImportError:
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.cache import get_cache_dir
+    from gravibot._kinect.index import KinectTextIndex
+    from gravibot._kinect.parser import parse_kinect_text
+
+
+def write_recording(file_name: str, frame_num: int) -> None:
+    """write a recording where the skeleton of every third frame is missing"""
+    with open(file_name, "w", encoding="utf-8") as f:
+        for i in range(frame_num):
+            f.write(f"Frame: {i}, time: {i * 33.0}[ms]\nAngle: 3\nTimeStamp: 0\n")
+            if i % 3 == 2:
+                continue
+            f.write("ID:1\nQuality:0\n")
+            for j in range(20):
+                f.write(f"Born{j}:{i},{j},{i + j}\n")
+        f.write("Frame:---END---\n")
+
+
+class TestKinectTextIndex(unittest.TestCase):
+    """test class of gravibot._kinect.index"""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self._dir.name, "rec.txt")
+        write_recording(self.file_name, 10)
+        self.index = KinectTextIndex(self.file_name)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_index(self):
+        """when a file is indexed,
+        should hold all frames including frames without skeleton"""
+        self.assertEqual(len(self.index), 10)
+        self.assertEqual(self.index.frame.tolist(), list(range(10)))
+        self.assertEqual(self.index.offset.shape, (11,))
+
+    def test_get_frame(self):
+        """when a frame number is given,
+        should read only the frame"""
+        frame = self.index.get_frame(4)
+        self.assertEqual(frame.frame, 4)
+        self.assertEqual(frame.time, 132.0)
+        self.assertEqual(frame.joints[5].tolist(), [4.0, 5.0, 9.0])
+
+        with self.assertRaises(KeyError):
+            self.index.get_frame(2)
+        with self.assertRaises(KeyError):
+            self.index.get_frame(10)
+
+    def test_window(self):
+        """when a time window is given,
+        should return the same frames as parsing the whole file"""
+        frame, _, joints = parse_kinect_text(self.file_name)
+        expected = (frame >= 3) & (frame < 8)
+
+        window = self.index.window(99.0, 264.0)
+        self.assertEqual(window.frame.tolist(), frame[expected].tolist())
+        self.assertTrue(np.array_equal(window.joints, joints[expected]))
+        self.assertEqual(len(self.index.window(1000.0, 2000.0)), 0)
+
+    def test_cached_index(self):
+        """when the file is indexed again,
+        should load the offsets from the cache without scanning the file"""
+        self.assertTrue(os.path.isdir(get_cache_dir(self.file_name)))
+
+        with mock.patch.object(KinectTextIndex, "_scan", side_effect=AssertionError):
+            cached = KinectTextIndex(self.file_name)
+        self.assertTrue(np.array_equal(cached.frame, self.index.frame))
+        self.assertTrue(np.array_equal(cached.time, self.index.time))
+        self.assertTrue(np.array_equal(cached.offset, self.index.offset))
+        self.assertEqual(cached.get_frame(4).frame, 4)
+
+    def test_cached_index_is_invalidated(self):
+        """when the source file is changed,
+        should scan the file again"""
+        write_recording(self.file_name, 12)
+
+        index = KinectTextIndex(self.file_name)
+        self.assertEqual(index.frame.tolist(), list(range(12)))
+        self.assertEqual(index.get_frame(10).frame, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
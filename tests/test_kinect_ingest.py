@@ -0,0 +1,107 @@
+"""provide test cases for gravibot._kinect.ingest"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.ingest import build_occupancy_statistics
+except ImportError:
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.ingest import build_occupancy_statistics
+
+
+def write_recording(file_name: str, positions: list) -> None:
+    """write a recording where all joints of i-th frame are at positions[i]"""
+    with open(file_name, "w", encoding="utf-8") as f:
+        for i, (x, y, z) in enumerate(positions):
+            f.write(f"Frame: {i}, time: {i * 33.0}[ms]\nAngle: 3\nTimeStamp: 0\n")
+            f.write("ID:1\nQuality:0\n")
+            for j in range(20):
+                f.write(f"Born{j}:{x},{y},{z}\n")
+        f.write("Frame:---END---\n")
+
+
+class TestKinectIngest(unittest.TestCase):
+    """test class of gravibot._kinect.ingest"""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.grid = WorkspaceGrid([0.0, 1.0], [0.0, 1.0], [0.0, 1.0], 0.5)
+        self.file_names = [
+            os.path.join(self._dir.name, f"rec{i}.txt") for i in range(2)
+        ]
+        write_recording(self.file_names[0], [(0.2, 0.2, 0.2), (0.7, 0.2, 0.2)])
+        write_recording(self.file_names[1], [(0.2, 0.2, 0.2)] * 3)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_build_occupancy_statistics(self):
+        """when two recordings are given,
+        should return the merged counts, mean and variance"""
+        stat = build_occupancy_statistics(self.file_names, self.grid, workers=2)
+
+        self.assertEqual(stat.recording_num, 2)
+        self.assertEqual(stat.frame_num.tolist(), [2, 3])
+        self.assertEqual(stat.counts[0, 0, 0], 80.0)
+        self.assertEqual(stat.counts[1, 0, 0], 20.0)
+        self.assertAlmostEqual(stat.probability[0, 0, 0], 80.0 / 5.0)
+        self.assertAlmostEqual(stat.mean[0, 0, 0], (10.0 + 20.0) / 2.0)
+        self.assertAlmostEqual(stat.variance[0, 0, 0], 25.0)
+
+    def test_running_sums(self):
+        """when many recordings are merged by several workers,
+        should keep only grid-sized sums and match the per-recording statistics"""
+        rng = np.random.default_rng(0)
+        file_names = []
+        probability = []
+        for i in range(6):
+            positions = rng.uniform(0.0, 1.0, (int(rng.integers(1, 5)), 3))
+            file_names.append(os.path.join(self._dir.name, f"many{i}.txt"))
+            write_recording(file_names[-1], positions.tolist())
+
+            counts = np.zeros(self.grid.shape)
+            for index in np.floor(positions / 0.5).astype(int):
+                counts[tuple(index)] += 20.0
+            probability.append(counts / len(positions))
+
+        stat = build_occupancy_statistics(file_names, self.grid, workers=3)
+
+        self.assertEqual(stat.counts.shape, self.grid.shape)
+        self.assertTrue(np.allclose(stat.mean, np.mean(probability, axis=0)))
+        self.assertTrue(np.allclose(stat.variance, np.var(probability, axis=0)))
+
+    def test_trans_and_skip(self):
+        """when trans and skip_frames are given,
+        should transform the joints after skipping the frames"""
+        trans = np.eye(4)
+        trans[:3, 3] = [0.5, 0.5, 0.5]
+        stat = build_occupancy_statistics(
+            self.file_names[:1], self.grid, trans=trans, skip_frames=1, workers=1
+        )
+        self.assertEqual(stat.frame_num.tolist(), [1])
+        self.assertEqual(stat.counts[1, 1, 1], 0.0)
+        self.assertEqual(stat.probability.sum(), 0.0)
+
+        stat = build_occupancy_statistics(
+            self.file_names[1:], self.grid, trans=trans, workers=1
+        )
+        self.assertEqual(stat.probability[1, 1, 1], 20.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""provide test cases for gravibot._kinect.recording"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.recording import KinectFrame, KinectRecording
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.recording import KinectFrame, KinectRecording
+
+
+def make_recording(frame_num: int) -> KinectRecording:
+    """make a recording whose joints are numbered sequentially"""
+    joints = np.arange(frame_num * 60, dtype=np.float32).reshape(frame_num, 20, 3)
+    return KinectRecording(np.arange(frame_num), np.arange(frame_num) * 33.0, joints)
+
+
+class TestKinectRecording(unittest.TestCase):
+    """test class of gravibot._kinect.recording"""
+
+    def test_getitem_returns_view(self):
+        """when an index is given,
+        should return a frame whose joints share the memory of the recording"""
+        recording = make_recording(5)
+        frame = recording[2]
+
+        self.assertIsInstance(frame, KinectFrame)
+        self.assertEqual(frame.frame, 2)
+        self.assertEqual(frame.time, 66.0)
+        self.assertTrue(np.shares_memory(frame.joints, recording.joints))
+        self.assertEqual(frame.data[3 * 4 + 1], 2 * 60 + 13)
+        with self.assertRaises(AttributeError):
+            frame.extra = 0  # pylint: disable=assigning-non-slot
+
+    def test_slice_returns_recording(self):
+        """when a slice is given,
+        should return a recording of the selected frames"""
+        recording = make_recording(5)
+        sliced = recording[3:]
+
+        self.assertIsInstance(sliced, KinectRecording)
+        self.assertEqual(len(sliced), 2)
+        self.assertEqual([f.frame for f in sliced], [3, 4])
+        self.assertTrue(np.shares_memory(sliced.joints, recording.joints))
+
+    def test_get_frame(self):
+        """when a frame number is given,
+        should return the frame with the number"""
+        recording = make_recording(5)[1:]
+        self.assertEqual(recording.get_frame(3).time, 99.0)
+        with self.assertRaises(KeyError):
+            recording.get_frame(0)
+        with self.assertRaises(KeyError):
+            recording.get_frame(5)
+
+    def test_window(self):
+        """when a time window is given,
+        should return a view of the frames in [t0, t1)"""
+        recording = make_recording(5)
+        window = recording.window(30.0, 99.0)
+
+        self.assertEqual(window.frame.tolist(), [1, 2])
+        self.assertTrue(np.shares_memory(window.joints, recording.joints))
+        self.assertEqual(len(recording.window(99.0, 30.0)), 0)
+
+    def test_invalid_shape(self):
+        """when the shapes do not match,
+        should raise ValueError"""
+        with self.assertRaises(ValueError):
+            KinectRecording(np.arange(2), np.arange(2), np.zeros((2, 19, 3)))
+        with self.assertRaises(ValueError):
+            KinectRecording(np.arange(3), np.arange(2), np.zeros((2, 20, 3)))
+
+    def test_read_only(self):
+        """when the arrays are set,
+        should raise AttributeError"""
+        recording = make_recording(1)
+        with self.assertRaises(AttributeError):
+            recording.joints = np.zeros((1, 20, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""provide test cases for gravibot._kinect.resample"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.resample import resample_joints
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.resample import resample_joints
+
+
+class TestKinectResample(unittest.TestCase):
+    """test class of gravibot._kinect.resample"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # 約30fpsで揺らぎのある時刻，途中で 5 フレーム落ちる
+        time = np.arange(100) * 33.0 + rng.uniform(-3.0, 3.0, 100)
+        self.time = np.delete(time, np.arange(50, 55))
+        self.joints = np.zeros((len(self.time), 20, 3))
+        self.joints[..., 0] = (self.time * 0.001)[:, None]
+        self.joints[..., 1] = (np.sin(self.time * 0.002))[:, None]
+
+    def test_linear(self):
+        """when joints move linearly,
+        should reproduce the motion on the uniform time base"""
+        grid_time, grid_joints, _ = resample_joints(self.time, self.joints, 100.0)
+
+        self.assertTrue(np.allclose(np.diff(grid_time), 100.0))
+        self.assertEqual(grid_joints.shape, (len(grid_time), 20, 3))
+        self.assertTrue(np.allclose(grid_joints[..., 0], (grid_time * 0.001)[:, None]))
+
+    def test_cubic(self):
+        """when joints move smoothly,
+        should be more accurate than the linear interpolation"""
+        errors = []
+        for method in ["linear", "cubic"]:
+            grid_time, grid_joints, valid = resample_joints(
+                self.time, self.joints, 10.0, method=method
+            )
+            expected = np.sin(grid_time * 0.002)
+            errors.append(np.abs(grid_joints[valid, 0, 1] - expected[valid]).max())
+
+        self.assertLess(errors[1], errors[0])
+
+    def test_gap(self):
+        """when frames are dropped,
+        should mark the time in the gap and out of the recording as invalid"""
+        grid_time, _, valid = resample_joints(
+            self.time, self.joints, 100.0, start=-200.0, end=4000.0
+        )
+        gap = (grid_time > self.time[49]) & (grid_time < self.time[50])
+        outside = (grid_time < self.time[0]) | (grid_time > self.time[-1])
+
+        self.assertTrue(gap.any())
+        self.assertTrue(np.array_equal(valid, ~(gap | outside)))
+
+    def test_invalid_time(self):
+        """when time is not increasing,
+        should raise ValueError"""
+        with self.assertRaises(ValueError):
+            resample_joints(self.time[::-1], self.joints, 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""provide test cases for gravibot._kinect.risk_grid"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.recording import KinectRecording
+    from gravibot._kinect.risk_grid import TimeVaryingRiskGrid
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.recording import KinectRecording
+    from gravibot._kinect.risk_grid import TimeVaryingRiskGrid
+
+
+class TestTimeVaryingRiskGrid(unittest.TestCase):
+    """test class of gravibot._kinect.risk_grid"""
+
+    def setUp(self):
+        self.grid = WorkspaceGrid([0.0, 1.0], [0.0, 1.0], [0.0, 1.0], 0.5)
+        rng = np.random.default_rng(0)
+        self.risk_grid = TimeVaryingRiskGrid(
+            self.grid, rng.random((4,) + self.grid.shape), 0.1
+        )
+
+    def test_from_recordings(self):
+        """when the human moves from a voxel to another at 0.5s,
+        should assign the voxels to the time steps before and after 0.5s"""
+        time = np.arange(31) * 1000.0 / 30.0 + 1000.0
+        joints = np.zeros((31, 20, 3))
+        joints[:] = [0.2, 0.2, 0.2]
+        joints[15:] = [0.7, 0.2, 0.2]
+        recording = KinectRecording(np.arange(31), time, joints)
+
+        risk_grid = TimeVaryingRiskGrid.from_recordings(
+            [recording], self.grid, 0.1, 10, method="linear"
+        )
+        self.assertEqual(risk_grid.risk.shape, (10, 2, 2, 2))
+        self.assertTrue(np.allclose(risk_grid.risk[:4, 0, 0, 0], 20.0))
+        self.assertTrue(np.allclose(risk_grid.risk[5:, 1, 0, 0], 20.0))
+        self.assertTrue(np.allclose(risk_grid.risk[:4, 1, 0, 0], 0.0))
+        self.assertTrue(np.allclose(risk_grid.risk[5:, 0, 0, 0], 0.0))
+
+    def test_from_recordings_sample_num(self):
+        """when the time step is not exact in binary,
+        should resample exactly steps * samples_per_step points"""
+        time = np.arange(120) * 1000.0 / 30.0
+        joints = np.zeros((120, 20, 3))
+        joints[:] = [0.2, 0.2, 0.2]
+        recording = KinectRecording(np.arange(120), time, joints)
+
+        for samples_per_step in (1, 3, 4):
+            risk_grid = TimeVaryingRiskGrid.from_recordings(
+                [recording], self.grid, 0.1, 29, samples_per_step=samples_per_step
+            )
+            self.assertEqual(risk_grid.risk.shape, (29, 2, 2, 2))
+            self.assertTrue(np.allclose(risk_grid.risk[:, 0, 0, 0], 20.0))
+
+    def test_lookup(self):
+        """when steps and points are given,
+        should return the risk of the voxels and 0 outside the workspace"""
+        points = np.array([[0.2, 0.7, 0.2], [0.7, 0.7, 0.7], [1.5, 0.0, 0.0]])
+        actual = self.risk_grid.lookup([0, 3, 1], points)
+
+        risk = self.risk_grid.risk
+        self.assertEqual(actual.tolist(), [risk[0, 0, 1, 0], risk[3, 1, 1, 1], 0.0])
+
+    def test_casadi_function(self):
+        """when the CasADi function is called,
+        should return the same value as the batch lookup"""
+        rng = np.random.default_rng(1)
+        points = rng.uniform(-0.2, 1.2, (50, 3))
+        step = rng.integers(0, 4, 50)
+        expected = self.risk_grid.lookup(step, points)
+
+        lookup = self.risk_grid.get_casadi_function()
+        parametric = self.risk_grid.get_casadi_function(parametric=True)
+        values = self.risk_grid.risk.ravel()
+        for k, p, e in zip(step, points, expected):
+            self.assertAlmostEqual(float(lookup(k, *p)), e)
+            self.assertAlmostEqual(float(parametric(k, *p, values)), e)
+
+    def test_coarsen(self):
+        """when the risk grid is coarsened,
+        should take the maximum over the merged voxels and time steps"""
+        coarse = self.risk_grid.coarsen(2, 3)
+        rng = np.random.default_rng(1)
+        points = rng.uniform(0.0, 1.0, (100, 3))
+        step = rng.integers(0, 4, 100)
+
+        self.assertEqual(coarse.grid.shape, (1, 1, 1))
+        self.assertEqual(coarse.risk.shape, (2, 1, 1, 1))
+        self.assertAlmostEqual(coarse.time_step, 0.3)
+        self.assertAlmostEqual(coarse.risk[0, 0, 0, 0], self.risk_grid.risk[:3].max())
+        self.assertAlmostEqual(coarse.risk[1, 0, 0, 0], self.risk_grid.risk[3].max())
+        self.assertTrue(
+            np.all(
+                coarse.lookup(step // 3, points) >= self.risk_grid.lookup(step, points)
+            )
+        )
+        with self.assertRaises(ValueError):
+            self.risk_grid.coarsen(0)
+
+    def test_invalid_shape(self):
+        """when the shape of risk does not match the grid,
+        should raise ValueError"""
+        with self.assertRaises(ValueError):
+            TimeVaryingRiskGrid(self.grid, np.zeros((4, 2, 2, 3)), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""provide test cases for gravibot._kinect.stream"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.accumulator import SweepSpaceAccumulator
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.parser import parse_kinect_text
+    from gravibot._kinect.stream import (
+        KinectStreamParser,
+        KinectStreamPipeline,
+        start_kinect_replay_server,
+    )
+    from gravibot._kinect.sweep_space import compute_sweep_space
+except ImportError:
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.accumulator import SweepSpaceAccumulator
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.parser import parse_kinect_text
+    from gravibot._kinect.stream import (
+        KinectStreamParser,
+        KinectStreamPipeline,
+        start_kinect_replay_server,
+    )
+    from gravibot._kinect.sweep_space import compute_sweep_space
+
+
+def write_recording(file_name: str, positions: list) -> None:
+    """write a recording where all joints of i-th frame are at positions[i].
+    the skeleton of a frame is not written when its position is None"""
+    with open(file_name, "w", encoding="utf-8") as f:
+        for i, pos in enumerate(positions):
+            f.write(f"Frame: {i}, time: {i * 33.0}[ms]\nAngle: 3\nTimeStamp: 0\n")
+            if pos is None:
+                continue
+            f.write("ID:1\nQuality:0\n")
+            for j in range(20):
+                f.write(f"Born{j}:{pos[0]},{pos[1]},{pos[2]}\n")
+        f.write("Frame:---END---\n")
+
+
+class TestKinectStream(unittest.TestCase):
+    """test class of gravibot._kinect.stream"""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self._dir.name, "rec.txt")
+        self.grid = WorkspaceGrid([0.0, 1.0], [0.0, 1.0], [0.0, 1.0], 0.5)
+        write_recording(
+            self.file_name,
+            [(0.2, 0.2, 0.2), None, (0.7, 0.2, 0.2), (0.2, 0.7, 0.2), None],
+        )
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_parser(self):
+        """when the lines of a recording are fed,
+        should return the same frames as parse_kinect_text"""
+        parser = KinectStreamParser()
+        frames = []
+        with open(self.file_name, "r", encoding="utf-8") as f:
+            for line in f:
+                frame_data = parser.feed(line.rstrip("\n"))
+                if frame_data is not None:
+                    frames.append(frame_data)
+
+        frame, time, joints = parse_kinect_text(self.file_name)
+        self.assertTrue(parser.finished)
+        self.assertEqual([f[0] for f in frames], frame.tolist())
+        self.assertEqual([f[1] for f in frames], time.tolist())
+        self.assertTrue(np.allclose(np.stack([f[2] for f in frames]), joints))
+
+    def test_pipeline(self):
+        """when a recording is replayed through the server,
+        should publish snapshots and end with the offline sweep space"""
+        snapshots = []
+
+        async def main():
+            server = await start_kinect_replay_server(self.file_name, speed=100.0)
+            port = server.sockets[0].getsockname()[1]
+            pipeline = KinectStreamPipeline(
+                SweepSpaceAccumulator(self.grid),
+                queue_size=1,
+                on_snapshot=lambda n, t, p: snapshots.append((n, p.copy())),
+            )
+            async with server:
+                await pipeline.connect("127.0.0.1", port)
+            return pipeline
+
+        pipeline = asyncio.run(main())
+
+        _, _, joints = parse_kinect_text(self.file_name)
+        expected = compute_sweep_space(joints, self.grid)
+        self.assertTrue(np.allclose(snapshots[-1][1], expected))
+        self.assertEqual(snapshots[-1][0], 3)
+        self.assertEqual(
+            pipeline.latency.count + pipeline.dropped_snapshot_num, len(joints)
+        )
+
+    def test_trans(self):
+        """when trans is given,
+        should update the sweep space in the transformed coordinates"""
+        trans = np.eye(4)
+        trans[:3, 3] = [0.5, 0.0, 0.0]
+
+        async def main():
+            server = await start_kinect_replay_server(self.file_name, speed=100.0)
+            port = server.sockets[0].getsockname()[1]
+            pipeline = KinectStreamPipeline(
+                SweepSpaceAccumulator(self.grid), trans=trans
+            )
+            async with server:
+                await pipeline.connect("127.0.0.1", port)
+            return pipeline
+
+        pipeline = asyncio.run(main())
+        probability = pipeline.accumulator.get_probability()
+        self.assertAlmostEqual(probability[1, 0, 0], 20.0 / 3.0)
+        self.assertAlmostEqual(probability[1, 1, 0], 20.0 / 3.0)
+
+    def test_invalid_speed(self):
+        """when speed is not positive,
+        should raise ValueError"""
+        with self.assertRaises(ValueError):
+            asyncio.run(start_kinect_replay_server(self.file_name, speed=0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
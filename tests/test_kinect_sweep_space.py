@@ -0,0 +1,136 @@
+"""provide test cases for gravibot._kinect.sweep_space"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.sweep_space import (
+        compute_sweep_space,
+        compute_bone_sweep_space,
+    )
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.sweep_space import (
+        compute_sweep_space,
+        compute_bone_sweep_space,
+    )
+
+
+WORKSPACE_X = [-0.5, 0.5]
+WORKSPACE_Y = [-1.0, 0.0]
+WORKSPACE_Z = [0.5, 1.5]
+GRID_SIZE = 0.1
+
+
+def compute_sweep_space_loop(joints: np.ndarray) -> np.ndarray:
+    """reference implementation with python loops"""
+    ret = np.zeros((10, 10, 10))
+    for frame in joints:
+        for x, y, z in frame:
+            if (
+                x < WORKSPACE_X[0]
+                or x >= WORKSPACE_X[1]
+                or y < WORKSPACE_Y[0]
+                or y >= WORKSPACE_Y[1]
+                or z < WORKSPACE_Z[0]
+                or z >= WORKSPACE_Z[1]
+            ):
+                continue
+            x_idx = int((x - WORKSPACE_X[0]) / GRID_SIZE)
+            y_idx = int((y - WORKSPACE_Y[0]) / GRID_SIZE)
+            z_idx = int((z - WORKSPACE_Z[0]) / GRID_SIZE)
+            ret[x_idx, y_idx, z_idx] += 1
+    return ret / float(len(joints))
+
+
+class TestKinectSweepSpace(unittest.TestCase):
+    """test class of gravibot._kinect.sweep_space"""
+
+    def setUp(self):
+        self.grid = WorkspaceGrid(WORKSPACE_X, WORKSPACE_Y, WORKSPACE_Z, GRID_SIZE)
+        rng = np.random.default_rng(0)
+        self.joints = rng.uniform([-1.0, -1.5, 0.0], [1.0, 0.5, 2.0], (50, 20, 3))
+
+    def test_grid_shape(self):
+        """when the workspace is 1m cube and grid_size is 0.1,
+        should have 10x10x10 voxels"""
+        self.assertEqual(self.grid.shape, (10, 10, 10))
+        self.assertEqual(self.grid.size, 1000)
+
+    def test_compute_sweep_space(self):
+        """when random joints are given,
+        should return the same probability as the loop implementation"""
+        expected = compute_sweep_space_loop(self.joints)
+        self.assertTrue(
+            np.allclose(compute_sweep_space(self.joints, self.grid), expected)
+        )
+
+    def test_compute_sweep_space_parallel(self):
+        """when workers is given,
+        should return the same result as the single process"""
+        expected = compute_sweep_space(self.joints, self.grid)
+        actual = compute_sweep_space(self.joints, self.grid, workers=2, chunk_size=16)
+        self.assertTrue(np.allclose(actual, expected))
+
+    def test_boundary(self):
+        """when a joint is on the upper boundary,
+        should be counted in the last voxel"""
+        joints = np.array([[[0.5, 0.0, 1.5]] * 20])
+        ret = compute_sweep_space(joints, self.grid)
+        self.assertEqual(ret[9, 9, 9], 20.0)
+
+    def test_empty(self):
+        """when no frame is given,
+        should raise ValueError"""
+        with self.assertRaises(ValueError):
+            compute_sweep_space(np.zeros((0, 20, 3)), self.grid)
+
+    def test_compute_bone_sweep_space(self):
+        """when random joints are given,
+        should mark the voxels whose center is within radius of a bone"""
+        radius = 0.12
+        centers = np.stack(
+            np.meshgrid(*[np.arange(10) * 0.1 + 0.05] * 3, indexing="ij"), axis=-1
+        ) + [-0.5, -1.0, 0.5]
+        expected = np.zeros((10, 10, 10))
+        for frame in self.joints[:5]:
+            occupied = np.zeros((10, 10, 10), dtype=bool)
+            for i, j in [(0, 1), (1, 2), (3, 4)]:
+                a, b = frame[i], frame[j]
+                t = np.clip(((centers - a) @ (b - a)) / ((b - a) @ (b - a)), 0, 1)
+                dist = np.linalg.norm(centers - (a + t[..., None] * (b - a)), axis=-1)
+                occupied |= dist <= radius
+            expected += occupied
+        expected /= 5.0
+
+        actual = compute_bone_sweep_space(
+            self.joints[:5], self.grid, radius, connection=[(0, 1), (1, 2), (3, 4)]
+        )
+        self.assertTrue(np.allclose(actual, expected))
+
+    def test_bone_fills_gap(self):
+        """when a bone is longer than a voxel,
+        should mark the voxels between the joints"""
+        joints = np.zeros((1, 20, 3))
+        joints[0, :] = [-0.45, -0.55, 1.05]
+        joints[0, 1] = [0.45, -0.55, 1.05]
+        actual = compute_bone_sweep_space(joints, self.grid, 0.05)
+        self.assertTrue((actual[:, 4, 5] == 1.0).all())
+        self.assertEqual(actual.sum(), 10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
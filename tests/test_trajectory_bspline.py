@@ -0,0 +1,95 @@
+"""provide test cases for gravibot._trajectory.bspline"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._trajectory.bspline import (
+        get_bspline_knots,
+        get_bspline_basis,
+        fit_bspline_control,
+    )
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._trajectory.bspline import (
+        get_bspline_knots,
+        get_bspline_basis,
+        fit_bspline_control,
+    )
+
+
+class TestBspline(unittest.TestCase):
+    """test class of gravibot._trajectory.bspline"""
+
+    def test_knots(self):
+        """when the knots are made,
+        should repeat both ends degree + 1 times"""
+        knots = get_bspline_knots(6, 3)
+
+        self.assertEqual(knots.shape, (10,))
+        self.assertTrue(np.allclose(knots[:4], 0.0))
+        self.assertTrue(np.allclose(knots[-4:], 1.0))
+        self.assertTrue(np.allclose(knots[3:7], [0.0, 1 / 3, 2 / 3, 1.0]))
+
+    def test_basis(self):
+        """when the basis matrix is made,
+        should be a partition of unity clamped at both ends"""
+        basis = get_bspline_basis(50, 10, 3)
+
+        self.assertEqual(basis.shape, (50, 10))
+        self.assertTrue(np.all(basis >= 0.0))
+        self.assertTrue(np.allclose(basis.sum(axis=1), 1.0))
+        self.assertTrue(np.allclose(basis[0], np.eye(10)[0]))
+        self.assertTrue(np.allclose(basis[-1], np.eye(10)[-1]))
+        # 各時刻で0でない基底は次数 + 1 個以下
+        self.assertTrue(np.all(np.count_nonzero(basis, axis=1) <= 4))
+
+    def test_derivative(self):
+        """when the derivative basis is made,
+        should match the finite difference per time step"""
+        control = np.random.default_rng(0).uniform(-1.0, 1.0, 8)
+        fine = get_bspline_basis(4901, 8, 3) @ control
+        velocity = get_bspline_basis(50, 8, 3, 1) @ control
+        numerical = np.gradient(fine)[::100] * 100
+
+        self.assertTrue(np.allclose(velocity[1:-1], numerical[1:-1], atol=1e-5))
+        self.assertTrue(np.allclose(get_bspline_basis(50, 8, 3, 4), 0.0))
+
+    def test_fit(self):
+        """when a B-spline trajectory is fitted,
+        should recover its control points"""
+        control = np.random.default_rng(1).uniform(-1.0, 1.0, (3, 8))
+        theta = (get_bspline_basis(40, 8, 3) @ control.T).T
+
+        self.assertTrue(np.allclose(fit_bspline_control(theta, 8, 3), control))
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(ValueError):
+            get_bspline_knots(3, 3)
+        with self.assertRaises(ValueError):
+            get_bspline_knots(5, 0)
+        with self.assertRaises(ValueError):
+            get_bspline_basis(1, 5)
+        with self.assertRaises(ValueError):
+            get_bspline_basis(10, 5, 3, -1)
+        with self.assertRaises(TypeError):
+            get_bspline_basis(10, 5.0)
+        with self.assertRaises(ValueError):
+            fit_bspline_control(np.zeros(10), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""provide test cases for gravibot._trajectory.collocation"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._trajectory.collocation import CollocationOptimizer
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._trajectory.collocation import CollocationOptimizer
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+
+
+TIME_NUM = 20
+START = [-np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+GOAL = [np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+
+
+def get_states(result):
+    """決定変数を 時刻 x (角度, 速度, 加速度) x 関節 に並べ替える"""
+    return result.x.reshape(TIME_NUM, 3, 4)
+
+
+class TestCollocationOptimizer(unittest.TestCase):
+    """test class of gravibot._trajectory.collocation"""
+
+    def setUp(self):
+        self.robot = make_robot()
+        self.optimizer = CollocationOptimizer(
+            self.robot, TIME_NUM, bounds=(-np.pi, np.pi)
+        )
+
+    def test_dynamics(self):
+        """when the trajectory is optimized,
+        should satisfy the collocation dynamics and the boundary states"""
+        result = self.optimizer.solve(START, GOAL)
+        states = get_states(result)
+        theta, dtheta, ddtheta = states[:, 0], states[:, 1], states[:, 2]
+
+        self.assertTrue(result.success)
+        self.assertTrue(np.allclose(result.theta, theta.T))
+        self.assertTrue(np.allclose(theta[0], START) and np.allclose(theta[-1], GOAL))
+        self.assertTrue(np.allclose(states[[0, -1], 1:], 0.0))
+        self.assertTrue(
+            np.allclose(np.diff(theta, axis=0), (dtheta[1:] + dtheta[:-1]) / 2)
+        )
+        self.assertTrue(
+            np.allclose(np.diff(dtheta, axis=0), (ddtheta[1:] + ddtheta[:-1]) / 2)
+        )
+
+        # 有限差分の定式化と同程度の軌道になる
+        expected = TrajectoryOptimizer(
+            self.robot, TIME_NUM, bounds=(-np.pi, np.pi)
+        ).solve(START, GOAL)
+        self.assertTrue(np.allclose(result.theta, expected.theta, atol=0.1))
+
+    def test_start_motion(self):
+        """when the same start velocity and acceleration are given,
+        should use the forward differences as TrajectoryOptimizer"""
+        velocity = np.array([0.05, 0.0, -0.02, 0.01])
+        acceleration = np.array([0.0, 0.01, 0.0, -0.005])
+        kwargs = dict(start_velocity=velocity, start_acceleration=acceleration)
+        result = self.optimizer.solve(START, GOAL, **kwargs)
+        expected = TrajectoryOptimizer(
+            self.robot, TIME_NUM, bounds=(-np.pi, np.pi)
+        ).solve(START, GOAL, **kwargs)
+
+        self.assertTrue(result.success)
+        for theta in (result.theta, expected.theta):
+            self.assertTrue(np.allclose(theta[:, 1] - theta[:, 0], velocity))
+            self.assertTrue(np.allclose(np.diff(theta, 2)[:, 0], acceleration))
+            self.assertTrue(np.allclose(theta[:, -3:], np.array(GOAL)[:, None]))
+        self.assertTrue(np.allclose(result.theta[:, :3], expected.theta[:, :3]))
+
+        # 固定した状態は台形則を満たす
+        states = get_states(result)
+        self.assertTrue(
+            np.allclose(states[1, 0] - states[0, 0], (states[1, 1] + states[0, 1]) / 2)
+        )
+
+    def test_sparsity(self):
+        """when the solver is built,
+        should have a banded constraint Jacobian"""
+        jacobian = self.optimizer.solver.get_function("nlp_jac_g").sparsity_out(1)
+        rows, cols = jacobian.get_triplet()
+        stage = np.array(cols) // 12 - np.array(rows) // 8
+
+        self.assertEqual(jacobian.shape, (8 * (TIME_NUM - 1), 12 * TIME_NUM))
+        self.assertTrue(np.all((stage == 0) | (stage == 1)))
+
+    def test_bounds(self):
+        """when the velocity and acceleration bounds are given,
+        should keep the states within them"""
+        states = get_states(self.optimizer.solve(START, GOAL))
+        velocity_bound = 0.9 * np.abs(states[:, 1]).max()
+        acceleration_bound = 1.5 * np.abs(states[:, 2]).max()
+        optimizer = CollocationOptimizer(
+            self.robot,
+            TIME_NUM,
+            bounds=(-np.pi, np.pi),
+            velocity_bound=velocity_bound,
+            acceleration_bound=acceleration_bound,
+        )
+        result = optimizer.solve(START, GOAL)
+        states = get_states(result)
+
+        self.assertTrue(result.success)
+        self.assertEqual(optimizer.velocity_bound, velocity_bound)
+        self.assertTrue(np.all(np.abs(states[:, 1]) <= velocity_bound + 1e-6))
+        self.assertTrue(np.all(np.abs(states[:, 2]) <= acceleration_bound + 1e-6))
+        self.assertTrue(np.allclose(result.theta[:, -1], GOAL))
+
+    def test_relay_and_warm_start(self):
+        """when a relay point and a warm start are given,
+        should pass the relay point from the given initial trajectory"""
+        optimizer = CollocationOptimizer(
+            self.robot, TIME_NUM, relay_steps=[TIME_NUM // 2], bounds=(-np.pi, np.pi)
+        )
+        relay = [0.3, 0.0, 0.0, 0.0]
+        first = optimizer.solve(START, GOAL, relay_points=[relay])
+        second = optimizer.solve(
+            START, GOAL, relay_points=[relay], warm_start=first.theta
+        )
+
+        self.assertTrue(np.allclose(first.theta[:, TIME_NUM // 2], relay))
+        self.assertTrue(np.allclose(first.theta, second.theta, atol=1e-6))
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(ValueError):
+            CollocationOptimizer(self.robot, TIME_NUM, velocity_bound=0.0)
+        with self.assertRaises(ValueError):
+            self.optimizer.solve(START, GOAL, warm_start=np.zeros(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
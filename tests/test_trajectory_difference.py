@@ -0,0 +1,97 @@
+"""provide test cases for gravibot._trajectory.difference"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+import casadi as cs  # type: ignore
+
+try:
+    from gravibot._trajectory.difference import (
+        get_difference_matrix,
+        get_delta,
+        get_start_data,
+        get_end_data,
+        get_result,
+    )
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._trajectory.difference import (
+        get_difference_matrix,
+        get_delta,
+        get_start_data,
+        get_end_data,
+        get_result,
+    )
+
+
+LENGTH = 7
+DIM = 3
+
+
+def get_delta_loop(theta: np.ndarray, length: int, dim: int) -> np.ndarray:
+    """reference implementation with python loops"""
+    return np.array(
+        [theta[i] - theta[i - 1] for i in range(length * dim) if i % length]
+    )
+
+
+class TestTrajectoryDifference(unittest.TestCase):
+    """test class of gravibot._trajectory.difference"""
+
+    def setUp(self):
+        self.theta = np.random.default_rng(0).random(LENGTH * DIM)
+        self.theta_mx = cs.MX.sym("theta", LENGTH * DIM)
+
+    def evaluate(self, expr: cs.MX) -> np.ndarray:
+        """evaluate a CasADi expression of theta_mx"""
+        return np.array(cs.Function("f", [self.theta_mx], [expr])(self.theta)).ravel()
+
+    def test_delta(self):
+        """when the delta is applied repeatedly,
+        should return the same result as the loop implementation"""
+        expected = self.theta
+        for order in range(1, 4):
+            expected = get_delta_loop(expected, LENGTH - order + 1, DIM)
+            actual = self.evaluate(get_delta(self.theta_mx, LENGTH, DIM, order))
+            self.assertTrue(np.allclose(actual, expected))
+            self.assertTrue(
+                np.allclose(get_delta(self.theta, LENGTH, DIM, order), expected)
+            )
+
+    def test_difference_matrix(self):
+        """when the jerk matrix is generated,
+        should have 4 nonzeros per row"""
+        diff_mat = get_difference_matrix(LENGTH, DIM, 3)
+        self.assertEqual(diff_mat.shape, ((LENGTH - 3) * DIM, LENGTH * DIM))
+        self.assertEqual(diff_mat.nnz(), (LENGTH - 3) * DIM * 4)
+
+    def test_start_end(self):
+        """when the start and end data are taken,
+        should return the first and last values of each joint"""
+        theta = self.theta.reshape(DIM, LENGTH)
+        start = self.evaluate(get_start_data(self.theta_mx, LENGTH, DIM))
+        end = self.evaluate(get_end_data(self.theta_mx, LENGTH, DIM))
+        self.assertTrue(np.array_equal(start, theta[:, 0]))
+        self.assertTrue(np.array_equal(end, theta[:, -1]))
+
+    def test_result(self):
+        """when the solver result is given,
+        should reshape it to joints x time"""
+        actual = get_result(cs.DM(self.theta), LENGTH, DIM)
+        self.assertEqual(actual.shape, (DIM, LENGTH))
+        self.assertEqual(actual[1, 2], self.theta[LENGTH + 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
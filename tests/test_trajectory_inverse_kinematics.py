@@ -0,0 +1,118 @@
+"""provide test cases for gravibot._trajectory.inverse_kinematics"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._robot import LinkParam, RobotParam
+    from gravibot._trajectory.inverse_kinematics import InverseKinematicsSolver
+    from gravibot.robot import Robot
+    from tests._robots import make_robot
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._robot import LinkParam, RobotParam
+    from gravibot._trajectory.inverse_kinematics import InverseKinematicsSolver
+    from gravibot.robot import Robot
+    from tests._robots import make_robot
+
+
+class TestInverseKinematicsSolver(unittest.TestCase):
+    """test class of gravibot._trajectory.inverse_kinematics"""
+
+    def setUp(self):
+        self.robot = make_robot()
+        self.solver = InverseKinematicsSolver(self.robot, bounds=(-np.pi, np.pi))
+
+    def get_position(self, theta):
+        """順運動学で手先の位置を求める"""
+        for i, val in enumerate(theta):
+            self.robot.set_theta(i, float(val))
+        return np.asarray(
+            self.robot.get_joint_pos(self.robot.get_link_num() - 1), dtype=np.float64
+        ).reshape(-1)
+
+    def test_reach_targets(self):
+        """when reachable targets are given one after another,
+        should reach all of them with the same solver"""
+        solver = self.solver.solver
+        for theta in ([0.3, 0.5, -0.4, 0.2], [-0.8, 0.2, 0.6, -0.3]):
+            target = self.get_position(theta)
+            result = self.solver.solve(target, initial=np.zeros(4))
+
+            self.assertTrue(result.success)
+            self.assertTrue(np.allclose(result.position, target, atol=1e-4))
+            self.assertTrue(
+                np.allclose(self.get_position(result.theta), target, atol=1e-4)
+            )
+        self.assertIs(self.solver.solver, solver)
+
+    def test_regularization(self):
+        """when the regularization weight is large,
+        should stay near the reference angles"""
+        target = self.get_position([0.3, 0.5, -0.4, 0.2])
+        reference = np.array([-0.5, 0.0, 0.0, 0.0])
+
+        self.solver.set_regularization(1e6)
+        result = self.solver.solve(target, reference=reference)
+
+        self.assertEqual(self.solver.regularization, 1e6)
+        self.assertTrue(np.allclose(result.theta, reference, atol=1e-2))
+
+    def test_joint_index(self):
+        """when the joint index is omitted or given,
+        should count the movable joints and default to the end effector"""
+        self.assertIsNone(self.solver.joint_index)
+
+        # 固定リンクで始まるロボットでも，既定では手先を目標に合わせる
+        param = RobotParam()
+        param.add_link(LinkParam(a=0.0, alpha=0.0, d=5.0, min_val=0.0, max_val=0.0))
+        param.add_link(LinkParam(a=0.0, alpha=np.pi / 2.0, d=10.0))
+        param.add_link(LinkParam(a=10.0, alpha=0.0, d=0.0))
+        param.add_link(LinkParam(a=10.0, alpha=0.0, d=0.0))
+        param.add_link(LinkParam(a=3.0, alpha=0.0, d=0.0, min_val=0.0, max_val=0.0))
+        robot = Robot(param)
+        theta = [0.3, 0.5, -0.4]
+        for i, val in enumerate(theta):
+            robot.set_theta(i, val)
+        tip = np.asarray(robot.get_joint_pos(4), dtype=np.float64).reshape(-1)
+        elbow = np.asarray(robot.get_joint_pos(2), dtype=np.float64).reshape(-1)
+
+        result = InverseKinematicsSolver(robot).solve(tip, initial=np.zeros(3))
+        self.assertTrue(result.success)
+        self.assertTrue(np.allclose(result.position, tip, atol=1e-4))
+        # 2番目の可動関節のリンクの先端は，固定リンクを数える get_joint_pos では2
+        result = InverseKinematicsSolver(robot, joint_index=2).solve(
+            elbow, initial=np.zeros(3)
+        )
+        self.assertTrue(np.allclose(result.position, elbow, atol=1e-4))
+
+        for joint_index in (0, 4):
+            with self.assertRaises(ValueError):
+                InverseKinematicsSolver(robot, joint_index=joint_index)
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(TypeError):
+            InverseKinematicsSolver(None)
+        with self.assertRaises(ValueError):
+            self.solver.solve([0.0, 0.0])
+        with self.assertRaises(ValueError):
+            self.solver.solve([0.0, 0.0, 0.0], initial=np.zeros(3))
+        with self.assertRaises(ValueError):
+            self.solver.set_regularization(-1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""provide test cases for gravibot._trajectory.mpc"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._trajectory.mpc import RecedingHorizonPlanner, RecedingHorizonStep
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._trajectory.mpc import RecedingHorizonPlanner, RecedingHorizonStep
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+
+
+HORIZON = 15
+START = [-np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+GOAL = [np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+
+
+class TestRecedingHorizonPlanner(unittest.TestCase):
+    """test class of gravibot._trajectory.mpc"""
+
+    def setUp(self):
+        self.optimizer = TrajectoryOptimizer(
+            make_robot(),
+            HORIZON,
+            bounds=(-np.pi, np.pi),
+            closed_form=False,
+            solver_options={"ipopt.max_wall_time": 1.0},
+        )
+        self.planner = RecedingHorizonPlanner(self.optimizer, deadline=1.0, shift=2)
+        self.planner.reset(START)
+
+    def test_replanning(self):
+        """when the planner is stepped repeatedly,
+        should continue the previous plan and reach the goal"""
+        previous = self.planner.plan
+        for _ in range(2 * HORIZON):
+            step = self.planner.step(GOAL)
+
+            self.assertIsInstance(step, RecedingHorizonStep)
+            self.assertFalse(step.fallback)
+            # 角度，速度，加速度が前回の計画から連続する
+            self.assertTrue(np.allclose(step.plan[:, :3], previous[:, 2:5], atol=1e-6))
+            self.assertTrue(np.allclose(step.plan[:, -1], GOAL, atol=1e-6))
+            previous = step.plan
+
+        self.assertTrue(np.allclose(previous, np.array(GOAL)[:, None], atol=1e-6))
+        self.assertEqual(self.planner.latency.count, 2 * HORIZON)
+        self.assertEqual(self.planner.fallback_num, 0)
+
+    def test_fallback(self):
+        """when the deadline is exceeded,
+        should keep the shifted previous plan"""
+        # IPOPTは期限で止まり，収束しない
+        optimizer = TrajectoryOptimizer(
+            make_robot(),
+            HORIZON,
+            bounds=(-np.pi, np.pi),
+            closed_form=False,
+            solver_options={"ipopt.max_wall_time": 1e-9},
+        )
+        planner = RecedingHorizonPlanner(optimizer, deadline=1e-9, shift=2)
+        planner.reset(START)
+        step = planner.step(GOAL)
+
+        self.assertTrue(step.timed_out)
+        self.assertTrue(step.fallback)
+        self.assertIsNotNone(step.result)
+        self.assertFalse(step.result.success)
+        self.assertEqual(planner.fallback_num, 1)
+        self.assertTrue(np.allclose(step.plan, np.array(START)[:, None]))
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(TypeError):
+            RecedingHorizonPlanner(None)
+        with self.assertRaises(ValueError):
+            RecedingHorizonPlanner(self.optimizer, deadline=0.0)
+        with self.assertRaises(ValueError):
+            RecedingHorizonPlanner(self.optimizer, deadline=1.0, shift=HORIZON - 2)
+        with self.assertRaises(ValueError):
+            RecedingHorizonPlanner(self.optimizer, deadline=1.0).step(GOAL)
+        with self.assertRaises(ValueError):
+            # ソルバの期限が周期の期限より長い
+            RecedingHorizonPlanner(self.optimizer, deadline=0.5)
+        with self.assertRaises(ValueError):
+            RecedingHorizonPlanner(
+                TrajectoryOptimizer(make_robot(), HORIZON), deadline=1.0
+            )
+        with self.assertRaises(ValueError):
+            self.planner.reset(START[:3])
+
+
+if __name__ == "__main__":
+    unittest.main()
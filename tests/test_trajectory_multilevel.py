@@ -0,0 +1,133 @@
+"""provide test cases for gravibot._trajectory.multilevel"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.risk_grid import TimeVaryingRiskGrid
+    from gravibot._trajectory.multilevel import (
+        CoarseToFineOptimizer,
+        CoarseToFineResult,
+        get_default_schedule,
+    )
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.risk_grid import TimeVaryingRiskGrid
+    from gravibot._trajectory.multilevel import (
+        CoarseToFineOptimizer,
+        CoarseToFineResult,
+    )
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+
+
+TIME_NUM = 17
+START = [-np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+GOAL = [np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+
+
+def make_risk_grid() -> TimeVaryingRiskGrid:
+    """ロボットの前方に危険度の山がある静的な危険度を作成"""
+    grid = WorkspaceGrid([-32.0, 32.0], [-32.0, 32.0], [-8.0, 32.0], 4.0)
+    center = (np.stack(np.indices(grid.shape), axis=-1) + 0.5) * 4.0 + grid.min_pos
+    risk = np.exp(-np.sum((center - [0.0, 18.0, 15.0]) ** 2, axis=-1) / 72.0)
+    return TimeVaryingRiskGrid(grid, risk[None], 0.1)
+
+
+class TestCoarseToFineOptimizer(unittest.TestCase):
+    """test class of gravibot._trajectory.multilevel"""
+
+    def setUp(self):
+        self.robot = make_robot()
+
+    def test_levels(self):
+        """when the schedule is given,
+        should solve each level and return the solution of the original problem"""
+        optimizer = CoarseToFineOptimizer(self.robot, TIME_NUM, bounds=(-np.pi, np.pi))
+        result = optimizer.solve(START, GOAL)
+        expected = TrajectoryOptimizer(
+            self.robot, TIME_NUM, bounds=(-np.pi, np.pi)
+        ).solve(START, GOAL)
+
+        self.assertIsInstance(result, CoarseToFineResult)
+        self.assertEqual(optimizer.schedule, [(4, 4), (2, 2), (1, 1)])
+        self.assertEqual([o.time_num for o in optimizer.optimizers], [5, 9, 17])
+        self.assertEqual(len(result.level_results), 3)
+        self.assertIs(result.result, result.level_results[-1])
+        self.assertTrue(np.allclose(result.result.theta, expected.theta))
+
+    def test_default_schedule(self):
+        """when time_num or relay steps do not fit the default time factors,
+        should reduce the time factors and keep the grid factors"""
+        self.assertEqual(get_default_schedule(17), [(4, 4), (2, 2), (1, 1)])
+        self.assertEqual(get_default_schedule(50), [(1, 4), (1, 2), (1, 1)])
+        self.assertEqual(get_default_schedule(19), [(2, 4), (2, 2), (1, 1)])
+        self.assertEqual(get_default_schedule(9), [(2, 4), (2, 2), (1, 1)])
+        self.assertEqual(
+            get_default_schedule(17, relay_steps=[6]), [(2, 4), (2, 2), (1, 1)]
+        )
+
+        optimizer = CoarseToFineOptimizer(self.robot, 50, relay_steps=[25])
+        self.assertEqual(optimizer.schedule, [(1, 4), (1, 2), (1, 1)])
+        self.assertEqual([o.time_num for o in optimizer.optimizers], [50, 50, 50])
+
+    def test_risk_grid(self):
+        """when the risk grid is given,
+        should reach the optimum of the fine problem from the coarse levels"""
+        kwargs = dict(
+            smooth_weight=1e-2, risk_grid=make_risk_grid(), bounds=(-np.pi, np.pi)
+        )
+        optimizer = CoarseToFineOptimizer(
+            self.robot, TIME_NUM, schedule=[(2, 2), (1, 1)], **kwargs
+        )
+        result = optimizer.solve(START, GOAL)
+        expected = TrajectoryOptimizer(self.robot, TIME_NUM, **kwargs).solve(
+            START, GOAL
+        )
+
+        self.assertTrue(result.result.success)
+        self.assertEqual(optimizer.optimizers[0].weights["risk_weight"], 2.0)
+        self.assertLessEqual(result.result.cost, expected.cost * 1.01)
+
+        # 細かい危険度を更新すると，粗くした危険度が各段階に反映される
+        optimizer.set_risk_grid(make_risk_grid())
+        optimizer.set_weights(smooth_weight=1.0)
+        self.assertEqual(optimizer.weights["smooth_weight"], 1.0)
+        self.assertEqual(optimizer.optimizers[0].weights["smooth_weight"], 1.0 / 32)
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(ValueError):
+            CoarseToFineOptimizer(self.robot, TIME_NUM, schedule=[(2, 2)])
+        with self.assertRaises(ValueError):
+            CoarseToFineOptimizer(
+                self.robot, TIME_NUM, schedule=[(4, 1), (3, 1), (1, 1)]
+            )
+        with self.assertRaises(ValueError):
+            CoarseToFineOptimizer(self.robot, 18, schedule=[(2, 1), (1, 1)])
+        with self.assertRaises(ValueError):
+            CoarseToFineOptimizer(
+                self.robot, TIME_NUM, schedule=[(2, 2), (1, 1)], relay_steps=[5]
+            )
+        with self.assertRaises(TypeError):
+            CoarseToFineOptimizer(self.robot, TIME_NUM, schedule=[(2.0, 1), (1, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""provide test cases for gravibot._trajectory.multistart"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._trajectory.multistart import MultistartOptimizer
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._trajectory.multistart import MultistartOptimizer
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+
+
+TIME_NUM = 10
+START = [-np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+GOAL = [np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+
+
+class TestMultistartOptimizer(unittest.TestCase):
+    """test class of gravibot._trajectory.multistart"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.optimizer = TrajectoryOptimizer(
+            make_robot(), TIME_NUM, bounds=(-np.pi, np.pi)
+        )
+        cls.multistart = MultistartOptimizer(cls.optimizer, max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.multistart.close()
+
+    def test_solve_all(self):
+        """when no target cost is given,
+        should solve every start and return the best one"""
+        library = [self.optimizer.get_initial_guess(START, GOAL)]
+        result = self.multistart.solve(
+            START, GOAL, random_num=2, library=library, rng=np.random.default_rng(0)
+        )
+
+        self.assertEqual(
+            result.seed_names, ["linear", "min_jerk", "library0", "random0", "random1"]
+        )
+        self.assertTrue(all(r is not None for r in result.results))
+        self.assertTrue(result.best.success)
+        self.assertEqual(
+            result.best.cost, min(r.cost for r in result.results if r.success)
+        )
+        self.assertAlmostEqual(
+            result.best.cost, self.optimizer.solve(START, GOAL).cost, 6
+        )
+
+    def test_target_cost(self):
+        """when the target cost is reached,
+        should cancel the starts that have not begun"""
+        result = self.multistart.solve(
+            START, GOAL, random_num=16, target_cost=np.inf, rng=np.random.default_rng(0)
+        )
+
+        self.assertIsNotNone(result.best)
+        self.assertTrue(result.best.success)
+        self.assertIn(None, result.results)
+
+    def test_weights(self):
+        """when the weights of the optimizer are changed,
+        should solve with the new weights in the workers"""
+        before = self.multistart.solve(START, GOAL, random_num=0).best.cost
+
+        self.optimizer.set_weights(smooth_weight=2.0)
+        try:
+            after = self.multistart.solve(START, GOAL, random_num=0).best.cost
+        finally:
+            self.optimizer.set_weights(smooth_weight=1.0)
+
+        self.assertAlmostEqual(after, before * 2.0)
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(TypeError):
+            MultistartOptimizer(None)
+        with self.assertRaises(ValueError):
+            self.multistart.get_seeds(START, GOAL, random_num=-1)
+        with self.assertRaises(ValueError):
+            self.multistart.get_seeds(START, GOAL, library=[np.zeros(3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""provide test cases for gravibot._trajectory.obstacle"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+import casadi as cs  # type: ignore
+
+try:
+    from gravibot._trajectory.obstacle import (
+        get_obstacle_arrays,
+        get_reachable_obstacles,
+        get_obstacle_depth_function,
+        get_obstacle_constraints,
+    )
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._trajectory.obstacle import (
+        get_obstacle_arrays,
+        get_reachable_obstacles,
+        get_obstacle_depth_function,
+        get_obstacle_constraints,
+    )
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from tests._robots import make_robot
+
+
+TIME_NUM = 11
+START = [-np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+GOAL = [np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+
+
+class TestObstacle(unittest.TestCase):
+    """test class of gravibot._trajectory.obstacle"""
+
+    def test_arrays(self):
+        """when the obstacles are given as a list,
+        should stack the centers and the radii"""
+        centers, radii = get_obstacle_arrays([([1.0, 2.0, 3.0], 4.0), (np.ones(3), 2)])
+
+        self.assertTrue(np.allclose(centers, [[1.0, 2.0, 3.0], [1.0, 1.0, 1.0]]))
+        self.assertTrue(np.allclose(radii, [4.0, 2.0]))
+        self.assertEqual(get_obstacle_arrays([])[0].shape, (0, 3))
+
+    def test_reachable(self):
+        """when the obstacles are pruned,
+        should keep only those within the reach plus the radius and the buffer"""
+        robot = make_robot()
+        self.assertAlmostEqual(robot.get_reach(), 40.0)
+
+        centers = np.array(
+            [[20.0, 0.0, 10.0], [45.0, 0.0, 0.0], [0.0, 50.0, 0.0], [0.0, 0.0, -80.0]]
+        )
+        radii = np.array([1.0, 6.0, 9.0, 5.0])
+
+        self.assertEqual(list(get_reachable_obstacles(robot, centers, radii)), [0, 1])
+        self.assertEqual(
+            list(get_reachable_obstacles(robot, centers, radii, 2.0)), [0, 1, 2]
+        )
+
+    def test_depth(self):
+        """when the depth function is evaluated,
+        should return the deepest penetration of the points per obstacle"""
+        centers = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0]])
+        depth = get_obstacle_depth_function(centers, np.array([2.0, 1.0]), 2, 0.5)
+        points = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 5.0]]).T
+
+        self.assertTrue(np.allclose(np.array(depth(points)).ravel(), [1.5, -7.5]))
+
+    def test_constraints(self):
+        """when the constraints of all time steps are built,
+        should match the penetration computed joint by joint"""
+        robot = make_robot()
+        centers = np.array([[15.0, 0.0, 15.0], [0.0, 15.0, 20.0], [200.0, 0.0, 0.0]])
+        radii = np.array([5.0, 4.0, 10.0])
+        theta = cs.MX.sym("theta", 4 * TIME_NUM)
+        depth = get_obstacle_constraints(
+            robot, theta, TIME_NUM, centers, radii, buffer=0.5
+        )
+
+        # 届かない3つ目の障害物は除かれ，時刻ごとに2つの障害物が並ぶ
+        self.assertEqual(depth.shape, (2 * TIME_NUM, 1))
+
+        x = np.random.default_rng(0).uniform(-np.pi, np.pi, 4 * TIME_NUM)
+        actual = np.array(cs.Function("f", [theta], [depth])(x)).reshape(TIME_NUM, 2)
+        for t in range(TIME_NUM):
+            q = x.reshape(4, TIME_NUM)[:, t]
+            positions = np.hstack(
+                [np.array(robot.get_joint_pos_casadi(j, q)) for j in range(4)]
+            )
+            for i in range(2):
+                dist = np.linalg.norm(positions - centers[i].reshape(3, 1), axis=0)
+                self.assertAlmostEqual(actual[t, i], np.max(radii[i] + 0.5 - dist))
+
+    def test_optimizer_prunes(self):
+        """when all obstacles are out of reach,
+        should solve the same as without the obstacles"""
+        robot = make_robot()
+        far = [(np.array([100.0, 0.0, 0.0]), 5.0), (np.array([0.0, -90.0, 0.0]), 3.0)]
+
+        result = TrajectoryOptimizer(robot, TIME_NUM, obstacles=far).solve(START, GOAL)
+        expected = TrajectoryOptimizer(robot, TIME_NUM).solve(START, GOAL)
+
+        self.assertTrue(np.allclose(result.theta, expected.theta, atol=1e-6))
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        robot = make_robot()
+        with self.assertRaises(ValueError):
+            get_reachable_obstacles(robot, np.zeros((2, 2)), np.ones(2))
+        with self.assertRaises(ValueError):
+            get_reachable_obstacles(robot, np.zeros((2, 3)), np.ones(3))
+        with self.assertRaises(ValueError):
+            get_obstacle_depth_function(np.zeros((1, 3)), np.array([-1.0]), 2)
+        with self.assertRaises(TypeError):
+            get_reachable_obstacles(None, np.zeros((1, 3)), np.ones(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+"""provide test cases for gravibot._trajectory.optimizer"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.risk_grid import TimeVaryingRiskGrid
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer, TrajectoryResult
+    from tests._robots import make_robot
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._kinect.grid import WorkspaceGrid
+    from gravibot._kinect.risk_grid import TimeVaryingRiskGrid
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer, TrajectoryResult
+    from tests._robots import make_robot
+
+
+TIME_NUM = 10
+START = [-np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+GOAL = [np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+
+
+class TestTrajectoryOptimizer(unittest.TestCase):
+    """test class of gravibot._trajectory.optimizer"""
+
+    def setUp(self):
+        self.robot = make_robot()
+        self.optimizer = TrajectoryOptimizer(
+            self.robot, TIME_NUM, bounds=(-np.pi, np.pi)
+        )
+
+    def test_boundary_conditions(self):
+        """when the trajectory is optimized,
+        should start and end at the given angles at rest"""
+        result = self.optimizer.solve(START, GOAL)
+
+        self.assertIsInstance(result, TrajectoryResult)
+        self.assertTrue(result.success)
+        self.assertEqual(result.theta.shape, (4, TIME_NUM))
+        self.assertTrue(np.allclose(result.theta[:, 0], START, atol=1e-6))
+        self.assertTrue(np.allclose(result.theta[:, -1], GOAL, atol=1e-6))
+
+        velocity = np.diff(result.theta)
+        acceleration = np.diff(result.theta, 2)
+        self.assertTrue(np.allclose(velocity[:, [0, -1]], 0.0, atol=1e-6))
+        self.assertTrue(np.allclose(acceleration[:, [0, -1]], 0.0, atol=1e-6))
+
+    def test_solver_args(self):
+        """when the solver args are built and solved step by step,
+        should return the same result as solve without the closed form"""
+        optimizer = TrajectoryOptimizer(
+            self.robot, TIME_NUM, bounds=(-np.pi, np.pi), closed_form=False
+        )
+        args = optimizer.get_solver_args(START, GOAL)
+        with self.assertRaises(ValueError):
+            optimizer.call_solver(args)
+
+        optimizer.set_initial_point(args, optimizer.get_initial_guess(START, GOAL))
+        result = optimizer.call_solver(args)
+
+        self.assertTrue(result.success)
+        self.assertTrue(
+            np.allclose(result.theta, optimizer.solve(START, GOAL).theta, atol=1e-6)
+        )
+        with self.assertRaises(ValueError):
+            optimizer.get_solver_args(START[:3], GOAL)
+
+    def test_repeated_solve(self):
+        """when solve is called with other start and goal,
+        should reuse the solver and return the reversed trajectory"""
+        solver = self.optimizer.solver
+        forward = self.optimizer.solve(START, GOAL)
+        backward = self.optimizer.solve(GOAL, START)
+
+        self.assertIs(self.optimizer.solver, solver)
+        self.assertTrue(np.allclose(forward.theta, backward.theta[:, ::-1], atol=1e-5))
+
+    def test_warm_start(self):
+        """when the previous result is given as warm start,
+        should converge to the same trajectory"""
+        first = self.optimizer.solve(START, GOAL)
+        second = self.optimizer.solve(START, GOAL, warm_start=first)
+        third = self.optimizer.solve(START, GOAL, warm_start=first.theta)
+
+        self.assertTrue(second.success)
+        self.assertTrue(np.allclose(first.theta, second.theta, atol=1e-6))
+        self.assertTrue(np.allclose(first.theta, third.theta, atol=1e-6))
+
+    def test_risk_grid(self):
+        """when the risk grid is updated,
+        should use the new risk without rebuilding the solver"""
+        grid = WorkspaceGrid([-30.0, 30.0], [-10.0, 10.0], [0.0, 10.0], 10.0)
+        risk = np.zeros((1,) + grid.shape)
+        risk[0, 5] = 1.0
+        optimizer = TrajectoryOptimizer(
+            self.robot,
+            TIME_NUM,
+            smooth_weight=1e-4,
+            risk_grid=TimeVaryingRiskGrid(grid, risk, 0.1),
+            bounds=(-np.pi, np.pi),
+        )
+        solver = optimizer.solver
+        with_risk = optimizer.solve(START, GOAL)
+
+        optimizer.set_risk_grid(TimeVaryingRiskGrid(grid, np.zeros_like(risk), 0.1))
+        without_risk = optimizer.solve(START, GOAL)
+
+        self.assertIs(optimizer.solver, solver)
+        self.assertGreater(with_risk.cost, without_risk.cost)
+
+        # 形状が同じでも，ソルバに埋め込んだ範囲やボクセルの大きさが違う危険度は使えない
+        shifted = WorkspaceGrid([-20.0, 40.0], [-10.0, 10.0], [0.0, 10.0], 10.0)
+        scaled = WorkspaceGrid([-15.0, 15.0], [-5.0, 5.0], [0.0, 5.0], 5.0)
+        for other in (shifted, scaled):
+            self.assertEqual(other.shape, grid.shape)
+            with self.assertRaises(ValueError):
+                optimizer.set_risk_grid(TimeVaryingRiskGrid(other, risk, 0.1))
+        self.assertAlmostEqual(
+            without_risk.cost, self.optimizer.solve(START, GOAL).cost * 1e-4, 6
+        )
+
+    def test_relay_points(self):
+        """when a relay point is given or omitted,
+        should pass it only when given without rebuilding the solver"""
+        optimizer = TrajectoryOptimizer(
+            self.robot, TIME_NUM, relay_steps=[TIME_NUM // 2], bounds=(-np.pi, np.pi)
+        )
+        solver = optimizer.solver
+        relay = [0.3, 0.0, 0.0, 0.0]
+
+        free = optimizer.solve(START, GOAL)
+        through = optimizer.solve(START, GOAL, relay_points=[relay])
+        skipped = optimizer.solve(START, GOAL, relay_points=[None])
+
+        self.assertIs(optimizer.solver, solver)
+        self.assertEqual(optimizer.relay_steps, [TIME_NUM // 2])
+        self.assertTrue(np.allclose(through.theta[:, TIME_NUM // 2], relay, atol=1e-6))
+        self.assertGreater(through.cost, free.cost)
+        self.assertTrue(np.allclose(free.theta, skipped.theta, atol=1e-6))
+
+    def test_weights(self):
+        """when the smoothness weight is changed,
+        should scale the cost without rebuilding the solver"""
+        solver = self.optimizer.solver
+        cost = self.optimizer.solve(START, GOAL).cost
+
+        self.optimizer.set_weights(smooth_weight=2.0)
+        self.assertIs(self.optimizer.solver, solver)
+        self.assertEqual(self.optimizer.weights["smooth_weight"], 2.0)
+        self.assertEqual(self.optimizer.weights["risk_weight"], 1.0)
+        self.assertAlmostEqual(self.optimizer.solve(START, GOAL).cost, cost * 2.0)
+
+    def test_bspline(self):
+        """when control_num is given,
+        should optimize the control points and satisfy the same constraints"""
+        optimizer = TrajectoryOptimizer(
+            self.robot,
+            40,
+            relay_steps=[20],
+            control_num=10,
+            bounds=(-np.pi, np.pi),
+        )
+        relay = [0.3, 0.0, 0.0, 0.0]
+        result = optimizer.solve(START, GOAL, relay_points=[relay])
+
+        self.assertTrue(result.success)
+        self.assertEqual(optimizer.control_num, 10)
+        self.assertEqual(result.x.shape, (4 * 10,))
+        self.assertEqual(result.theta.shape, (4, 40))
+        self.assertTrue(np.allclose(result.theta[:, 0], START, atol=1e-6))
+        self.assertTrue(np.allclose(result.theta[:, -1], GOAL, atol=1e-6))
+        self.assertTrue(np.allclose(result.theta[:, 20], relay, atol=1e-6))
+        velocity = np.diff(result.theta)
+        self.assertTrue(np.allclose(velocity[:, [0, -1]], 0.0, atol=1e-6))
+
+        # 全時刻を決定変数とした解よりジャークは大きいが，同程度になる
+        full = TrajectoryOptimizer(
+            self.robot, 40, relay_steps=[20], bounds=(-np.pi, np.pi)
+        ).solve(START, GOAL, relay_points=[relay])
+        self.assertGreaterEqual(result.cost, full.cost - 1e-9)
+        self.assertTrue(np.allclose(result.theta, full.theta, atol=0.05))
+
+        # 軌道を初期値として渡すと制御点に直して使う
+        again = optimizer.solve(
+            START, GOAL, relay_points=[relay], warm_start=result.theta
+        )
+        self.assertTrue(np.allclose(again.theta, result.theta, atol=1e-6))
+
+    def test_eliminate_boundary(self):
+        """when the boundary variables are eliminated or constrained,
+        should return the same trajectory with fewer variables and constraints"""
+        kwargs = dict(relay_steps=[TIME_NUM // 2], closed_form=False)
+        relay = [0.3, 0.0, 0.0, 0.0]
+        eliminated = TrajectoryOptimizer(self.robot, TIME_NUM, **kwargs)
+        constrained = TrajectoryOptimizer(
+            self.robot, TIME_NUM, eliminate_boundary=False, **kwargs
+        )
+        reduced = eliminated.solve(START, GOAL, relay_points=[relay])
+        full = constrained.solve(START, GOAL, relay_points=[relay])
+
+        self.assertTrue(reduced.success)
+        self.assertEqual(reduced.x.shape, (4 * (TIME_NUM - 6),))
+        self.assertEqual(reduced.lam_g.shape, (4,))
+        self.assertEqual(eliminated.solver.size_in("x0"), (4 * (TIME_NUM - 6), 1))
+        self.assertEqual(eliminated.solver.size_in("lbg"), (4, 1))
+        self.assertEqual(full.x.shape, (4 * TIME_NUM,))
+        self.assertTrue(np.allclose(reduced.theta, full.theta, atol=1e-6))
+        self.assertAlmostEqual(reduced.cost, full.cost, 8)
+
+        # B-splineでは最初と最後の制御点を上下限で固定する
+        spline = TrajectoryOptimizer(self.robot, 40, control_num=10)
+        result = spline.solve(START, GOAL)
+        self.assertEqual(spline.solver.size_in("lbg"), (4 * 4, 1))
+        self.assertTrue(np.allclose(result.x[::10], START))
+        self.assertTrue(np.allclose(result.x[9::10], GOAL))
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(TypeError):
+            TrajectoryOptimizer(None, TIME_NUM)
+        with self.assertRaises(ValueError):
+            TrajectoryOptimizer(self.robot, 3)
+        with self.assertRaises(ValueError):
+            self.optimizer.solve(START[:3], GOAL)
+        with self.assertRaises(ValueError):
+            self.optimizer.solve(START, GOAL, warm_start=np.zeros(5))
+        with self.assertRaises(ValueError):
+            self.optimizer.set_risk_grid(None)
+        with self.assertRaises(ValueError):
+            self.optimizer.set_weights(smooth_weight=-1.0)
+        with self.assertRaises(ValueError):
+            self.optimizer.solve(START, GOAL, relay_points=[START])
+        with self.assertRaises(ValueError):
+            TrajectoryOptimizer(self.robot, TIME_NUM, relay_steps=[0])
+        with self.assertRaises(ValueError):
+            TrajectoryOptimizer(self.robot, TIME_NUM, control_num=TIME_NUM + 1)
+        with self.assertRaises(ValueError):
+            TrajectoryOptimizer(self.robot, TIME_NUM, control_num=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
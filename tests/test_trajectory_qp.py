@@ -0,0 +1,149 @@
+"""provide test cases for gravibot._trajectory.qp"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from gravibot._trajectory.qp import MinimumJerkQP
+    from tests._robots import make_robot
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer
+    from gravibot._trajectory.qp import MinimumJerkQP
+    from tests._robots import make_robot
+
+
+TIME_NUM = 20
+RELAY_STEP = TIME_NUM // 2
+START = [-np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+GOAL = [np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+RELAY = [0.3, 0.0, 0.0, 0.0]
+
+
+class TestMinimumJerkQP(unittest.TestCase):
+    """test class of gravibot._trajectory.qp"""
+
+    def setUp(self):
+        self.qp = MinimumJerkQP(TIME_NUM, [RELAY_STEP])
+
+    def test_same_as_ipopt(self):
+        """when the relay point is enabled or disabled,
+        should return the same solution and multipliers as IPOPT"""
+        optimizer = TrajectoryOptimizer(
+            make_robot(),
+            TIME_NUM,
+            smooth_weight=3.0,
+            relay_steps=[RELAY_STEP],
+            closed_form=False,
+            eliminate_boundary=False,
+        )
+        for relay_points in (None, [RELAY]):
+            expected = optimizer.solve(START, GOAL, relay_points=relay_points)
+            theta, lam_g = self.qp.solve(START, GOAL, relay_points, weight=3.0)
+
+            self.assertTrue(np.allclose(theta, expected.theta, atol=1e-6))
+            self.assertTrue(np.allclose(lam_g, expected.lam_g, atol=1e-6))
+
+    def test_constraints(self):
+        """when the trajectory is solved,
+        should satisfy the constraints for every joint"""
+        theta, _ = self.qp.solve(START, GOAL, [RELAY])
+        values = self.qp.constraint_matrix @ theta.T
+
+        self.assertTrue(np.allclose(values[0], START))
+        self.assertTrue(np.allclose(values[1], GOAL))
+        self.assertTrue(np.allclose(values[2:6], 0.0))
+        self.assertTrue(np.allclose(values[6], RELAY))
+
+    def test_optimizer_closed_form(self):
+        """when the optimizer has only the smoothness cost,
+        should use the closed form unless the solution violates the bounds"""
+        robot = make_robot()
+        optimizer = TrajectoryOptimizer(robot, TIME_NUM, relay_steps=[RELAY_STEP])
+        result = optimizer.solve(START, GOAL, relay_points=[RELAY])
+        self.assertTrue(result.success)
+        self.assertEqual(result.status, "Closed_Form")
+        self.assertAlmostEqual(
+            result.cost,
+            np.sum(np.diff(result.theta, 3) ** 2),
+        )
+
+        # 中継点が上限を超える軌道になる場合はIPOPTで解く
+        bounded = TrajectoryOptimizer(
+            robot, TIME_NUM, relay_steps=[RELAY_STEP], bounds=(-1.1, 1.1)
+        )
+        result = bounded.solve(START, GOAL, relay_points=[[1.1, 0.0, 0.0, 0.0]])
+        self.assertNotEqual(result.status, "Closed_Form")
+        self.assertTrue(np.all(result.theta <= 1.1 + 1e-6))
+
+    def test_start_motion(self):
+        """when the velocity and acceleration at the start are given,
+        should continue them and match IPOPT"""
+        velocity = [0.05, 0.0, -0.02, 0.01]
+        acceleration = [0.0, 0.01, 0.0, 0.0]
+        theta, _ = self.qp.solve(
+            START, GOAL, start_velocity=velocity, start_acceleration=acceleration
+        )
+        optimizer = TrajectoryOptimizer(make_robot(), TIME_NUM, closed_form=False)
+        expected = optimizer.solve(
+            START, GOAL, start_velocity=velocity, start_acceleration=acceleration
+        )
+
+        self.assertTrue(np.allclose(np.diff(theta)[:, 0], velocity))
+        self.assertTrue(np.allclose(np.diff(theta, 2)[:, 0], acceleration))
+        self.assertTrue(np.allclose(theta, expected.theta, atol=1e-6))
+
+    def test_relay_step_range(self):
+        """when the relay steps are next to the boundary steps,
+        should be accepted by the QP and IPOPT and rejected inside the boundary"""
+        steps = [3, TIME_NUM - 4]
+        relay_points = [[-0.8, 0.6, -1.2, 0.0], [0.8, 0.6, -1.2, 0.0]]
+        theta, _ = MinimumJerkQP(TIME_NUM, steps).solve(START, GOAL, relay_points)
+        self.assertTrue(np.allclose(theta[:, steps].T, relay_points))
+
+        for eliminate_boundary in (True, False):
+            result = TrajectoryOptimizer(
+                make_robot(),
+                TIME_NUM,
+                relay_steps=steps,
+                closed_form=False,
+                eliminate_boundary=eliminate_boundary,
+            ).solve(START, GOAL, relay_points=relay_points)
+            self.assertTrue(result.success)
+            self.assertTrue(np.allclose(result.theta, theta, atol=1e-6))
+
+        for step in (1, 2, TIME_NUM - 3, TIME_NUM - 2):
+            with self.assertRaises(ValueError):
+                MinimumJerkQP(TIME_NUM, [step])
+            with self.assertRaises(ValueError):
+                TrajectoryOptimizer(make_robot(), TIME_NUM, relay_steps=[step])
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(ValueError):
+            MinimumJerkQP(5)
+        with self.assertRaises(ValueError):
+            MinimumJerkQP(TIME_NUM, [0])
+        with self.assertRaises(ValueError):
+            MinimumJerkQP(TIME_NUM, [RELAY_STEP, RELAY_STEP])
+        with self.assertRaises(ValueError):
+            self.qp.solve(START, GOAL[:3])
+        with self.assertRaises(ValueError):
+            self.qp.solve(START, GOAL, [RELAY, RELAY])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""provide test cases for gravibot._trajectory.seed"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._trajectory.difference import get_result
+    from gravibot._trajectory.seed import (
+        get_linear_seed,
+        get_min_jerk_seed,
+        get_spline_seed,
+        get_random_seed,
+        get_decision_vector,
+    )
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._trajectory.difference import get_result
+    from gravibot._trajectory.seed import (
+        get_linear_seed,
+        get_min_jerk_seed,
+        get_spline_seed,
+        get_random_seed,
+        get_decision_vector,
+    )
+
+
+START = np.array([0.0, 1.0, -1.0])
+GOAL = np.array([1.0, 1.0, 2.0])
+
+
+class TestSeed(unittest.TestCase):
+    """test class of gravibot._trajectory.seed"""
+
+    def test_linear_seed(self):
+        """when the linear seed is made,
+        should interpolate the start and the goal at a constant rate"""
+        theta = get_linear_seed(START, GOAL, 5)
+
+        self.assertEqual(theta.shape, (3, 5))
+        self.assertTrue(np.allclose(theta[:, 2], (START + GOAL) / 2.0))
+        self.assertTrue(np.allclose(np.diff(theta, 2), 0.0))
+
+    def test_min_jerk_seed(self):
+        """when the min-jerk seed is made,
+        should start and end at the given angles at rest"""
+        theta = get_min_jerk_seed(START, GOAL, 201)
+        velocity = np.gradient(theta, axis=1) * 200.0
+
+        self.assertTrue(np.allclose(theta[:, 0], START))
+        self.assertTrue(np.allclose(theta[:, -1], GOAL))
+        self.assertTrue(np.allclose(theta[:, 100], (START + GOAL) / 2.0))
+        self.assertTrue(np.allclose(velocity[:, [0, -1]], 0.0, atol=1e-3))
+        self.assertTrue(
+            np.allclose(velocity[:, 100], (GOAL - START) * 1.875, atol=1e-3)
+        )
+
+    def test_min_jerk_seed_with_relay(self):
+        """when relay points are given,
+        should pass the enabled ones and stay at rest at both ends"""
+        relay = np.array([2.0, 0.0, 0.5])
+        theta = get_min_jerk_seed(
+            START, GOAL, 41, relay_steps=[10, 20], relay_points=[None, relay]
+        )
+        velocity = np.diff(theta)
+
+        self.assertEqual(theta.shape, (3, 41))
+        self.assertTrue(np.allclose(theta[:, 0], START))
+        self.assertTrue(np.allclose(theta[:, 20], relay))
+        self.assertTrue(np.allclose(theta[:, -1], GOAL))
+        self.assertTrue(np.allclose(velocity[:, [0, -1]], 0.0, atol=1e-2))
+
+    def test_spline_seed(self):
+        """when waypoints are given,
+        should pass them at the steps with continuous acceleration"""
+        waypoints = np.stack([START, [2.0, 0.0, 0.5], GOAL])
+        theta = get_spline_seed(waypoints, 401, steps=[0, 100, 400])
+        acceleration = np.diff(theta, 2)
+
+        self.assertTrue(np.allclose(theta[:, [0, 100, 400]], waypoints.T))
+        self.assertTrue(np.allclose(np.diff(theta)[:, [0, -1]], 0.0, atol=1e-3))
+        self.assertTrue(
+            np.allclose(acceleration[:, 98], acceleration[:, 99], atol=1e-4)
+        )
+
+        # 経由点が2つの場合は等間隔の3次補間
+        theta = get_spline_seed(np.stack([START, GOAL]), 3)
+        self.assertTrue(np.allclose(theta[:, 1], (START + GOAL) / 2.0))
+
+    def test_decision_vector(self):
+        """when the trajectory is converted to the decision vector,
+        should arrange it per joint as get_result expects"""
+        theta = get_min_jerk_seed(START, GOAL, 6)
+        x = get_decision_vector(theta)
+
+        self.assertEqual(x.shape, (18,))
+        self.assertTrue(np.allclose(x[6:12], theta[1]))
+        self.assertTrue(np.allclose(get_result(x, 6, 3), theta))
+
+    def test_random_seed(self):
+        """when the random seed is made,
+        should keep each joint constant within the bounds"""
+        lower = np.array([-1.0, 0.0, 2.0])
+        upper = np.array([1.0, 0.5, 3.0])
+        theta = get_random_seed(lower, upper, 4, np.random.default_rng(0))
+
+        self.assertEqual(theta.shape, (3, 4))
+        self.assertTrue(np.all(theta >= lower[:, None]))
+        self.assertTrue(np.all(theta <= upper[:, None]))
+        self.assertTrue(np.allclose(np.diff(theta), 0.0))
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(ValueError):
+            get_linear_seed(START, GOAL[:2], 5)
+        with self.assertRaises(ValueError):
+            get_min_jerk_seed(START, GOAL, 1)
+        with self.assertRaises(TypeError):
+            get_min_jerk_seed(START, GOAL, 5.0)
+        with self.assertRaises(ValueError):
+            get_min_jerk_seed(START, GOAL, 5, relay_steps=[2], relay_points=[])
+        with self.assertRaises(ValueError):
+            get_spline_seed(np.stack([START, GOAL]), 5, steps=[0, 3])
+        with self.assertRaises(ValueError):
+            get_decision_vector(START)
+
+
+if __name__ == "__main__":
+    unittest.main()
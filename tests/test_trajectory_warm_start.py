@@ -0,0 +1,113 @@
+"""provide test cases for gravibot._trajectory.warm_start"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer, TrajectoryResult
+    from gravibot._trajectory.warm_start import WarmStartStore
+    from tests._robots import make_robot
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._trajectory.optimizer import TrajectoryOptimizer, TrajectoryResult
+    from gravibot._trajectory.warm_start import WarmStartStore
+    from tests._robots import make_robot
+
+
+TIME_NUM = 10
+START = [-np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+GOAL = [np.pi / 3.0, np.pi / 5.0, -np.pi / 5.0 * 2, 0.0]
+
+
+def make_result(p) -> TrajectoryResult:
+    """パラメータだけを持つ結果を作成"""
+    p = np.asarray(p, dtype=np.float64)
+    empty = np.zeros(0)
+    return TrajectoryResult(empty, empty, empty, empty, p, 0.0, True, "", 0, 0.0)
+
+
+class TestWarmStartStore(unittest.TestCase):
+    """test class of gravibot._trajectory.warm_start"""
+
+    def test_get_nearest(self):
+        """when solutions are stored,
+        should return the one with the nearest parameters"""
+        store = WarmStartStore()
+        self.assertIsNone(store.get_nearest([0.0, 0.0]))
+
+        results = [make_result(p) for p in ([0.0, 0.0], [1.0, 0.0], [0.0, 2.0])]
+        for result in results:
+            store.add(result)
+
+        self.assertEqual(len(store), 3)
+        self.assertIs(store.get_nearest([0.9, 0.3]), results[1])
+        self.assertIs(store.get_nearest([0.2, 1.5]), results[2])
+
+    def test_max_size(self):
+        """when more solutions than max_size are added,
+        should discard the oldest ones"""
+        store = WarmStartStore(2)
+        results = [make_result([float(i)]) for i in range(3)]
+        for result in results:
+            store.add(result)
+
+        self.assertEqual(len(store), 2)
+        self.assertIs(store.get_nearest([0.0]), results[1])
+
+        store.clear()
+        self.assertEqual(len(store), 0)
+
+    def test_invalid_arguments(self):
+        """when invalid arguments are given,
+        should raise errors"""
+        with self.assertRaises(ValueError):
+            WarmStartStore(0)
+
+        store = WarmStartStore()
+        store.add(make_result([0.0, 0.0]))
+        with self.assertRaises(ValueError):
+            store.add(make_result([0.0]))
+        with self.assertRaises(ValueError):
+            store.get_nearest([0.0])
+
+    def test_replanning(self):
+        """when nearby queries are solved with the store,
+        should start from the stored solution and converge in fewer iterations"""
+        robot = make_robot()
+        cold = TrajectoryOptimizer(
+            robot, TIME_NUM, bounds=(-np.pi, np.pi), closed_form=False
+        )
+        store = WarmStartStore()
+        warm = TrajectoryOptimizer(
+            robot,
+            TIME_NUM,
+            bounds=(-np.pi, np.pi),
+            warm_start_store=store,
+            closed_form=False,
+        )
+
+        first = warm.solve(START, GOAL)
+        self.assertEqual(len(store), 1)
+        self.assertLessEqual(warm.solve(START, GOAL).iter_count, 1)
+
+        goal = np.array(GOAL) + 0.02
+        expected = cold.solve(START, goal)
+        actual = warm.solve(START, goal)
+        self.assertLess(actual.iter_count, expected.iter_count)
+        self.assertTrue(np.allclose(actual.theta, expected.theta, atol=1e-6))
+        self.assertTrue(np.allclose(first.p, store.get_nearest(first.p).p))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""provide test cases for gravibot._util.latency"""
+
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+
+import unittest
+
+import numpy as np
+
+try:
+    from gravibot._util.latency import LatencyStatistics
+except ImportError:
+    import os
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+    from gravibot._util.latency import LatencyStatistics
+
+
+class TestLatencyStatistics(unittest.TestCase):
+    """test class of gravibot._util.latency"""
+
+    def test_statistics(self):
+        """when fewer samples than the window are added,
+        should summarize all samples"""
+        latency = LatencyStatistics(window=10)
+        self.assertEqual(latency.mean, 0.0)
+        for value in [0.1, 0.2, 0.3, 0.4]:
+            latency.add(value)
+
+        self.assertEqual(latency.count, 4)
+        self.assertTrue(np.allclose(latency.samples, [0.1, 0.2, 0.3, 0.4]))
+        self.assertAlmostEqual(latency.mean, 0.25)
+        self.assertAlmostEqual(latency.max, 0.4)
+        self.assertAlmostEqual(latency.percentile(50), 0.25)
+
+    def test_window(self):
+        """when more samples than the window are added,
+        should keep only the latest samples in order"""
+        latency = LatencyStatistics(window=3)
+        for value in [1.0, 2.0, 3.0, 4.0, 5.0]:
+            latency.add(value)
+
+        self.assertEqual(latency.count, 5)
+        self.assertEqual(latency.window, 3)
+        self.assertTrue(np.allclose(latency.samples, [3.0, 4.0, 5.0]))
+        self.assertAlmostEqual(latency.mean, 4.0)
+        self.assertAlmostEqual(latency.max, 5.0)
+
+    def test_invalid_window(self):
+        """when the window is not a positive integer,
+        should raise errors"""
+        with self.assertRaises(ValueError):
+            LatencyStatistics(window=0)
+        with self.assertRaises(TypeError):
+            LatencyStatistics(window=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()